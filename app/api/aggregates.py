@@ -12,6 +12,7 @@ Routes:
     - GET /api/aggregate/strings -> Per-gateway solar string data keyed by gateway ID
     - GET /api/aggregate/alerts  -> Per-gateway alert lists keyed by gateway ID
     - GET /api/aggregate/vitals  -> Per-gateway vitals keyed by gateway ID
+    - GET /api/aggregate/energy  -> kWh counters summed over all gateways
 
 Use Cases:
     - Dashboard displaying total system capacity
@@ -25,7 +26,8 @@ Data Aggregation:
     - Battery percentages are averaged across online gateways
     - Power values (W) are summed across all gateways
     - Capacity values (Wh) are summed across all gateways
-    - Only online gateways contribute to aggregates
+    - Only online gateways contribute to aggregates, apart from warm-start
+      data right after a restart (see GatewayManager.get_aggregate_data)
     - Timestamps reflect most recent update across all gateways
 
 Design Notes:
@@ -33,16 +35,20 @@ Design Notes:
     - Returns immediately even if gateways are offline
     - Offline gateways are excluded from calculations
     - num_online field indicates how many gateways contributed
+    - ETag/Last-Modified cover all gateways; conditional GETs get a 304
 """
 from fastapi import APIRouter
 
+from app.core.energy import energy_meter
 from app.core.gateway_manager import gateway_manager
 from app.models.gateway import AggregateData
+from app.utils.conditional import SnapshotRoute, all_gateways, snapshot_cached
 
-router = APIRouter()
+router = APIRouter(route_class=SnapshotRoute)
 
 
 @router.get("/", response_model=AggregateData)
+@snapshot_cached(all_gateways)
 async def get_aggregate():
     """
     Get complete aggregated data from all gateways.
@@ -65,6 +71,7 @@ async def get_aggregate():
 
 
 @router.get("/power")
+@snapshot_cached(all_gateways)
 async def get_aggregate_power():
     """
     Get aggregated power flows from all gateways.
@@ -92,6 +99,7 @@ async def get_aggregate_power():
 
 
 @router.get("/soe")
+@snapshot_cached(all_gateways)
 async def get_aggregate_soe():
     """
     Get average state of energy (battery level) across all gateways.
@@ -115,6 +123,7 @@ async def get_aggregate_soe():
 
 
 @router.get("/battery")
+@snapshot_cached(all_gateways)
 async def get_aggregate_battery():
     """
     Get aggregated battery capacity and charge information.
@@ -142,6 +151,7 @@ async def get_aggregate_battery():
 
 
 @router.get("/strings")
+@snapshot_cached(all_gateways)
 async def get_aggregate_strings():
     """Get per-gateway solar string data, keyed by gateway ID.
 
@@ -165,6 +175,7 @@ async def get_aggregate_strings():
 
 
 @router.get("/alerts")
+@snapshot_cached(all_gateways)
 async def get_aggregate_alerts():
     """Get per-gateway alert lists, keyed by gateway ID.
 
@@ -183,6 +194,7 @@ async def get_aggregate_alerts():
 
 
 @router.get("/vitals")
+@snapshot_cached(all_gateways)
 async def get_aggregate_vitals():
     """Get per-gateway vitals data, keyed by gateway ID.
 
@@ -197,3 +209,16 @@ async def get_aggregate_vitals():
         for gw_id, status in all_gateways.items()
         if status.data
     }
+
+
+@router.get("/energy")
+@snapshot_cached(all_gateways)
+async def get_aggregate_energy():
+    """Get energy counters (kWh) summed over all gateways.
+
+    Solar produced, home consumed, grid import/export and battery
+    charge/discharge for the current day, month and in total. Each gateway's
+    day and month follow its own timezone. Per-gateway counters are at
+    /api/gateways/{id}/energy.
+    """
+    return energy_meter.aggregate()
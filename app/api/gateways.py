@@ -7,6 +7,8 @@ All routes are prefixed with /api/gateways (configured in main.py).
 Routes:
     - GET  /api/gateways/              -> List all configured gateways
     - GET  /api/gateways/{id}          -> Get specific gateway status
+    - GET  /api/gateways/{id}/next     -> Long-poll until a newer snapshot exists
+    - GET  /api/gateways/{id}/energy   -> Daily/monthly/total kWh counters
     - POST /api/gateways/{id}/control  -> Control operations for specific gateway
     
 Design Notes:
@@ -14,23 +16,29 @@ Design Notes:
     - The @router.get("/") here becomes /api/gateways/ (NOT root /)
     - Each gateway can be queried independently
     - Control operations support per-gateway targeting
+    - Cached-data routes send ETag/Last-Modified and honor conditional GETs
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Dict, Optional
 
+from app.config import settings
+from app.core.energy import energy_meter
 from app.core.gateway_manager import gateway_manager
 from app.models.gateway import GatewayStatus
+from app.utils.conditional import SnapshotRoute, all_gateways, path_gateway, snapshot_cached
 
-router = APIRouter()
+router = APIRouter(route_class=SnapshotRoute)
 
 
 @router.get("/", response_model=Dict[str, GatewayStatus])
+@snapshot_cached(all_gateways)
 async def list_gateways():
     """List all configured gateways and their status."""
     return gateway_manager.get_all_gateways()
 
 
 @router.get("/{gateway_id}", response_model=GatewayStatus)
+@snapshot_cached(path_gateway)
 async def get_gateway(gateway_id: str):
     """Get status for a specific gateway."""
     status = gateway_manager.get_gateway(gateway_id)
@@ -40,6 +48,7 @@ async def get_gateway(gateway_id: str):
 
 
 @router.get("/{gateway_id}/vitals")
+@snapshot_cached(path_gateway)
 async def get_gateway_vitals(gateway_id: str):
     """Get vitals for a specific gateway.
 
@@ -56,6 +65,7 @@ async def get_gateway_vitals(gateway_id: str):
 
 
 @router.get("/{gateway_id}/strings")
+@snapshot_cached(path_gateway)
 async def get_gateway_strings(gateway_id: str):
     """Get strings for a specific gateway.
 
@@ -72,6 +82,7 @@ async def get_gateway_strings(gateway_id: str):
 
 
 @router.get("/{gateway_id}/aggregates")
+@snapshot_cached(path_gateway)
 async def get_gateway_aggregates(gateway_id: str):
     """Get aggregates for a specific gateway.
 
@@ -87,6 +98,64 @@ async def get_gateway_aggregates(gateway_id: str):
     return status.data.aggregates or {}
 
 
+@router.get("/{gateway_id}/energy")
+@snapshot_cached(path_gateway)
+async def get_gateway_energy(gateway_id: str):
+    """Get the energy counters (kWh) for a specific gateway.
+
+    Counters are integrated from every poll (see app/core/energy.py); "day"
+    and "month" reset in the gateway's timezone, "total" never resets.
+    Returns {} until the gateway has been polled.
+    """
+    if gateway_manager.get_gateway(gateway_id) is None:
+        raise HTTPException(status_code=404, detail=f"Gateway {gateway_id} not found")
+    return energy_meter.get(gateway_id) or {}
+
+
+@router.get("/{gateway_id}/next")
+async def wait_next_snapshot(
+    gateway_id: str,
+    after: int = Query(0, ge=0, description="Last snapshot version seen"),
+    timeout: Optional[float] = Query(
+        None, gt=0, description="Seconds to wait (capped at PW_LONG_POLL_TIMEOUT)"
+    ),
+):
+    """Long-poll for the next snapshot of a gateway.
+
+    Parks the request until the gateway's snapshot version is newer than
+    ``after`` and returns it immediately when it already is, so a client
+    loops with ``after`` set to the last version it received. Each poll
+    (successful or failed) produces a new version. Versions restart at 0
+    with the server, so an ``after`` ahead of the current version is stale
+    and the current snapshot is returned at once.
+
+    Returns:
+        {"version": int, "status": GatewayStatus}, or 204 No Content when no
+        newer snapshot arrived within the timeout (the current version is in
+        the X-Snapshot-Version header)
+
+    Raises:
+        HTTPException 404: Gateway not found
+    """
+    if gateway_id not in gateway_manager.gateways:
+        raise HTTPException(status_code=404, detail=f"Gateway {gateway_id} not found")
+
+    wait = settings.long_poll_timeout
+    if timeout is not None:
+        wait = min(timeout, wait)
+
+    if not await gateway_manager.wait_for_snapshot(gateway_id, after, wait):
+        return Response(
+            status_code=204,
+            headers={"X-Snapshot-Version": str(gateway_manager.get_snapshot_version(gateway_id))},
+        )
+
+    return {
+        "version": gateway_manager.get_snapshot_version(gateway_id),
+        "status": gateway_manager.get_gateway(gateway_id),
+    }
+
+
 @router.get("/{gateway_id}/api/{path:path}")
 async def proxy_gateway_api(gateway_id: str, path: str):
     """Proxy API calls to a specific gateway.
@@ -0,0 +1,231 @@
+"""
+Poll History API Endpoints
+
+Time series of each gateway's power flows, SOE, frequency, reserve and grid
+status, served from the in-memory history (app/core/history.py) and, when
+PW_HISTORY_DB is set, the persistent archive (app/core/history_db.py), so
+dashboards can draw charts without an external TSDB. All routes are prefixed
+with /api/history (configured in main.py).
+
+Routes:
+    - GET /api/history/{gateway_id}        -> Samples or rollups for a time range
+    - GET /api/history/{gateway_id}.ndjson -> Streaming export, one JSON object per line
+
+    The CSV counterpart of the export is /csv/history (legacy router).
+
+Query Parameters:
+    - start:      Range start, Unix seconds (default: end - 1 hour)
+    - end:        Range end, Unix seconds (default: now)
+    - resolution: Seconds between points: a number, a duration ("5m", "1h"),
+                  a tier name ("raw", "1m", "15m", "1h") or "auto"
+                  (default: auto = (end - start) / 500)
+    - points:     Return exactly this many points per series (fewer only if
+                  the range holds fewer), chosen with LTTB (see below)
+
+Response:
+    {
+        "gateway_id": "home",
+        "resolution": "15m",          # Tier the data was read from
+        "interval": 900,              # Seconds per point (poll interval for raw)
+        "start": 1700000000.0,
+        "end": 1700604800.0,
+        "points": 672,
+        "data": {"timestamp": [...], "site_min": [...], "site_max": [...], ...}
+    }
+
+    Raw samples have one column per field ("site", "soe", "grid_status", ...);
+    rollups have "{field}_min", "_max", "_mean" and "_last" columns for the
+    power flows and SOE. Missing values are null.
+
+    With ?points=K the range is read at about 4K points and each numeric
+    series is reduced to K points with Largest-Triangle-Three-Buckets, which
+    keeps peaks and steps that averaging would flatten. Every series then
+    carries its own timestamps, "downsample" is "lttb", "points" is the
+    longest series' length and grid_status is omitted:
+
+        "data": {"site": {"timestamp": [...], "value": [...]}, ...}
+
+Design Notes:
+    - The coarsest tier that covers the range at the requested resolution
+      answers it, so a week-long chart reads a few hundred 15-minute buckets
+      instead of 100k raw samples
+    - Columnar output keeps responses compact and maps directly onto chart
+      series
+    - ?points= lets a chart ask for one point per pixel instead of receiving
+      tens of thousands of samples
+    - Exports default to raw samples and stream the range in chunks of
+      EXPORT_CHUNK rows read straight from the ring buffers / database, so
+      a month of 5-second data is sent in constant memory
+"""
+import asyncio
+import csv
+import io
+import math
+import time
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.config import parse_duration
+from app.core.gateway_manager import gateway_manager
+from app.core.history import AUTO_POINTS, LTTB_OVERSAMPLE, bucket_columns, downsample, sample_columns
+from app.core.history_db import history_archive
+from app.core.response_cache import encode_json
+
+router = APIRouter()
+
+# Default range when no start is given
+DEFAULT_SPAN = 3600
+
+# Largest ?points= accepted
+MAX_POINTS = 10000
+
+
+def _parse_resolution(value: Optional[str]) -> Optional[float]:
+    """Seconds between points for ?resolution=, None for auto."""
+    if value is None or value.lower() == "auto":
+        return None
+    if value.lower() == "raw":
+        return 0.0
+    try:
+        return parse_duration(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid resolution: {value}")
+
+
+def _time_range(gateway_id: str, start: Optional[float], end: Optional[float]) -> Tuple[float, float]:
+    """Validated (start, end) of a request for a gateway's history."""
+    if gateway_id not in gateway_manager.gateways:
+        raise HTTPException(status_code=404, detail=f"Gateway {gateway_id} not found")
+
+    if any(value is not None and not math.isfinite(value) for value in (start, end)):
+        raise HTTPException(status_code=400, detail="start and end must be finite numbers")
+    end = time.time() if end is None else end
+    start = end - DEFAULT_SPAN if start is None else start
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start, end
+
+
+async def _ndjson_lines(
+    gateway_id: str, name: str, interval: float, start: float, end: float
+) -> AsyncIterator[bytes]:
+    async for chunk in history_archive.iter_tier(gateway_id, name, interval, start, end):
+        columns = list(chunk)
+        yield b"".join(
+            encode_json(dict(zip(columns, row))) + b"\n" for row in zip(*chunk.values())
+        )
+
+
+async def _csv_lines(
+    gateway_id: str, name: str, interval: float, start: float, end: float
+) -> AsyncIterator[bytes]:
+    empty = sample_columns([]) if name == "raw" else bucket_columns([])
+    yield (",".join(empty) + "\n").encode()
+    async for chunk in history_archive.iter_tier(gateway_id, name, interval, start, end):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(zip(*chunk.values()))
+        yield buffer.getvalue().encode()
+
+
+async def history_export(
+    gateway_id: str,
+    fmt: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    resolution: Optional[str] = None,
+) -> StreamingResponse:
+    """Stream a gateway's history as NDJSON ("ndjson") or CSV ("csv").
+
+    Raw samples unless ``resolution`` asks for coarser points (same values
+    as GET /api/history/{gateway_id}; "auto" picks a tier for ~500 points).
+    The tier used is reported in the X-History-Resolution header.
+    """
+    start, end = _time_range(gateway_id, start, end)
+    # Clamp to the oldest stored row so the tier is chosen for the data that exists
+    oldest = await history_archive.oldest_timestamp(gateway_id, start)
+    if oldest is not None and start < oldest <= end:
+        start = oldest
+    seconds = 0.0 if resolution is None else _parse_resolution(resolution)
+    if seconds is None:
+        seconds = (end - start) / AUTO_POINTS
+    name, interval = history_archive.select_tier(start, seconds)
+
+    if fmt == "csv":
+        body, media_type = _csv_lines(gateway_id, name, interval, start, end), "text/csv; charset=utf-8"
+    else:
+        body, media_type = _ndjson_lines(gateway_id, name, interval, start, end), "application/x-ndjson"
+    return StreamingResponse(
+        body, media_type=media_type, headers={"X-History-Resolution": name}
+    )
+
+
+# Registered before /{gateway_id}, which would otherwise match "home.ndjson"
+@router.get("/{gateway_id}.ndjson")
+async def export_history_ndjson(
+    gateway_id: str,
+    resolution: Optional[str] = Query(default=None),
+    start: Optional[float] = Query(default=None),
+    end: Optional[float] = Query(default=None),
+):
+    """
+    Stream a gateway's history as newline-delimited JSON.
+
+    One object per sample (or bucket), oldest first, e.g.
+    {"timestamp": 1700000000.0, "site": 1200.0, ..., "grid_status": "UP"}.
+    Defaults to raw samples; see history_export() for ?resolution=.
+
+    Raises:
+        HTTPException: 404 if gateway_id is not found, 400 for an invalid range
+    """
+    return await history_export(gateway_id, "ndjson", start, end, resolution)
+
+
+@router.get("/{gateway_id}")
+async def get_history(
+    gateway_id: str,
+    resolution: Optional[str] = Query(default=None),
+    start: Optional[float] = Query(default=None),
+    end: Optional[float] = Query(default=None),
+    points: Optional[int] = Query(
+        default=None, ge=3, le=MAX_POINTS, description="Points per series (LTTB downsampling)"
+    ),
+):
+    """
+    Get a gateway's history for a time range.
+
+    Args:
+        gateway_id: Gateway identifier
+        resolution: Desired seconds between points (see module docstring)
+        start: Range start (Unix seconds)
+        end: Range end (Unix seconds)
+        points: Points per series, downsampled with LTTB
+
+    Raises:
+        HTTPException: 404 if gateway_id is not found, 400 for an invalid range
+    """
+    start, end = _time_range(gateway_id, start, end)
+    seconds = _parse_resolution(resolution)
+    if points is not None and seconds is None:
+        # Read enough points for LTTB to choose from
+        seconds = (end - start) / (points * LTTB_OVERSAMPLE)
+    result = await history_archive.query(gateway_id, start, end, seconds)
+
+    response = {
+        "gateway_id": gateway_id,
+        "resolution": result["resolution"],
+        "interval": result["interval"],
+        "start": start,
+        "end": end,
+        "points": len(result["data"]["timestamp"]),
+        "data": result["data"],
+    }
+    if points is not None:
+        # Off the event loop: a day of raw samples is ~17k points per series
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, downsample, result["data"], points)
+        response["downsample"] = "lttb"
+        response["points"] = max((len(series["value"]) for series in data.values()), default=0)
+        response["data"] = data
+    return response
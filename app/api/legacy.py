@@ -8,6 +8,7 @@ Key Routes (all cache-backed for graceful degradation):
     - /aggregates, /api/meters/aggregates -> Power meter data
     - /soe, /api/system_status/soe -> Battery state of energy
     - /csv, /csv/v2 -> CSV formatted data for Telegraf/InfluxDB
+    - /csv/history -> Streaming CSV export of a gateway's poll history
     - /vitals -> Detailed system vitals
     - /strings -> Solar string data
     - /temps, /temps/pw -> Temperature data
@@ -34,6 +35,8 @@ Design Principles:
     2. CACHE-BACKED DATA - All data comes from background polling cache
        This ensures graceful degradation when gateway is slow/offline.
        No on-demand blocking calls during HTTP requests.
+       Cache-backed routes are marked @snapshot_cached and answer
+       If-None-Match / If-Modified-Since with 304 (app/utils/conditional.py).
     
     3. SAFE DEFAULTS - Returns empty arrays/nulls on errors
        Keeps UI responsive even during outages.
@@ -44,24 +47,36 @@ Design Principles:
 Adding New Endpoints:
     If you need a new /api/* endpoint, add it explicitly with cache support.
     Do NOT add catch-all routes - they break graceful degradation.
+
+    Outputs derived from several cached fields should be registered with
+    @register_view (app/core/views.py) so they are computed once per poll
+    rather than on every request.
 """
 import logging
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 import psutil
 import pypowerwall
-from fastapi import APIRouter, HTTPException, Response, Header
+from fastapi import APIRouter, HTTPException, Request, Response, Header
 
+from app.api.history import history_export
 from app.core.gateway_manager import gateway_manager
+from app.core.history import history_store
+from app.core.history_db import history_archive
+from app.core.response_cache import encode_json, response_cache
+from app.core.views import materialized_views, register_view
 from app.config import settings, SERVER_VERSION
+from app.models.gateway import PowerwallData
+from app.utils.conditional import SnapshotRoute, snapshot_cached
 from app.utils.stats_tracker import stats_tracker
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=SnapshotRoute)
 
 
 def verify_control_token(authorization: Optional[str] = Header(None)):
@@ -146,6 +161,47 @@ def get_default_gateway():
     raise HTTPException(status_code=503, detail="No gateways configured")
 
 
+def _default_gateway_scope(request: Request) -> List[str]:
+    """Conditional GET scope: legacy data routes read the default gateway."""
+    return [get_default_gateway()]
+
+
+def _snapshot_json(
+    view: str, build: Callable[[PowerwallData], Any], default: Any
+) -> Response:
+    """Serve a view of the default gateway's cached data as pre-encoded JSON.
+
+    The body is encoded once per poll snapshot and reused by every request
+    until the next poll (see app/core/response_cache.py). ``default`` is
+    returned while no data is available yet.
+    """
+    gateway_id = get_default_gateway()
+    status = gateway_manager.get_gateway(gateway_id)
+
+    if not status or not status.data:
+        return Response(content=encode_json(default), media_type="application/json")
+
+    body = response_cache.get(gateway_id, view, status.data, build)
+    return Response(content=body, media_type="application/json")
+
+
+def _view_json(view: str, default: Any) -> Response:
+    """Serve a materialized view of the default gateway as pre-encoded JSON."""
+    gateway_id = get_default_gateway()
+    return _snapshot_json(view, partial(materialized_views.get, gateway_id, view), default)
+
+
+def _view_text(view: str, default: str) -> str:
+    """Return a materialized text view of the default gateway, or ``default``."""
+    gateway_id = get_default_gateway()
+    status = gateway_manager.get_gateway(gateway_id)
+
+    if not status or not status.data:
+        return default
+
+    return materialized_views.get(gateway_id, view, status.data)
+
+
 # Login cookie max-age: 10 years for long-running kiosk dashboards
 _AUTH_COOKIE_MAX_AGE = 10 * 365 * 24 * 60 * 60  # 315360000 seconds
 
@@ -188,38 +244,29 @@ async def post_login_basic(response: Response):
 
 
 @router.get("/vitals")
+@snapshot_cached(_default_gateway_scope)
 async def get_vitals():
     """Get vitals data (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     Returns empty object if no data available yet.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.vitals or {}
+    return _snapshot_json("vitals", lambda data: data.vitals or {}, {})
 
 
 @router.get("/strings")
+@snapshot_cached(_default_gateway_scope)
 async def get_strings():
     """Get strings data (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     Returns empty object if no data available yet.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.strings or {}
+    return _snapshot_json("strings", lambda data: data.strings or {}, {})
 
 
 @router.get("/aggregates")
+@snapshot_cached(_default_gateway_scope)
 async def get_aggregates():
     """Get aggregates data (legacy proxy endpoint).
 
@@ -228,32 +275,22 @@ async def get_aggregates():
 
     Note: Negative solar correction (PW_NEG_SOLAR) is applied at fetch time in gateway_manager.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data or not status.data.aggregates:
-        return {}
-
-    return status.data.aggregates
+    return _snapshot_json("aggregates", lambda data: data.aggregates or {}, {})
 
 
 @router.get("/soe")
+@snapshot_cached(_default_gateway_scope)
 async def get_soe():
     """Get state of energy (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     Returns null percentage if no data available yet.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data or status.data.soe is None:
-        return {"percentage": None}
-
-    return {"percentage": status.data.soe}
+    return _snapshot_json("soe", lambda data: {"percentage": data.soe}, {"percentage": None})
 
 
 @router.get("/freq")
+@snapshot_cached(_default_gateway_scope)
 async def get_freq():
     """Get frequency, current, voltage and grid status data (legacy proxy endpoint).
 
@@ -268,17 +305,16 @@ async def get_freq():
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _view_json("freq", {"freq": None})
 
-    if not status or not status.data:
-        return {"freq": None}
 
+@register_view("freq")
+def _view_freq(data: PowerwallData) -> dict:
     fcv = {}
     idx = 1
 
     # Pull freq, current, voltage of each Powerwall via system_status
-    system_status = status.data.system_status or {}
+    system_status = data.system_status or {}
     if "battery_blocks" in system_status:
         for block in system_status["battery_blocks"]:
             fcv[f"PW{idx}_name"] = None  # Placeholder for vitals
@@ -295,7 +331,7 @@ async def get_freq():
             idx += 1
 
     # Pull freq, current, voltage of each Powerwall via vitals if available
-    vitals = status.data.vitals or {}
+    vitals = data.vitals or {}
     idx = 1
     for device, d in vitals.items():
         if device.startswith("TEPINV"):
@@ -312,13 +348,13 @@ async def get_freq():
                     fcv[i] = value
 
     # Fallback: if we have freq data but no device-specific data, include it
-    if status.data.freq is not None and not any(k.startswith("PW") for k in fcv.keys()):
-        fcv["freq"] = status.data.freq
+    if data.freq is not None and not any(k.startswith("PW") for k in fcv.keys()):
+        fcv["freq"] = data.freq
 
     # Add grid status (numeric: 1 = UP, 0 = DOWN)
-    if status.data.grid_status == "UP":
+    if data.grid_status == "UP":
         fcv["grid_status"] = 1
-    elif status.data.grid_status == "DOWN":
+    elif data.grid_status == "DOWN":
         fcv["grid_status"] = 0
     else:
         fcv["grid_status"] = 0
@@ -327,181 +363,169 @@ async def get_freq():
 
 
 @router.get("/csv")
+@snapshot_cached(_default_gateway_scope)
 async def get_csv(headers: Optional[str] = None):
     """Get CSV format data (legacy proxy endpoint).
 
     Returns: Grid,Home,Solar,Battery,BatteryLevel
     Add ?headers (any value) to include CSV headers.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    csv_data = (
+        "Grid,Home,Solar,Battery,BatteryLevel\n" if headers is not None else ""
+    )
+    # Graceful degradation: zeros until data is available (backwards compatibility)
+    csv_data += _view_text("csv", "0.00,0.00,0.00,0.00,0.00\n")
+    return Response(content=csv_data, media_type="text/plain; charset=utf-8")
 
-    # Graceful degradation: return cached data even if offline
-    if not status or not status.data:
-        # Return zeros for CSV (backwards compatibility)
-        csv_data = (
-            "Grid,Home,Solar,Battery,BatteryLevel\n" if headers is not None else ""
-        )
-        csv_data += "0.00,0.00,0.00,0.00,0.00\n"
-        return Response(content=csv_data, media_type="text/plain; charset=utf-8")
 
+@register_view("csv")
+def _view_csv(data: PowerwallData) -> str:
     # Extract power values from aggregates (neg_solar correction applied at fetch time)
-    aggregates = status.data.aggregates or {}
+    aggregates = data.aggregates or {}
     grid = aggregates.get("site", {}).get("instant_power", 0)
     solar = aggregates.get("solar", {}).get("instant_power", 0)
     battery = aggregates.get("battery", {}).get("instant_power", 0)
     home = aggregates.get("load", {}).get("instant_power", 0)
-    level = status.data.soe or 0
-
-    # Build CSV response
-    csv_data = ""
-    if headers is not None:
-        csv_data += "Grid,Home,Solar,Battery,BatteryLevel\n"
-    csv_data += f"{grid:.2f},{home:.2f},{solar:.2f},{battery:.2f},{level:.2f}\n"
+    level = data.soe or 0
 
-    return Response(content=csv_data, media_type="text/plain; charset=utf-8")
+    return f"{grid:.2f},{home:.2f},{solar:.2f},{battery:.2f},{level:.2f}\n"
 
 
 @router.get("/csv/v2")
+@snapshot_cached(_default_gateway_scope)
 async def get_csv_v2(headers: Optional[str] = None):
     """Get CSV v2 format data (legacy proxy endpoint).
 
     Returns: Grid,Home,Solar,Battery,BatteryLevel,GridStatus,Reserve
     Add ?headers (any value) to include CSV headers.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-    pw = gateway_manager.get_connection(gateway_id)
+    csv_data = (
+        "Grid,Home,Solar,Battery,BatteryLevel,GridStatus,Reserve\n"
+        if headers is not None
+        else ""
+    )
+    # Graceful degradation: zeros until data is available (backwards compatibility)
+    csv_data += _view_text("csv_v2", "0.00,0.00,0.00,0.00,0.00,0,0\n")
+    return Response(content=csv_data, media_type="text/plain; charset=utf-8")
 
-    # Graceful degradation: return cached data even if offline
-    if not status or not status.data:
-        # Return zeros for CSV (backwards compatibility)
-        csv_data = (
-            "Grid,Home,Solar,Battery,BatteryLevel,GridStatus,Reserve\n"
-            if headers is not None
-            else ""
-        )
-        csv_data += "0.00,0.00,0.00,0.00,0.00,0,0\n"
-        return Response(content=csv_data, media_type="text/plain; charset=utf-8")
 
+@register_view("csv_v2")
+def _view_csv_v2(data: PowerwallData) -> str:
     # Extract power values from aggregates (neg_solar correction applied at fetch time)
-    aggregates = status.data.aggregates or {}
+    aggregates = data.aggregates or {}
     grid = aggregates.get("site", {}).get("instant_power", 0)
     solar = aggregates.get("solar", {}).get("instant_power", 0)
     battery = aggregates.get("battery", {}).get("instant_power", 0)
     home = aggregates.get("load", {}).get("instant_power", 0)
-    level = status.data.soe or 0
+    level = data.soe or 0
 
     # Get grid status from cache (1=UP, 0=DOWN)
-    grid_status_str = status.data.grid_status
-    gridstatus = 1 if grid_status_str == "UP" else 0
+    gridstatus = 1 if data.grid_status == "UP" else 0
 
     # Get reserve level from cache
-    reserve = status.data.reserve or 0
+    reserve = data.reserve or 0
 
-    # Build CSV response
-    csv_data = ""
-    if headers is not None:
-        csv_data += "Grid,Home,Solar,Battery,BatteryLevel,GridStatus,Reserve\n"
-    csv_data += f"{grid:.2f},{home:.2f},{solar:.2f},{battery:.2f},{level:.2f},{gridstatus},{reserve:.0f}\n"
+    return f"{grid:.2f},{home:.2f},{solar:.2f},{battery:.2f},{level:.2f},{gridstatus},{reserve:.0f}\n"
 
-    return Response(content=csv_data, media_type="text/plain; charset=utf-8")
+
+@router.get("/csv/history")
+async def get_csv_history(
+    gateway_id: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    resolution: Optional[str] = None,
+):
+    """Stream poll history as CSV (default gateway unless ?gateway_id=).
+
+    Columns as in /api/history (timestamp,site,battery,load,solar,soe,...),
+    with a header row. Defaults to the raw samples of the last hour; use
+    ?start=&end= (Unix seconds) and ?resolution= for other ranges and tiers.
+    Rows are streamed in chunks, so long ranges are exported in constant memory.
+    """
+    return await history_export(gateway_id or get_default_gateway(), "csv", start, end, resolution)
 
 
 @router.get("/temps")
+@snapshot_cached(_default_gateway_scope)
 async def get_temps():
     """Get Powerwall temperatures (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached temps even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.temps or {}
+    return _snapshot_json("temps", lambda data: data.temps or {}, {})
 
 
 @router.get("/temps/pw")
+@snapshot_cached(_default_gateway_scope)
 async def get_temps_pw():
     """Get Powerwall temperatures with simple keys (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached temps even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _view_json("temps_pw", {})
+
 
+@register_view("temps_pw")
+def _view_temps_pw(data: PowerwallData) -> dict:
     pwtemp = {}
-    if status and status.data and status.data.temps:
-        temps = status.data.temps
-        idx = 1
-        for i in temps:
-            key = f"PW{idx}_temp"
-            pwtemp[key] = temps[i]
-            idx += 1
+    temps = data.temps or {}
+    idx = 1
+    for i in temps:
+        key = f"PW{idx}_temp"
+        pwtemp[key] = temps[i]
+        idx += 1
     return pwtemp
 
 
 @router.get("/alerts")
+@snapshot_cached(_default_gateway_scope)
 async def get_alerts():
     """Get Powerwall alerts (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached alerts even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return []
-
-    return status.data.alerts or []
+    return _snapshot_json("alerts", lambda data: data.alerts or [], [])
 
 
 @router.get("/alerts/pw")
+@snapshot_cached(_default_gateway_scope)
 async def get_alerts_pw():
     """Get Powerwall alerts in dictionary format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached alerts even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _snapshot_json("alerts_pw", _build_alerts_pw, {})
+
 
+def _build_alerts_pw(data: PowerwallData) -> dict:
     pwalerts = {}
-    if status and status.data and status.data.alerts:
-        for alert in status.data.alerts:
-            pwalerts[alert] = 1
+    for alert in data.alerts or []:
+        pwalerts[alert] = 1
     return pwalerts
 
 
 @router.get("/fans")
+@snapshot_cached(_default_gateway_scope)
 async def get_fans():
     """Get fan speeds in raw format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.fan_speeds or {}
+    return _snapshot_json("fan_speeds", lambda data: data.fan_speeds or {}, {})
 
 
 @router.get("/fans/pw")
+@snapshot_cached(_default_gateway_scope)
 async def get_fans_pw():
     """Get fan speeds in simplified format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _snapshot_json("fans_pw", _build_fans_pw, {})
 
-    if not status or not status.data:
-        return {}
 
-    fan_speeds = status.data.fan_speeds or {}
+def _build_fans_pw(data: PowerwallData) -> dict:
+    fan_speeds = data.fan_speeds or {}
     fans = {}
     for i, (_, value) in enumerate(sorted(fan_speeds.items())):
         key = f"FAN{i+1}"
@@ -621,17 +645,17 @@ async def get_tedapi_controller():
 
 
 @router.get("/pod")
+@snapshot_cached(_default_gateway_scope)
 async def get_pod():
     """Get Powerwall battery data (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _view_json("pod", {})
 
-    if not status or not status.data:
-        return {}
 
+@register_view("pod")
+def _view_pod(data: PowerwallData) -> dict:
     pod = {}
 
     # Build a serial-number → block type lookup from cached TEDAPI config.
@@ -639,8 +663,8 @@ async def get_pod():
     # ("Powerwall3", "Powerwall3Follower", etc.) that system_status does not.
     # VIN format: "PARTNUM--SERIAL" (e.g. "1707000-11-M--TG1253370033TB" → "TG1253370033TB")
     tedapi_type_map: dict = {}
-    if status.data.tedapi_config:
-        for cfg_block in status.data.tedapi_config.get("battery_blocks", []):
+    if data.tedapi_config:
+        for cfg_block in data.tedapi_config.get("battery_blocks", []):
             vin = cfg_block.get("vin", "")
             block_type = cfg_block.get("type")
             if vin and block_type and "--" in vin:
@@ -648,7 +672,7 @@ async def get_pod():
                 tedapi_type_map[serial] = block_type
 
     # Get Individual Powerwall Battery Data from cached system_status
-    system_status = status.data.system_status
+    system_status = data.system_status
     if system_status and "battery_blocks" in system_status:
         idx = 1
         for block in system_status["battery_blocks"]:
@@ -701,8 +725,8 @@ async def get_pod():
             idx += 1
 
     # Augment with Vitals Data if available - match POD data to battery blocks by serial number
-    if status.data.vitals:
-        vitals = status.data.vitals
+    if data.vitals:
+        vitals = data.vitals
         
         # Build a map of serial numbers to vitals data
         tepod_map = {}
@@ -741,13 +765,14 @@ async def get_pod():
         pod["nominal_energy_remaining"] = system_status.get("nominal_energy_remaining")
 
     # Use cached time_remaining and reserve (if available)
-    pod["time_remaining_hours"] = status.data.time_remaining if status.data.time_remaining is not None else None
-    pod["backup_reserve_percent"] = status.data.reserve if status.data.reserve is not None else None
+    pod["time_remaining_hours"] = data.time_remaining if data.time_remaining is not None else None
+    pod["backup_reserve_percent"] = data.reserve if data.reserve is not None else None
 
     return pod
 
 
 @router.get("/json")
+@snapshot_cached(_default_gateway_scope)
 async def get_json():
     """Get combined metrics and status in JSON format (legacy proxy endpoint).
 
@@ -756,11 +781,9 @@ async def get_json():
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {
+    return _view_json(
+        "json",
+        {
             "grid": 0,
             "home": 0,
             "solar": 0,
@@ -772,35 +795,39 @@ async def get_json():
             "full_pack_energy": 0,
             "energy_remaining": 0,
             "strings": {},
-        }
+        },
+    )
+
 
+@register_view("json")
+def _view_json_metrics(data: PowerwallData) -> dict:
     # Extract power values from aggregates (neg_solar correction applied at fetch time)
-    aggregates = status.data.aggregates or {}
+    aggregates = data.aggregates or {}
     grid = aggregates.get("site", {}).get("instant_power", 0)
     solar = aggregates.get("solar", {}).get("instant_power", 0)
     battery = aggregates.get("battery", {}).get("instant_power", 0)
     home = aggregates.get("load", {}).get("instant_power", 0)
 
     # Get battery level (SOE)
-    soe = status.data.soe if status.data.soe is not None else 0
+    soe = data.soe if data.soe is not None else 0
 
     # Convert grid_status to numeric (1=UP, 0=DOWN)
-    grid_status_str = status.data.grid_status or "DOWN"
+    grid_status_str = data.grid_status or "DOWN"
     grid_status = 1 if "UP" in grid_status_str.upper() else 0
 
     # Get reserve and time remaining
-    reserve = status.data.reserve if status.data.reserve is not None else 0
+    reserve = data.reserve if data.reserve is not None else 0
     time_remaining = (
-        status.data.time_remaining if status.data.time_remaining is not None else 0
+        data.time_remaining if data.time_remaining is not None else 0
     )
 
     # Get full pack energy and energy remaining from system_status
-    system_status = status.data.system_status or {}
+    system_status = data.system_status or {}
     full_pack_energy = system_status.get("nominal_full_pack_energy", 0)
     energy_remaining = system_status.get("nominal_energy_remaining", 0)
 
     # Get strings data
-    strings = status.data.strings or {}
+    strings = data.strings or {}
 
     return {
         "grid": grid,
@@ -818,21 +845,17 @@ async def get_json():
 
 
 @router.get("/battery")
+@snapshot_cached(_default_gateway_scope)
 async def get_battery_power():
     """Get battery power (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {"power": 0}
-
-    aggregates = status.data.aggregates or {}
-    battery_power = aggregates.get("battery", {}).get("instant_power", 0)
+    def build(data: PowerwallData) -> Dict[str, Any]:
+        aggregates = data.aggregates or {}
+        return {"power": aggregates.get("battery", {}).get("instant_power", 0)}
 
-    return {"power": battery_power}
+    return _snapshot_json("battery", build, {"power": 0})
 
 
 # NOTE: Specific /api/* routes must be defined BEFORE the catch-all /api/{path:path}
@@ -840,6 +863,7 @@ async def get_battery_power():
 
 
 @router.get("/api/system_status")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_system_status():
     """Get full system status - API format (legacy proxy endpoint).
 
@@ -850,36 +874,29 @@ async def get_api_system_status():
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     Returns empty object if no data available yet (e.g., during startup).
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.system_status or {}
+    return _snapshot_json("system_status", lambda data: data.system_status or {}, {})
 
 
 @router.get("/api/system_status/soe")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_soe():
     """Get battery state of energy - API format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _snapshot_json("api_soe", _build_api_soe, {"percentage": None})
 
-    if not status or not status.data:
-        return {"percentage": None}
 
-    level = status.data.soe
+def _build_api_soe(data: PowerwallData) -> dict:
+    level = data.soe
     if level is not None:
         # Scale using Tesla App formula: reserves bottom 5%, maps 5%->0% and 100%->100%
         level = (level / 0.95) - (5 / 0.95)
-
     return {"percentage": level}
 
 
 @router.get("/api/system_status/grid_status")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_grid_status():
     """Get grid status - API format (legacy proxy endpoint).
 
@@ -888,30 +905,33 @@ async def get_api_grid_status():
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _snapshot_json(
+        "api_grid_status",
+        _build_api_grid_status,
+        {"grid_status": "Unknown", "grid_services_active": None},
+    )
 
-    if not status or not status.data:
-        return {"grid_status": "Unknown", "grid_services_active": None}
 
+def _build_api_grid_status(data: PowerwallData) -> dict:
     # Return cached grid_status_detail if available
-    if status.data.grid_status_detail:
-        return status.data.grid_status_detail
+    if data.grid_status_detail:
+        return data.grid_status_detail
 
     # Fallback to simplified grid_status if detailed version not available
-    if status.data.grid_status:
+    if data.grid_status:
         # Map simplified status to API format
         grid_status_map = {
             "UP": "SystemGridConnected",
             "DOWN": "SystemIslandedActive"
         }
-        api_status = grid_status_map.get(status.data.grid_status, status.data.grid_status)
+        api_status = grid_status_map.get(data.grid_status, data.grid_status)
         return {"grid_status": api_status, "grid_services_active": None}
 
     return {"grid_status": "Unknown", "grid_services_active": None}
 
 
 @router.get("/api/sitemaster")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_sitemaster():
     """Get sitemaster status - API format (legacy proxy endpoint).
 
@@ -946,61 +966,68 @@ async def get_api_auth_toggle():
     return {"toggle_auth_supported": False}
 
 
+# /api/status response while no data is available yet
+_API_STATUS_DEFAULT = {
+    "din": None,
+    "start_time": None,
+    "up_time_seconds": None,
+    "is_new": False,
+    "version": "Unknown",
+    "git_hash": None,
+    "commission_count": 0,
+    "device_type": None,
+    "teg_type": "unknown",
+    "sync_type": "unknown",
+    "cellular_disabled": False,
+    "can_reboot": True,
+}
+
+
 @router.get("/api/status")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_status():
     """Get API status - API format (legacy proxy endpoint)."""
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
+    return _view_json("api_status", _API_STATUS_DEFAULT)
 
-    if status and status.data:
-        # Get DIN from status data
-        din = None
-        if status.data.status and isinstance(status.data.status, dict):
-            din = status.data.status.get("din")
-        
-        # Format start_time as ISO datetime string if available
-        start_time = None
-        if status.data.status and isinstance(status.data.status, dict):
-            start_time = status.data.status.get("start_time")
-        
-        # Get uptime as seconds or null
-        up_time_seconds = None
-        if status.data.status and isinstance(status.data.status, dict):
-            up_time_seconds = status.data.status.get("up_time_seconds")
-        
-        return {
-            "din": din or status.gateway.din if status.gateway else None,
-            "start_time": start_time,
-            "up_time_seconds": up_time_seconds,
-            "is_new": False,
-            "version": status.data.version or "Unknown",
-            "git_hash": status.data.status.get("git_hash") if status.data.status and isinstance(status.data.status, dict) else None,
-            "commission_count": status.data.status.get("commission_count", 0) if status.data.status and isinstance(status.data.status, dict) else 0,
-            "device_type": status.data.device_type,
-            "teg_type": status.data.status.get("teg_type", "unknown") if status.data.status and isinstance(status.data.status, dict) else "unknown",
-            "sync_type": status.data.status.get("sync_type", "unknown") if status.data.status and isinstance(status.data.status, dict) else "unknown",
-            "cellular_disabled": status.data.status.get("cellular_disabled", False) if status.data.status and isinstance(status.data.status, dict) else False,
-            "can_reboot": status.data.status.get("can_reboot", True) if status.data.status and isinstance(status.data.status, dict) else True,
-        }
 
+@register_view("api_status")
+def _view_api_status(data: PowerwallData) -> dict:
+    # Get DIN from status data
+    din = None
+    if data.status and isinstance(data.status, dict):
+        din = data.status.get("din")
+    if not din and isinstance(data.din, str):
+        din = data.din
+    
+    # Format start_time as ISO datetime string if available
+    start_time = None
+    if data.status and isinstance(data.status, dict):
+        start_time = data.status.get("start_time")
+    
+    # Get uptime as seconds or null
+    up_time_seconds = None
+    if data.status and isinstance(data.status, dict):
+        up_time_seconds = data.status.get("up_time_seconds")
+    
     return {
-        "din": None,
-        "start_time": None,
-        "up_time_seconds": None,
+        "din": din,
+        "start_time": start_time,
+        "up_time_seconds": up_time_seconds,
         "is_new": False,
-        "version": "Unknown",
-        "git_hash": None,
-        "commission_count": 0,
-        "device_type": None,
-        "teg_type": "unknown",
-        "sync_type": "unknown",
-        "cellular_disabled": False,
-        "can_reboot": True,
+        "version": data.version or "Unknown",
+        "git_hash": data.status.get("git_hash") if data.status and isinstance(data.status, dict) else None,
+        "commission_count": data.status.get("commission_count", 0) if data.status and isinstance(data.status, dict) else 0,
+        "device_type": data.device_type,
+        "teg_type": data.status.get("teg_type", "unknown") if data.status and isinstance(data.status, dict) else "unknown",
+        "sync_type": data.status.get("sync_type", "unknown") if data.status and isinstance(data.status, dict) else "unknown",
+        "cellular_disabled": data.status.get("cellular_disabled", False) if data.status and isinstance(data.status, dict) else False,
+        "can_reboot": data.status.get("can_reboot", True) if data.status and isinstance(data.status, dict) else True,
     }
 
 
 @router.get("/api/site_info")
 @router.head("/api/site_info", include_in_schema=False)
+@snapshot_cached(_default_gateway_scope)
 async def get_api_site_info():
     """Get site info - API format (legacy proxy endpoint)."""
     gateway_id = get_default_gateway()
@@ -1044,6 +1071,7 @@ async def get_api_site_info():
 
 
 @router.get("/api/site_info/site_name")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_site_name():
     """Get site name - API format (legacy proxy endpoint)."""
     gateway_id = get_default_gateway()
@@ -1063,6 +1091,7 @@ async def get_api_site_name():
 
 
 @router.get("/api/operation")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_operation():
     """Get operation mode and backup reserve - API format (legacy proxy endpoint).
 
@@ -1077,29 +1106,29 @@ async def get_api_operation():
         "backup"           - Backup-Only mode
         "autonomous"       - Time-Based Control mode
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    real_mode = "self_consumption"  # Default mode
-    backup_reserve_percent = 0.0
-
-    if status and status.data:
-        if status.data.reserve is not None:
-            backup_reserve_percent = status.data.reserve
+    def build(data: PowerwallData) -> Dict[str, Any]:
+        real_mode = "self_consumption"  # Default mode
+        backup_reserve_percent = 0.0
+        if data.reserve is not None:
+            backup_reserve_percent = data.reserve
 
         # Use the cached operation mode polled by the background task.
         # Fall back to system_status.default_real_mode if mode isn't cached yet.
-        if status.data.mode:
-            real_mode = status.data.mode
-        elif status.data.system_status and isinstance(status.data.system_status, dict):
-            mode = status.data.system_status.get("default_real_mode")
+        if data.mode:
+            real_mode = data.mode
+        elif data.system_status and isinstance(data.system_status, dict):
+            mode = data.system_status.get("default_real_mode")
             if mode:
                 real_mode = mode
 
-    return {
-        "real_mode": real_mode,
-        "backup_reserve_percent": backup_reserve_percent,
-    }
+        return {
+            "real_mode": real_mode,
+            "backup_reserve_percent": backup_reserve_percent,
+        }
+
+    return _snapshot_json(
+        "operation", build, {"real_mode": "self_consumption", "backup_reserve_percent": 0.0}
+    )
 
 
 @router.get("/api/customer/registration")
@@ -1123,51 +1152,36 @@ async def get_api_grid_faults():
 
 
 @router.get("/api/meters/aggregates")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_aggregates():
     """Get power aggregates - API format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     Returns empty object if no data available yet (e.g., during startup).
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
     # Graceful degradation: return cached data or empty object
-    if not status or not status.data:
-        return {}
-
-    return status.data.aggregates or {}
+    return _snapshot_json("aggregates", lambda data: data.aggregates or {}, {})
 
 
 @router.get("/api/networks")
 @router.get("/api/system/networks")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_networks():
     """Get network configuration - API format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return []
-
-    return status.data.networks or []
+    return _snapshot_json("networks", lambda data: data.networks or [], [])
 
 
 @router.get("/api/powerwalls")
+@snapshot_cached(_default_gateway_scope)
 async def get_api_powerwalls():
     """Get powerwalls list - API format (legacy proxy endpoint).
 
     Uses graceful degradation: returns cached data even if gateway is temporarily offline.
     """
-    gateway_id = get_default_gateway()
-    status = gateway_manager.get_gateway(gateway_id)
-
-    if not status or not status.data:
-        return {}
-
-    return status.data.powerwalls or {}
+    return _snapshot_json("powerwalls", lambda data: data.powerwalls or {}, {})
 
 
 # NOTE: No catch-all /api/{path:path} routes!
@@ -1302,6 +1316,9 @@ async def get_stats():
         ),
         "last_success_time": time.time() if online_count > 0 else 0,
         "cache_size": total_gateways,
+        "executor": gateway_manager.get_executor_health(),
+        "response_cache": response_cache.get_stats(),
+        "history": {**history_store.get_stats(), "database": history_archive.get_stats()},
     }
 
     # Build stats response (compatible with old proxy format)
@@ -1353,6 +1370,7 @@ async def get_stats():
 
 
 @router.get("/version")
+@snapshot_cached(_default_gateway_scope)
 async def get_version():
     """Get firmware version (legacy proxy endpoint).
 
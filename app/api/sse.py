@@ -0,0 +1,157 @@
+"""
+Server-Sent Events Endpoints for Real-Time Data Streaming
+
+Plain-HTTP alternative to the WebSocket streams for clients that cannot use
+WebSockets (curl scripts, the Home Assistant REST integration, browsers
+behind proxies that block upgrades). All routes are prefixed with /sse
+(configured in main.py).
+
+Routes:
+    - GET /sse/aggregate            -> Aggregated data from all gateways
+    - GET /sse/gateway/{gateway_id} -> Data for a specific gateway
+
+Event Format:
+    id: 3f9c2a1b-42
+    event: update
+    data: {...AggregateData or GatewayStatus JSON...}
+
+    The id is "{BOOT_ID}-{version}": the stream's snapshot version (see
+    app/core/streams.py) prefixed with a per-process epoch, since versions
+    restart at 0 when the server restarts. While
+    no poll completes for PW_SSE_HEARTBEAT seconds a ": keepalive" comment is
+    sent so proxies do not close the idle connection.
+
+Resume:
+    EventSource reconnects send the last id as the Last-Event-ID header
+    (?last_event_id= works too). If the id is from this process and the
+    stream is still at that version nothing is resent; otherwise (including
+    ids from an earlier process) the current snapshot, which supersedes
+    everything missed, is sent at once.
+
+Design Notes:
+    - Fed from the gateway manager's cache-update signal, like the WebSocket
+      hub: an event goes out as soon as a poll stores new data
+    - Each event is built and encoded once per snapshot version and the same
+      bytes are shared by every SSE client of the stream
+"""
+import logging
+import uuid
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.core.gateway_manager import gateway_manager
+from app.core.response_cache import encode_json
+from app.core.streams import AGGREGATE_STREAM, build_payload, gateway_stream, stream_version
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+KEEPALIVE = b": keepalive\n\n"
+
+# Per-process epoch of event ids, so ids from before a restart are never
+# mistaken for the restarted process's (equal) snapshot versions
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# Encoded events shared by all clients: stream -> (version, event bytes)
+_events: Dict[str, Tuple[int, bytes]] = {}
+
+
+def encode_event(stream: str) -> Tuple[int, bytes]:
+    """Current (version, encoded event) of a stream, encoded once per version."""
+    version = stream_version(stream)
+    cached = _events.get(stream)
+    if cached is not None and cached[0] == version:
+        return cached
+    data = encode_json(build_payload(stream))
+    event = b"id: %s-%d\nevent: update\ndata: %s\n\n" % (BOOT_ID.encode(), version, data)
+    _events[stream] = (version, event)
+    return version, event
+
+
+def _last_event_id(request: Request) -> Optional[int]:
+    """Version the client last received (Last-Event-ID header or query).
+
+    None for missing or malformed ids and ids from another process (BOOT_ID).
+    """
+    value = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    epoch, _, version = (value or "").rpartition("-")
+    if epoch != BOOT_ID:
+        return None
+    try:
+        return int(version)
+    except ValueError:
+        return None
+
+
+async def event_stream(
+    request: Request, stream: str, gateway_id: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """Yield a stream's events as polls update it, with keepalive comments.
+
+    Args:
+        request: The client request (for Last-Event-ID and disconnects)
+        stream: Stream name (see app/core/streams.py)
+        gateway_id: Gateway whose updates feed the stream, None for any
+    """
+    seen = _last_event_id(request)
+    while not await request.is_disconnected():
+        current = stream_version(stream)
+        if current != seen:
+            # A version differing from the client's (older, or an id from
+            # another process) means it missed updates: send the current snapshot
+            seen, event = encode_event(stream)
+            yield event
+            continue
+
+        heartbeat = settings.sse_heartbeat or None
+        if not await gateway_manager.wait_for_snapshot(gateway_id, seen, heartbeat):
+            yield KEEPALIVE
+
+
+def _event_response(request: Request, stream: str, gateway_id: Optional[str] = None):
+    return StreamingResponse(
+        event_stream(request, stream, gateway_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        },
+    )
+
+
+@router.get("/aggregate")
+async def sse_aggregate(request: Request):
+    """
+    Stream aggregated data from all gateways as Server-Sent Events.
+
+    HTTP endpoint: GET /sse/aggregate
+
+    Sends an "update" event with the AggregateData after every poll. Example:
+
+        curl -N http://localhost:8675/sse/aggregate
+    """
+    return _event_response(request, AGGREGATE_STREAM)
+
+
+@router.get("/gateway/{gateway_id}")
+async def sse_gateway(request: Request, gateway_id: str):
+    """
+    Stream data for a specific gateway as Server-Sent Events.
+
+    HTTP endpoint: GET /sse/gateway/{gateway_id}
+
+    Sends an "update" event with the GatewayStatus after every poll of
+    this gateway.
+
+    Args:
+        gateway_id: Gateway identifier (e.g., "default", "home", "cabin")
+
+    Raises:
+        HTTPException: 404 if gateway_id is not found
+    """
+    if gateway_manager.get_gateway(gateway_id) is None:
+        raise HTTPException(status_code=404, detail=f"Gateway {gateway_id} not found")
+    return _event_response(request, gateway_stream(gateway_id), gateway_id)
@@ -7,17 +7,37 @@ All routes are prefixed with /ws (configured in main.py).
 Routes:
     - WS /ws/aggregate            -> Real-time aggregated data from all gateways
     - WS /ws/gateway/{gateway_id} -> Real-time data for specific gateway
+    - WS /ws/stream               -> Multiplexed subscriptions (gateways, views, field masks)
+    - GET /ws/clients             -> Connected clients, queue depths, drop counters
     
 Connection Flow:
     1. Client connects to WebSocket endpoint
     2. Server accepts connection and adds to active connections
-    3. Server pushes JSON data every 1 second
+    3. Server pushes JSON data each time a poll updates the gateway cache
     4. Connection remains open until client disconnects or error occurs
     5. Dead connections are automatically cleaned up
 
 Data Format:
     - Aggregate endpoint: AggregateData model (all gateways combined)
     - Gateway endpoint: GatewayStatus model (single gateway data)
+    - Stream endpoint: {"type": "update", "stream": "gateway/home/soe",
+      "version": 42, "data": {...}} per subscribed stream (see websocket_stream)
+
+Delta Format (?delta=yes or subprotocol "pw-delta"):
+    - On connect: {"type": "snapshot", "stream": "gateway/home", "version": 42, "data": {...}}
+    - On update:  {"type": "patch", "stream": "gateway/home", "version": 43, "base": 42,
+                   "ops": [{"op": "replace", "path": "/data/soe", "value": 80.1}, ...]}
+    - ops are RFC 6902 add/remove/replace operations on the snapshot's
+      "data" document (a GatewayStatus, hence "/data/soe" above); apply them
+      in order (see app/utils/json_diff.apply_patch)
+
+Binary Encodings (?encoding=msgpack|cbor or a subprotocol):
+    - Frames are sent as binary MessagePack or CBOR messages instead of JSON
+      text, with the same structure; requires the optional msgpack / cbor2
+      package (see app/core/encodings.py)
+    - Subprotocols: "pw-msgpack", "pw-cbor", "pw-delta-msgpack", "pw-delta-cbor"
+    - Each frame is encoded once per update and encoding and shared by all
+      subscribers using it
     
 Usage Example:
     JavaScript:
@@ -35,70 +55,541 @@ Usage Example:
                 print(json.loads(data))
 
 Design Notes:
-    - Updates push every 1 second (no client polling needed)
+    - Push-on-poll: a frame goes out as soon as a poll stores new data for
+      the stream, not on a fixed timer (no client polling needed)
+    - Optional keepalive: the current frame is resent after PW_WS_HEARTBEAT
+      seconds without an update (default 30, 0 = off)
+    - One hub task per server, not one loop per client: each stream's frame
+      is built and encoded once per update and the same text is sent to every
+      subscriber (ConnectionManager is the subscription registry)
+    - Bounded per-client queues (latest value wins) with a send timeout;
+      chronically slow clients are evicted instead of holding up the hub
     - Graceful handling of client disconnects (no errors logged)
     - Automatic cleanup of broken connections
-    - ConnectionManager broadcasts to all clients efficiently
-    - Empty except blocks are intentional (normal disconnect flow)
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import asyncio
+import json
 import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
 
+from app.config import settings
 from app.core.gateway_manager import gateway_manager
+from app.core import encodings
+from app.core.streams import (
+    AGGREGATE_STREAM,
+    GATEWAY_VIEWS,
+    build_payload,
+    gateway_stream,
+    mask_fields,
+    stream_version,
+)
+from app.utils import json_diff
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+# Frame formats a subscriber can negotiate
+FULL = "full"  # Complete payload on every update (default, original protocol)
+MUX = "mux"  # Complete payload tagged with its channel (/ws/stream)
+DELTA = "delta"  # Snapshot on subscribe, then JSON-Patch frames
+
+# Subprotocols selecting a frame format and encoding (alternative to the
+# ?delta= and ?encoding= query parameters)
+DELTA_SUBPROTOCOL = "pw-delta"
+SUBPROTOCOLS: Dict[str, Tuple[str, str]] = {
+    DELTA_SUBPROTOCOL: (DELTA, encodings.JSON),
+    "pw-msgpack": (FULL, encodings.MSGPACK),
+    "pw-cbor": (FULL, encodings.CBOR),
+    "pw-delta-msgpack": (DELTA, encodings.MSGPACK),
+    "pw-delta-cbor": (DELTA, encodings.CBOR),
+}
+
+
+def channel_name(stream: str, fields: Optional[Iterable[str]] = None) -> str:
+    """Subscription key for a stream, optionally restricted to a field mask.
+
+    Subscribers with the same stream and mask share one channel, so its
+    frames are encoded once for all of them.
+    """
+    if not fields:
+        return stream
+    return f"{stream}?fields={','.join(sorted(set(fields)))}"
+
+
+# An encoded frame: str for JSON text frames, bytes for binary encodings
+Frame = Union[str, bytes]
+
+
+class _StreamState:
+    """Latest payload of a channel and its frames, encoded once per update."""
+
+    __slots__ = ("channel", "stream", "fields", "payload", "version", "base", "ops", "frames")
+
+    def __init__(self, stream: str, fields: Optional[Iterable[str]] = None):
+        self.channel = channel_name(stream, fields)
+        self.stream = stream
+        self.fields = sorted(set(fields)) if fields else None
+        self.payload: Any = None
+        self.version: Optional[int] = None
+        self.base: Optional[int] = None  # Version the ops apply to
+        self.ops: List[Dict[str, Any]] = []  # JSON-Patch from base to version
+        self.frames: Dict[Tuple[str, str], Frame] = {}  # (kind, encoding) -> encoded frame
+
+
+class _Client:
+    """Outbound side of one connection: a bounded frame queue and its counters.
+
+    Frames are queued by the hub as (channel, text) and written by the
+    client's own writer task, so a stalled client never blocks the hub or
+    other clients.
+    """
+
+    def __init__(self, client_id: int, websocket: WebSocket, fmt: str, encoding: str):
+        self.id = client_id
+        self.websocket = websocket
+        self.fmt = fmt
+        self.encoding = encoding
+        self.channels: Set[str] = set()
+        self.queue: Deque[Tuple[Optional[str], Frame]] = deque()
+        self.ready = asyncio.Event()
+        self.resync: Set[str] = set()  # Delta channels that missed a patch
+        self.sent = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self.strikes = 0  # Consecutive send timeouts
+        self.connected_at = time.time()
+        self.writer: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        remote = getattr(self.websocket, "client", None)
+        return {
+            "id": self.id,
+            "remote": f"{remote.host}:{remote.port}" if remote else None,
+            "streams": sorted(self.channels),
+            "format": self.fmt,
+            "encoding": self.encoding,
+            "connected_at": self.connected_at,
+            "queue_depth": len(self.queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "timeouts": self.timeouts,
+        }
+
+
 class ConnectionManager:
     """
-    Manages WebSocket connections for broadcasting data.
+    Registry of WebSocket connections and broadcast hub for live streams.
+
+    Connections subscribe to channels: a stream (see app/core/streams.py),
+    optionally restricted to a field mask. /ws/aggregate and /ws/gateway/{id}
+    hold one channel each; /ws/stream clients subscribe and unsubscribe at
+    will. A single hub task waits for the gateway manager to store a new
+    snapshot, then builds each affected channel's payload once, encodes each
+    frame kind once and queues the same text for all of that channel's
+    subscribers, so the cost per update does not grow with the number of
+    clients.
+
+    Subscribers choose a frame format when connecting:
+        full  - the complete payload on every update
+        mux   - {"type": "update", "stream", "version", "data"}, the full
+                payload tagged with its channel (/ws/stream)
+        delta - {"type": "snapshot", "stream", "version", "data"} on
+                subscribe, then {"type": "patch", "stream", "version", "base",
+                "ops"} with the JSON-Patch operations (app/utils/json_diff.py)
+                from the previous version; the diff is computed once per
+                update and shared
 
-    Maintains a list of active WebSocket connections and provides methods
-    for connecting, disconnecting, and broadcasting messages to all clients.
+    When no poll completes for PW_WS_HEARTBEAT seconds the current frames are
+    sent again as a keepalive (0 disables the heartbeat); delta subscribers
+    get a patch with no (or only the changed) operations.
 
-    Automatically cleans up dead connections during broadcast to prevent
-    memory leaks from clients that disconnect without proper close handshake.
+    Backpressure:
+        Each client has a queue of at most PW_WS_QUEUE_SIZE frames drained by
+        its own writer task. When the queue is full the oldest frame of the
+        same channel (or else the oldest frame) is dropped, so the latest
+        value wins; a delta client that loses patches gets fresh snapshots
+        instead. Each send is limited to PW_WS_SEND_TIMEOUT seconds and a
+        client that times out PW_WS_EVICT_AFTER times in a row is
+        disconnected. Per-client counters are served at GET /ws/clients.
+
+    The hub task starts with the first subscription and stops when the last
+    one goes away. Dead connections found while sending are cleaned up so
+    clients that vanish without a close handshake do not leak.
     """
 
     def __init__(self):
         self.active_connections: list[WebSocket] = []
+        self.clients: Dict[WebSocket, _Client] = {}
+        self.subscriptions: Dict[str, Dict[WebSocket, str]] = {}  # channel -> {socket: format}
+        self.evicted = 0
+        self._next_client_id = 0
+        self._streams: Dict[str, _StreamState] = {}  # channel -> state
+        self._hub_task: Optional[asyncio.Task] = None
 
-    async def connect(self, websocket: WebSocket):
-        """Accept and register a new WebSocket connection."""
-        await websocket.accept()
+    async def connect(
+        self,
+        websocket: WebSocket,
+        stream: Optional[str] = None,
+        fmt: str = FULL,
+        subprotocol: Optional[str] = None,
+        encoding: str = encodings.JSON,
+    ):
+        """Accept and register a new WebSocket connection.
+
+        With a stream, the client is subscribed to it right away (see
+        subscribe()).
+        """
+        await websocket.accept(subprotocol=subprotocol)
         self.active_connections.append(websocket)
+        self._next_client_id += 1
+        client = self.clients[websocket] = _Client(
+            self._next_client_id, websocket, fmt, encoding
+        )
+        client.writer = asyncio.create_task(
+            self._writer(client), name=f"ws-writer-{client.id}"
+        )
+        if stream is not None:
+            await self.subscribe(websocket, stream)
+
+    async def subscribe(
+        self, websocket: WebSocket, stream: str, fields: Optional[Iterable[str]] = None
+    ) -> str:
+        """Subscribe a connected client to a stream (optionally field-masked).
+
+        The client immediately receives the channel's current frame (a
+        snapshot for delta subscribers) and then every frame the hub
+        publishes. Returns the channel name.
+        """
+        client = self.clients[websocket]
+        channel = channel_name(stream, fields)
+        if channel in client.channels:
+            return channel
+
+        state = self._streams.get(channel)
+        if state is not None and state.version != stream_version(stream):
+            # Bring existing subscribers up to date before the new one joins,
+            # so every delta subscriber shares the same base version
+            await self.publish(channel)
+            state = self._streams.get(channel)
+        if state is None:
+            state = self._streams[channel] = _StreamState(stream, fields)
+            self._update(state)
+
+        self.subscriptions.setdefault(channel, {})[websocket] = client.fmt
+        client.channels.add(channel)
+        kind = "snapshot" if client.fmt == DELTA else client.fmt
+        self._enqueue(client, self._frame(state, kind, client.encoding), channel)
+        self._ensure_hub()
+        return channel
+
+    def unsubscribe(self, websocket: WebSocket, channel: str):
+        """Remove one subscription of a client."""
+        client = self.clients.get(websocket)
+        if client is not None:
+            client.channels.discard(channel)
+            client.resync.discard(channel)
+        subscribers = self.subscriptions.get(channel)
+        if subscribers is not None:
+            subscribers.pop(websocket, None)
+            if not subscribers:
+                del self.subscriptions[channel]
+                self._streams.pop(channel, None)
+        if not self.subscriptions and self._hub_task is not None:
+            self._hub_task.cancel()
+            self._hub_task = None
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection from active list."""
-        self.active_connections.remove(websocket)
+        """Remove a WebSocket connection, its subscriptions and its writer."""
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        client = self.clients.pop(websocket, None)
+        if client is not None and client.writer is not None:
+            client.writer.cancel()
+        for channel in list(self.subscriptions):
+            if websocket in self.subscriptions[channel]:
+                self.unsubscribe(websocket, channel)
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Queue a control message (e.g. a subscribe reply) for one client."""
+        client = self.clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, encodings.encode(message, client.encoding))
 
     async def broadcast(self, message: dict):
         """
         Broadcast message to all connected clients.
 
-        Automatically detects and removes dead connections that fail to
-        receive data. This handles cases where clients disconnect without
-        sending a proper WebSocket close frame.
+        The message is encoded once per encoding and queued for every client;
+        delivery follows the same backpressure rules as stream frames.
         """
-        dead_connections = []
-        for connection in self.active_connections:
+        frames: Dict[str, Frame] = {}
+        for client in list(self.clients.values()):
+            frame = frames.get(client.encoding)
+            if frame is None:
+                frame = frames[client.encoding] = encodings.encode(message, client.encoding)
+            self._enqueue(client, frame)
+
+    async def publish(self, channel: str):
+        """Rebuild a channel's payload once and queue each subscriber its frame."""
+        subscribers = self.subscriptions.get(channel)
+        state = self._streams.get(channel)
+        if not subscribers or state is None:
+            return
+        self._update(state)
+        for websocket in list(subscribers):
+            client = self.clients.get(websocket)
+            if client is None:
+                continue
+            if client.fmt == DELTA:
+                self._enqueue(
+                    client,
+                    self._frame(state, "patch", client.encoding),
+                    channel,
+                    lambda encoding=client.encoding: self._frame(state, "snapshot", encoding),
+                )
+            else:
+                self._enqueue(client, self._frame(state, client.fmt, client.encoding), channel)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-client queue depth and delivery counters."""
+        return {
+            "connections": len(self.clients),
+            "channels": len(self.subscriptions),
+            "evicted": self.evicted,
+            "queue_size": settings.ws_queue_size,
+            "send_timeout": settings.ws_send_timeout,
+            "clients": [client.to_dict() for client in self.clients.values()],
+        }
+
+    def _update(self, state: _StreamState):
+        """Replace a channel's payload and compute its delta from the previous one."""
+        previous = state.payload
+        state.base = state.version
+        state.version = stream_version(state.stream)
+        state.payload = build_payload(state.stream)
+        if state.fields:
+            state.payload = mask_fields(state.payload, state.fields)
+        state.ops = json_diff.diff(previous, state.payload) if state.base is not None else []
+        state.frames = {}
+
+    def _frame(self, state: _StreamState, kind: str, encoding: str = encodings.JSON) -> Frame:
+        """Frame of the given kind and encoding for the current payload (cached)."""
+        frame = state.frames.get((kind, encoding))
+        if frame is None:
+            if kind == FULL:
+                message = state.payload
+            elif kind == MUX:
+                message = {
+                    "type": "update",
+                    "stream": state.channel,
+                    "version": state.version,
+                    "data": state.payload,
+                }
+            elif kind == "snapshot":
+                message = {
+                    "type": "snapshot",
+                    "stream": state.channel,
+                    "version": state.version,
+                    "data": state.payload,
+                }
+            else:
+                message = {
+                    "type": "patch",
+                    "stream": state.channel,
+                    "version": state.version,
+                    "base": state.base,
+                    "ops": state.ops,
+                }
+            frame = state.frames[(kind, encoding)] = encodings.encode(message, encoding)
+        return frame
+
+    def _enqueue(
+        self,
+        client: _Client,
+        frame: Frame,
+        channel: Optional[str] = None,
+        snapshot: Optional[Callable[[], Frame]] = None,
+    ):
+        """Queue a frame for a client, dropping an older one when the queue is full.
+
+        ``snapshot`` supplies a full snapshot frame for delta clients; it
+        replaces the patch whenever the client has missed an earlier patch
+        of the channel.
+        """
+        limit = max(1, settings.ws_queue_size)
+        if len(client.queue) >= limit:
+            if client.fmt == DELTA:
+                # Patches only apply in sequence: discard them all and resync
+                self._reset(client)
+            else:
+                # Latest value wins: drop this channel's oldest frame if queued
+                for index, (queued, _) in enumerate(client.queue):
+                    if queued == channel:
+                        del client.queue[index]
+                        break
+                else:
+                    client.queue.popleft()
+                client.dropped += 1
+
+        if channel in client.resync and snapshot is not None:
+            frame = snapshot()
+            client.resync.discard(channel)
+
+        client.queue.append((channel, frame))
+        client.ready.set()
+
+    def _reset(self, client: _Client):
+        """Drop a client's queued frames; delta channels restart with a snapshot."""
+        client.dropped += len(client.queue)
+        client.queue.clear()
+        if client.fmt == DELTA:
+            client.resync = set(client.channels)
+
+    async def _writer(self, client: _Client):
+        """Send a client's queued frames, one at a time, with a send timeout."""
+        websocket = client.websocket
+        while True:
+            if not client.queue:
+                client.ready.clear()
+                await client.ready.wait()
+                continue
+
+            _, frame = client.queue.popleft()
+            if isinstance(frame, bytes):
+                send = websocket.send_bytes(frame)
+            else:
+                send = websocket.send_text(frame)
             try:
-                await connection.send_json(message)
+                await asyncio.wait_for(send, settings.ws_send_timeout or None)
+            except asyncio.TimeoutError:
+                client.timeouts += 1
+                client.strikes += 1
+                if client.fmt == DELTA:
+                    self._reset(client)  # The patch may not have arrived
+                if client.strikes >= max(1, settings.ws_evict_after):
+                    self._evict(client)
+                    return
+                continue
             except Exception as e:
                 logger.error(f"Error sending to websocket: {e}")
-                dead_connections.append(connection)
+                self.disconnect(websocket)
+                return
+
+            client.sent += 1
+            client.strikes = 0
 
-        # Clean up dead connections
-        for connection in dead_connections:
-            if connection in self.active_connections:
-                self.active_connections.remove(connection)
+    def _evict(self, client: _Client):
+        """Disconnect a chronically slow client."""
+        self.evicted += 1
+        logger.warning(
+            f"Evicting slow websocket client {client.id} ({', '.join(sorted(client.channels))}): "
+            f"{client.timeouts} send timeouts, {client.dropped} frames dropped"
+        )
+        self.disconnect(client.websocket)
+        asyncio.create_task(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            # 1013 = Try Again Later
+            await asyncio.wait_for(websocket.close(code=1013), settings.ws_send_timeout or None)
+        except Exception:
+            pass
+
+    def _ensure_hub(self):
+        if self._hub_task is None or self._hub_task.done():
+            self._hub_task = asyncio.create_task(self._run_hub(), name="ws-hub")
+
+    async def _run_hub(self):
+        """Publish channels when a poll stores new data, or on heartbeat."""
+        seen = gateway_manager.get_snapshot_version()
+        while self.subscriptions:
+            heartbeat = settings.ws_heartbeat or None
+            updated = await gateway_manager.wait_for_snapshot(None, seen, heartbeat)
+            seen = gateway_manager.get_snapshot_version()
+            for channel in list(self.subscriptions):
+                # On heartbeat every channel is resent; on update only changed ones
+                state = self._streams.get(channel)
+                if updated and state is not None and state.version == stream_version(state.stream):
+                    continue
+                try:
+                    await self.publish(channel)
+                except Exception as e:
+                    logger.error(f"WebSocket hub error ({channel}): {type(e).__name__}: {e}")
 
 
 manager = ConnectionManager()
 
 
+def _negotiate_format(websocket: WebSocket) -> Tuple[str, str, Optional[str]]:
+    """Frame format, encoding and accepted subprotocol requested by a client.
+
+    Delta frames are selected with ?delta=yes, binary encodings with
+    ?encoding=msgpack|cbor; or both with a subprotocol from SUBPROTOCOLS (the
+    first one offered that this server supports wins).
+
+    Raises:
+        ValueError: ?encoding= names an unknown or uninstalled encoding.
+    """
+    usable = encodings.available()
+    for requested in websocket.scope.get("subprotocols") or []:
+        selected = SUBPROTOCOLS.get(requested)
+        if selected is not None and selected[1] in usable:
+            return selected[0], selected[1], requested
+
+    fmt = FULL
+    if websocket.query_params.get("delta", "").lower() in ("1", "yes", "true"):
+        fmt = DELTA
+    encoding = websocket.query_params.get("encoding", encodings.JSON).lower()
+    if encoding not in usable:
+        raise ValueError(encodings.unavailable_reason(encoding))
+    return fmt, encoding, None
+
+
+async def _accept_negotiated(
+    websocket: WebSocket, stream: Optional[str] = None, mux: bool = False
+) -> bool:
+    """Negotiate the client's frame format and register the connection.
+
+    A client asking for an encoding this server cannot produce gets a JSON
+    error frame and is closed (1003, unsupported data). Returns False then.
+    """
+    try:
+        fmt, encoding, subprotocol = _negotiate_format(websocket)
+    except ValueError as e:
+        await websocket.accept()
+        await websocket.send_text(encodings.encode({"error": str(e)}))
+        await websocket.close(code=1003)
+        return False
+    if mux and fmt == FULL:
+        fmt = MUX
+    await manager.connect(websocket, stream, fmt, subprotocol, encoding)
+    return True
+
+
+async def _serve_stream(websocket: WebSocket, stream: str):
+    """Subscribe a client to a stream and hold the connection until it closes.
+
+    Frames are sent by the hub; this coroutine only watches for the close.
+    """
+    if not await _accept_negotiated(websocket, stream):
+        return
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"WebSocket error ({stream}): {type(e).__name__}: {e}")
+    finally:
+        manager.disconnect(websocket)
+
+
 @router.websocket("/aggregate")
 async def websocket_aggregate(websocket: WebSocket):
     """
@@ -107,7 +598,7 @@ async def websocket_aggregate(websocket: WebSocket):
     WebSocket endpoint: /ws/aggregate
 
     Pushes combined battery, power, and energy data from all configured
-    gateways every second. Useful for dashboard displays showing total
+    gateways after every poll. Useful for dashboard displays showing total
     system capacity and performance.
 
     Data includes:
@@ -117,18 +608,7 @@ async def websocket_aggregate(websocket: WebSocket):
         - total_battery_power: Combined battery charge/discharge
         - total_load_power: Combined load consumption
     """
-    await manager.connect(websocket)
-    try:
-        while True:
-            # Send aggregate data every second
-            data = gateway_manager.get_aggregate_data()
-            await websocket.send_json(data.model_dump())
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-    except Exception as e:
-        logger.error(f"WebSocket error (aggregate): {type(e).__name__}: {e}")
-        manager.disconnect(websocket)
+    await _serve_stream(websocket, AGGREGATE_STREAM)
 
 
 @router.websocket("/gateway/{gateway_id}")
@@ -139,7 +619,7 @@ async def websocket_gateway(websocket: WebSocket, gateway_id: str):
     WebSocket endpoint: /ws/gateway/{gateway_id}
 
     Pushes complete gateway status including vitals, aggregates, battery
-    level, and online status every second. Use this for monitoring a
+    level, and online status after every poll. Use this for monitoring a
     specific Powerwall system in detail.
 
     Args:
@@ -147,17 +627,156 @@ async def websocket_gateway(websocket: WebSocket, gateway_id: str):
 
     Returns error message if gateway_id is not found or goes offline.
     """
-    await manager.connect(websocket)
+    await _serve_stream(websocket, gateway_stream(gateway_id))
+
+
+# Views accepted by /ws/stream: "aggregate", "status" (full GatewayStatus) and
+# the gateway views of app/core/streams.py
+STREAM_VIEWS = ("aggregate", "status", *GATEWAY_VIEWS)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    raise ValueError("expected a string or a list of strings")
+
+
+def _resolve_streams(message: Dict[str, Any]) -> List[str]:
+    """Stream names selected by a /ws/stream subscribe or unsubscribe message.
+
+    Every view is combined with every gateway; "aggregate" ignores gateways
+    and gateway "*" stands for all configured gateways. Unknown gateways are
+    rejected so clients cannot create streams for IDs that never publish.
+    """
+    gateways = _as_list(message.get("gateways", message.get("gateway")))
+    views = _as_list(message.get("views", message.get("view"))) or ["status"]
+    if "*" in gateways:
+        gateways = list(gateway_manager.gateways)
+    for gateway_id in gateways:
+        if gateway_id not in gateway_manager.gateways:
+            raise ValueError(f"unknown gateway '{gateway_id}'")
+
+    streams = []
+    for view in views:
+        if view not in STREAM_VIEWS:
+            raise ValueError(f"unknown view '{view}' (expected one of: {', '.join(STREAM_VIEWS)})")
+        if view == "aggregate":
+            streams.append(AGGREGATE_STREAM)
+            continue
+        if not gateways:
+            raise ValueError(f"view '{view}' requires a gateway")
+        for gateway_id in gateways:
+            streams.append(gateway_stream(gateway_id, None if view == "status" else view))
+    return streams
+
+
+def _check_channel_limit(websocket: WebSocket, channels: List[str]):
+    """Refuse a subscribe that would exceed PW_WS_MAX_CHANNELS for the connection."""
+    client = manager.clients.get(websocket)
+    current = client.channels if client is not None else set()
+    total = len(current | set(channels))
+    if total > settings.ws_max_channels:
+        raise ValueError(
+            f"too many streams ({total}); at most {settings.ws_max_channels} per connection"
+        )
+
+
+async def _handle_stream_message(websocket: WebSocket, text: str):
+    """Apply one /ws/stream control message and queue the reply."""
+    try:
+        message = json.loads(text)
+        if not isinstance(message, dict):
+            raise ValueError("expected a JSON object")
+        action = message.get("action")
+        if action not in ("subscribe", "unsubscribe"):
+            raise ValueError("action must be 'subscribe' or 'unsubscribe'")
+        fields = _as_list(message.get("fields")) or None
+        if action == "unsubscribe" and "streams" in message:
+            streams, channels = [], _as_list(message["streams"])
+        else:
+            streams = _resolve_streams(message)
+            channels = [channel_name(stream, fields) for stream in streams]
+        if action == "subscribe":
+            _check_channel_limit(websocket, channels)
+    except ValueError as e:
+        await manager.send(websocket, {"type": "error", "error": str(e)})
+        return
+
+    if action == "unsubscribe":
+        for channel in channels:
+            manager.unsubscribe(websocket, channel)
+        await manager.send(websocket, {"type": "unsubscribed", "streams": channels})
+        return
+
+    # Acknowledge first so the reply precedes the subscriptions' first frames
+    await manager.send(websocket, {"type": "subscribed", "streams": channels})
+    for stream in streams:
+        await manager.subscribe(websocket, stream, fields)
+
+
+@router.websocket("/stream")
+async def websocket_stream(websocket: WebSocket):
+    """
+    Multiplexed stream: any number of gateways and views on one connection.
+
+    WebSocket endpoint: /ws/stream
+
+    The client selects what it receives with control messages:
+
+        {"action": "subscribe", "gateways": ["home", "cabin"],
+         "views": ["power", "soe"], "fields": ["site", "solar"]}
+        {"action": "subscribe", "view": "aggregate"}
+        {"action": "unsubscribe", "streams": ["gateway/home/soe"]}
+
+    Unknown gateways and subscriptions beyond PW_WS_MAX_CHANNELS streams
+    (stream + field mask) per connection are answered with an error frame.
+
+    Views: aggregate, status (full GatewayStatus), power, soe, vitals,
+    strings and alerts. Each view is subscribed for each gateway ("*" = all
+    configured gateways). "fields" optionally limits payloads to the listed
+    keys (dotted names select nested keys, e.g. "data.soe"). Unsubscribe
+    takes the same selectors or the stream names from the "subscribed" reply.
+
+    Server frames:
+        {"type": "subscribed" | "unsubscribed", "streams": [...]}
+        {"type": "update", "stream": "gateway/home/power", "version": 7, "data": {...}}
+        {"type": "error", "error": "..."}
+
+    With ?delta=yes or the "pw-delta" subprotocol, "update" frames are
+    replaced by "snapshot" and "patch" frames as on the other endpoints.
+    Frames are shared by every client with the same stream and field mask,
+    so each is encoded once per update.
+    """
+    if not await _accept_negotiated(websocket, mux=True):
+        return
     try:
         while True:
-            status = gateway_manager.get_gateway(gateway_id)
-            if status:
-                await websocket.send_json(status.model_dump())
-            else:
-                await websocket.send_json({"error": "Gateway not found"})
-            await asyncio.sleep(1)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("text") is not None:
+                await _handle_stream_message(websocket, message["text"])
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
     except Exception as e:
-        logger.error(f"WebSocket error (gateway={gateway_id}): {type(e).__name__}: {e}")
+        logger.error(f"WebSocket error (stream): {type(e).__name__}: {e}")
+    finally:
         manager.disconnect(websocket)
+
+
+@router.get("/clients")
+async def websocket_clients():
+    """
+    List connected WebSocket clients with their backpressure counters.
+
+    HTTP endpoint: GET /ws/clients
+
+    For each client: stream, frame format, current queue depth and the
+    number of frames sent, dropped (queue full) and timed out. "evicted"
+    counts clients disconnected for being too slow.
+    """
+    return manager.get_stats()
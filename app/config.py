@@ -50,6 +50,28 @@ Environment Variables (Proxy Compatible):
         PW_BROWSER_CACHE     - Browser cache time in seconds (default: 0)
         PW_TIMEOUT           - Pypowerwall timeout in seconds (default: 10)
         PW_POOL_MAXSIZE      - Connection pool size (default: 15)
+        PW_POLL_CONCURRENCY  - Max concurrent fetches per gateway per poll (default: 3)
+        PW_POLL_JITTER       - Poll start jitter as fraction of interval (default: 0.1)
+        PW_POLL_BUDGET       - Seconds allowed per gateway poll, 0 = 80% of PW_CACHE_EXPIRE (default: 0)
+        PW_GATEWAY_THREAD_LIMIT - Max executor threads per gateway incl. hung calls, 0 = PW_POLL_CONCURRENCY + 1 (default: 0)
+        PW_LOCAL_POOL_SIZE   - Threads for local gateway reads, 0 = auto (default: 0)
+        PW_CLOUD_POOL_SIZE   - Threads for Cloud/FleetAPI reads, 0 = auto (default: 0)
+        PW_CONTROL_POOL_SIZE - Threads for cloud control writes, 0 = auto (default: 0)
+        PW_ASYNC_TRANSPORT   - Native async reads for local (password) gateways "yes"/"no" (default: "no")
+        PW_LONG_POLL_TIMEOUT - Max seconds a /api/gateways/{id}/next request waits (default: 30)
+        PW_WS_HEARTBEAT      - Idle seconds before websocket frames are resent as keepalive, 0 = off (default: 30)
+        PW_WS_QUEUE_SIZE     - Frames buffered per websocket client, oldest dropped when full (default: 8)
+        PW_WS_SEND_TIMEOUT   - Seconds allowed per websocket send, 0 = no limit (default: 5)
+        PW_WS_EVICT_AFTER    - Consecutive send timeouts before a slow client is dropped (default: 3)
+        PW_WS_MAX_CHANNELS   - Streams one /ws/stream connection may subscribe to (default: 64)
+        PW_SSE_HEARTBEAT     - Idle seconds before an SSE keepalive comment, 0 = off (default: 15)
+        PW_HISTORY_WINDOW    - In-memory history kept per gateway, e.g. "24h", "90m", 0 = off (default: 24h)
+        PW_HISTORY_DB        - SQLite file for persistent history, unset = memory only (default: none)
+        PW_HISTORY_RETENTION - 15m/1h rollups kept in PW_HISTORY_DB (default: 365d)
+        PW_HISTORY_RAW_RETENTION - Raw samples and 1m rollups kept in PW_HISTORY_DB (default: 7d)
+        PW_HISTORY_FLUSH_INTERVAL - Seconds between batched PW_HISTORY_DB writes (default: 60)
+        PW_ENERGY            - Daily/monthly kWh counters, saved to {PW_CACHE_FILE}.energy.json (default: "yes")
+        PW_ENERGY_MAX_GAP    - Longest poll gap in seconds integrated into the kWh counters (default: 300)
     
     Network Robustness:
         PW_SUPPRESS_NETWORK_ERRORS  - Suppress error logs (default: "no")
@@ -63,6 +85,8 @@ Environment Variables (Proxy Compatible):
         PW_STYLE             - UI style: clear/black/white/grafana/grafana-dark (default: "clear")
         PW_AUTH_MODE         - Auth mode: cookie/token (default: "cookie")
         PW_CACHE_FILE        - Cache file path (default: auto - uses PW_AUTH_PATH/.powerwall or /tmp/.powerwall)
+        PW_WARM_START        - Restore last good data from {PW_CACHE_FILE}.snapshot.json on start (default: "yes")
+        PW_SNAPSHOT_INTERVAL - Seconds between warm-start snapshot writes, 0 = shutdown only (default: 60)
         PW_SITEID            - Tesla site ID for multi-site accounts (default: none)
         PW_CONTROL_SECRET    - Enable control commands (default: none/disabled)
         PW_NEG_SOLAR         - Allow negative solar values "yes"/"no" (default: "no")
@@ -169,8 +193,8 @@ Accessing Configuration:
 import json
 import logging
 import os
-from typing import List, Optional
-from pydantic import Field
+from typing import Any, Dict, List, Optional
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
 logger = logging.getLogger(__name__)
@@ -178,6 +202,18 @@ logger = logging.getLogger(__name__)
 # Server version
 SERVER_VERSION = "0.3.1"
 
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: Any) -> float:
+    """Parse a duration in seconds: a number or a string such as "90", "15m", "24h", "7d"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if text and text[-1] in _DURATION_UNITS:
+        return float(text[:-1]) * _DURATION_UNITS[text[-1]]
+    return float(text)
+
 
 class GatewayConfig(BaseSettings):
     """Configuration for a single Powerwall gateway.
@@ -202,6 +238,9 @@ class GatewayConfig(BaseSettings):
     cloud_mode: bool = False
     fleetapi: bool = False
     type: str = "powerwall"  # "powerwall" | "inverter" (solar-only, no batteries)
+    poll_cadence: Optional[
+        Dict[str, float]
+    ] = None  # Per-field poll intervals in seconds, overrides DEFAULT_POLL_CADENCE
 
     model_config = {"env_prefix": ""}
 
@@ -237,6 +276,72 @@ class Settings(BaseSettings):
         default=15, alias="PW_POOL_MAXSIZE"
     )  # Connection pool size
     https_mode: bool = Field(default=False, alias="PW_HTTPS")
+    poll_concurrency: int = Field(
+        default=3, alias="PW_POLL_CONCURRENCY"
+    )  # Max concurrent fetches per gateway during a poll cycle
+    poll_jitter: float = Field(
+        default=0.1, alias="PW_POLL_JITTER"
+    )  # Random delay added to each scheduled poll, as a fraction of the interval
+    async_transport: bool = Field(
+        default=False, alias="PW_ASYNC_TRANSPORT"
+    )  # Read hot-path local gateway APIs with aiohttp instead of the executor
+    poll_budget: float = Field(
+        default=0, alias="PW_POLL_BUDGET"
+    )  # Seconds per gateway poll for optional fields (0 = auto, 80% of interval)
+    gateway_thread_limit: int = Field(
+        default=0, alias="PW_GATEWAY_THREAD_LIMIT"
+    )  # Max executor threads per gateway, including hung ones (0 = PW_POLL_CONCURRENCY + 1)
+    local_pool_size: int = Field(
+        default=0, alias="PW_LOCAL_POOL_SIZE"
+    )  # Threads for local gateway reads (0 = auto from gateway count)
+    cloud_pool_size: int = Field(
+        default=0, alias="PW_CLOUD_POOL_SIZE"
+    )  # Threads for Cloud/FleetAPI gateway reads (0 = auto)
+    control_pool_size: int = Field(
+        default=0, alias="PW_CONTROL_POOL_SIZE"
+    )  # Threads for cloud control writes (0 = auto, 2)
+    long_poll_timeout: float = Field(
+        default=30, alias="PW_LONG_POLL_TIMEOUT"
+    )  # Max seconds /api/gateways/{id}/next waits for a new snapshot
+    ws_heartbeat: float = Field(
+        default=30, alias="PW_WS_HEARTBEAT"
+    )  # Resend websocket frames after this many idle seconds (0 = off)
+    ws_queue_size: int = Field(
+        default=8, alias="PW_WS_QUEUE_SIZE"
+    )  # Outbound frames buffered per websocket client; oldest dropped when full
+    ws_send_timeout: float = Field(
+        default=5, alias="PW_WS_SEND_TIMEOUT"
+    )  # Seconds allowed for one websocket send (0 = no limit)
+    ws_evict_after: int = Field(
+        default=3, alias="PW_WS_EVICT_AFTER"
+    )  # Consecutive send timeouts before a websocket client is disconnected
+    ws_max_channels: int = Field(
+        default=64, alias="PW_WS_MAX_CHANNELS"
+    )  # Max subscribed streams (stream + field mask) per /ws/stream connection
+    sse_heartbeat: float = Field(
+        default=15, alias="PW_SSE_HEARTBEAT"
+    )  # Idle seconds before an SSE keepalive comment is sent (0 = off)
+    history_window: float = Field(
+        default=86400, alias="PW_HISTORY_WINDOW"
+    )  # Seconds of poll samples kept in memory per gateway; accepts "24h", "90m" (0 = off)
+    history_db: Optional[str] = Field(
+        default=None, alias="PW_HISTORY_DB"
+    )  # SQLite file for persistent history (unset = memory only)
+    history_retention: float = Field(
+        default=365 * 86400, alias="PW_HISTORY_RETENTION"
+    )  # How long 15m/1h rollups are kept in PW_HISTORY_DB; accepts "365d"
+    history_raw_retention: float = Field(
+        default=7 * 86400, alias="PW_HISTORY_RAW_RETENTION"
+    )  # How long raw samples and 1m rollups are kept in PW_HISTORY_DB; accepts "7d"
+    history_flush_interval: float = Field(
+        default=60, alias="PW_HISTORY_FLUSH_INTERVAL"
+    )  # Seconds between batched writes to PW_HISTORY_DB
+    energy: bool = Field(
+        default=True, alias="PW_ENERGY"
+    )  # Integrate polled power into kWh counters, saved to {PW_CACHE_FILE}.energy.json
+    energy_max_gap: float = Field(
+        default=300, alias="PW_ENERGY_MAX_GAP"
+    )  # Longest gap between polls (seconds) that is integrated; longer gaps add no energy
 
     # Network robustness settings
     suppress_network_errors: bool = Field(
@@ -255,6 +360,12 @@ class Settings(BaseSettings):
     pw_authpath: Optional[str] = Field(default=None, alias="PW_AUTH_PATH")
     auth_mode: str = Field(default="cookie", alias="PW_AUTH_MODE")
     cache_file: Optional[str] = Field(default=None, alias="PW_CACHE_FILE")
+    warm_start: bool = Field(
+        default=True, alias="PW_WARM_START"
+    )  # Persist last good data next to PW_CACHE_FILE and serve it after restart
+    snapshot_interval: int = Field(
+        default=60, alias="PW_SNAPSHOT_INTERVAL"
+    )  # Seconds between warm-start snapshot writes (0 = only at shutdown)
     siteid: Optional[str] = Field(default=None, alias="PW_SITEID")
     control_secret: Optional[str] = Field(default=None, alias="PW_CONTROL_SECRET")
     proxy_base_url: str = Field(default="/", alias="PROXY_BASE_URL")
@@ -288,6 +399,18 @@ class Settings(BaseSettings):
     mqtt_client_id: str = Field(default="pypowerwall-server", alias="MQTT_CLIENT_ID")
     mqtt_keepalive: int = Field(default=60, alias="MQTT_KEEPALIVE")
 
+    @field_validator(
+        "history_window", "history_retention", "history_raw_retention", mode="before"
+    )
+    @classmethod
+    def _parse_durations(cls, value: Any) -> float:
+        return parse_duration(value)
+
+    @property
+    def thread_limit(self) -> int:
+        """Executor threads one gateway may hold (PW_GATEWAY_THREAD_LIMIT, 0 = its pool share)."""
+        return max(1, self.gateway_thread_limit or self.poll_concurrency + 1)
+
     @property
     def mqtt_enabled(self) -> bool:
         """MQTT publishing is enabled when MQTT_HOST is set."""
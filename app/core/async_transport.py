@@ -0,0 +1,157 @@
+"""
+Async Gateway Transport — native asyncio reads for hot-path local gateway APIs.
+
+Enabled by setting PW_ASYNC_TRANSPORT=yes. When disabled (the default) this
+module is never used and every read goes through pypowerwall in the executor.
+
+Why
+---
+pypowerwall is a blocking (requests-based) library, so every call has to hop
+onto the ThreadPoolExecutor. The handful of endpoints read on every poll cycle
+(aggregates, SOE, grid status, operation) are plain authenticated GETs, so they
+can be served directly from the event loop with a pooled aiohttp session - no
+thread hop and no per-thread stack for the reads that happen most often.
+
+Scope
+-----
+Only gateways where pypowerwall runs in "local" mode with a PyPowerwallLocal
+client (password login, cookie or token auth) are eligible: those expose the
+gateway's /api/* REST endpoints directly. TEDAPI, cloud and FleetAPI
+connections synthesize their responses inside pypowerwall and always use the
+executor path.
+
+Authentication is never performed here. The transport reads the current
+cookies/token from the pypowerwall client on every request, so when pypowerwall
+re-authenticates on the executor path the transport picks up the new session
+automatically. A 401/403 raises AsyncTransportError and the caller falls back
+to the executor, which handles the re-login.
+
+Request coalescing
+------------------
+Concurrent requests for the same path share a single in-flight HTTP request
+(e.g. mode and reserve both derive from /api/operation).
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Endpoints served by the async transport; everything else uses the executor
+ASYNC_PATHS = frozenset(
+    {
+        "/api/meters/aggregates",
+        "/api/system_status/soe",
+        "/api/system_status/grid_status",
+        "/api/operation",
+    }
+)
+
+
+class AsyncTransportError(Exception):
+    """Raised when an async read fails and the executor path should be used."""
+
+
+class AsyncGatewayTransport:
+    """Pooled aiohttp client for hot-path reads from one local gateway."""
+
+    def __init__(self, client: Any, timeout: float, max_connections: int):
+        self._client = client  # pypowerwall PyPowerwallLocal (owns auth state)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._max_connections = max(1, max_connections)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_powerwall(
+        cls, pw: Any, timeout: float, max_connections: int
+    ) -> Optional["AsyncGatewayTransport"]:
+        """Build a transport for a pypowerwall connection, or None if ineligible."""
+        try:
+            from pypowerwall.local.pypowerwall_local import PyPowerwallLocal
+        except ImportError:
+            return None
+
+        client = getattr(pw, "client", None)
+        if getattr(pw, "mode", None) != "local" or not isinstance(
+            client, PyPowerwallLocal
+        ):
+            return None
+        return cls(client, timeout, max_connections)
+
+    async def get(self, path: str) -> Any:
+        """GET a gateway API path and return the decoded JSON payload.
+
+        Raises:
+            AsyncTransportError: On any HTTP, auth or decoding failure.
+        """
+        if path not in ASYNC_PATHS:
+            raise AsyncTransportError(f"{path} is not served by the async transport")
+
+        pending = self._inflight.get(path)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[path] = future
+        try:
+            result = await self._request(path)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Coalesced waiters must not see the leader's cancellation as their own
+            future.set_exception(AsyncTransportError(f"request to {path} cancelled"))
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an error with no coalesced waiters isn't logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(path, None)
+
+    async def _request(self, path: str) -> Any:
+        auth = getattr(self._client, "auth", None) or {}
+        if not auth:
+            raise AsyncTransportError("gateway session not established")
+
+        kwargs: Dict[str, Any] = {}
+        if getattr(self._client, "authmode", "cookie") == "token":
+            kwargs["headers"] = auth
+        else:
+            kwargs["cookies"] = auth
+
+        url = f"https://{self._client.host}{path}"
+        try:
+            async with self._get_session().get(url, **kwargs) as response:
+                if response.status != 200:
+                    raise AsyncTransportError(f"HTTP {response.status} from {path}")
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise AsyncTransportError(f"request to {path} failed: {e}") from e
+
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise AsyncTransportError(f"non-JSON response from {path}") from e
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # Gateways use a self-signed certificate, same as pypowerwall (verify=False)
+            connector = aiohttp.TCPConnector(
+                ssl=False, limit=self._max_connections, keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
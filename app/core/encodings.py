@@ -0,0 +1,77 @@
+"""
+Wire encodings for push frames.
+
+WebSocket clients receive JSON text frames by default. High-frequency
+consumers can negotiate a compact binary encoding instead:
+
+    json     - UTF-8 JSON text frames (default, always available)
+    msgpack  - MessagePack binary frames (requires the msgpack package)
+    cbor     - CBOR binary frames, RFC 8949 (requires the cbor2 package)
+
+The binary encoders are optional dependencies: an encoding whose package is
+not installed is simply not offered (see available()).
+
+Frames are encoded once per update and encoding by the broadcast hub and
+shared by every subscriber of that encoding, so a message is never encoded
+per client.
+"""
+from datetime import timezone
+from typing import Any, Dict, List, Union
+
+from app.core.response_cache import encode_json
+
+try:
+    import msgpack
+except ImportError:  # Optional: pip install msgpack
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # Optional: pip install cbor2
+    cbor2 = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+CBOR = "cbor"
+
+# Package providing each binary encoding (for error messages)
+_PACKAGES: Dict[str, str] = {MSGPACK: "msgpack", CBOR: "cbor2"}
+
+
+def available() -> List[str]:
+    """Encodings usable in this installation."""
+    encodings = [JSON]
+    if msgpack is not None:
+        encodings.append(MSGPACK)
+    if cbor2 is not None:
+        encodings.append(CBOR)
+    return encodings
+
+
+def unavailable_reason(encoding: str) -> str:
+    """Human-readable reason an encoding cannot be used."""
+    package = _PACKAGES.get(encoding)
+    if package is None:
+        return f"Unknown encoding '{encoding}' (expected one of: json, msgpack, cbor)"
+    return f"Encoding '{encoding}' is not available (pip install {package})"
+
+
+def _cbor_default(encoder: Any, value: Any) -> None:
+    """Encode values cbor2 has no type for as strings, like msgpack's default=str."""
+    encoder.encode(str(value))
+
+
+def encode(message: Any, encoding: str = JSON) -> Union[str, bytes]:
+    """Encode a message: str for JSON text frames, bytes for binary frames.
+
+    Both binary encoders fall back to str() for values they have no type
+    for, so a payload that encodes with one encodes with the other.
+    """
+    if encoding == JSON:
+        return encode_json(message).decode("utf-8")
+    if encoding == MSGPACK and msgpack is not None:
+        return msgpack.packb(message, use_bin_type=True, default=str)
+    if encoding == CBOR and cbor2 is not None:
+        # Naive datetimes are taken as UTC instead of being rejected
+        return cbor2.dumps(message, default=_cbor_default, timezone=timezone.utc)
+    raise ValueError(unavailable_reason(encoding))
@@ -0,0 +1,285 @@
+"""
+Energy counters (kWh) integrated from polled power.
+
+Dashboards usually derive energy by integrating /aggregates instant_power in
+their TSDB, which is costly and inaccurate at coarse scrape intervals. Instead
+_poll_gateway feeds every successful poll to the energy meter, which
+integrates power at full poll resolution (trapezoidal rule between
+consecutive polls) into six counters per gateway:
+
+    solar_produced       - solar power > 0
+    home_consumed        - load power > 0
+    grid_imported        - site power > 0
+    grid_exported        - site power < 0
+    battery_discharged   - battery power > 0
+    battery_charged      - battery power < 0
+
+Each counter is kept for three periods: "day" and "month" reset at local
+midnight / the first of the month in the gateway's timezone, "total" never
+resets. An interval that crosses midnight counts towards the new day, and
+counters read after midnight with no poll since then already show the new
+day. Gaps between polls longer than PW_ENERGY_MAX_GAP (e.g. while a gateway
+is offline) add no energy rather than guessing what happened in between.
+
+The aggregate counters are the sums over all gateways, each gateway's day and
+month following its own timezone.
+
+Persistence
+-----------
+Counters are saved with the warm-start snapshot cadence (PW_SNAPSHOT_INTERVAL
+and at shutdown) to ``{PW_CACHE_FILE}.energy.json`` and loaded back in
+initialize(). Integration restarts with the first poll after a restart; day
+and month counters loaded from an earlier day or month are reset by it.
+
+File format
+-----------
+    {
+        "version": 1,
+        "saved_at": 1712345678.9,
+        "gateways": {
+            "<gateway_id>": {"timezone": "...", "date": "2024-04-05",
+                             "updated": 1712345678.1,
+                             "day": {...}, "month": {...}, "total": {...}}
+        }
+    }
+"""
+import json
+import logging
+import math
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.history import sample_values
+from app.core.warm_start import write_json_atomic
+from app.models.gateway import PowerwallData
+
+logger = logging.getLogger(__name__)
+
+ENERGY_VERSION = 1
+
+COUNTERS: Tuple[str, ...] = (
+    "solar_produced",
+    "home_consumed",
+    "grid_imported",
+    "grid_exported",
+    "battery_charged",
+    "battery_discharged",
+)
+PERIODS: Tuple[str, ...] = ("day", "month", "total")
+
+# Watt-seconds per kWh
+_WS_PER_KWH = 3600.0 * 1000.0
+
+
+def energy_path(cache_file: Optional[str]) -> Optional[str]:
+    """Energy counter file location for a PW_CACHE_FILE path."""
+    if not cache_file:
+        return None
+    return f"{cache_file}.energy.json"
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> Union[ZoneInfo, dt_timezone]:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone '{name}', energy counters reset at UTC midnight")
+        return dt_timezone.utc
+
+
+def local_date(timestamp: float, timezone: str) -> str:
+    """ISO date (YYYY-MM-DD) of a Unix timestamp in a timezone."""
+    return datetime.fromtimestamp(timestamp, _zone(timezone)).date().isoformat()
+
+
+def power_flows(data: PowerwallData) -> Tuple[float, ...]:
+    """Non-negative power (W) of each of COUNTERS for a poll, NaN when missing."""
+    site, battery, load, solar = sample_values(data)[:4]
+    return (
+        max(solar, 0.0),
+        max(load, 0.0),
+        max(site, 0.0),
+        max(-site, 0.0),
+        max(-battery, 0.0),
+        max(battery, 0.0),
+    )
+
+
+class GatewayEnergy:
+    """Energy counters of one gateway, in kWh."""
+
+    __slots__ = ("timezone", "date", "updated", "counters", "_last")
+
+    def __init__(self, timezone: str):
+        self.timezone = timezone
+        self.date: Optional[str] = None
+        self.updated: Optional[float] = None
+        self.counters: Dict[str, List[float]] = {period: [0.0] * len(COUNTERS) for period in PERIODS}
+        self._last: Optional[Tuple[float, ...]] = None  # Power flows of the previous poll
+
+    def _roll(self, date: str) -> None:
+        """Reset the day/month counters when the local date moves on."""
+        if self.date is not None and date != self.date:
+            self.counters["day"] = [0.0] * len(COUNTERS)
+            if date[:7] != self.date[:7]:
+                self.counters["month"] = [0.0] * len(COUNTERS)
+        self.date = date
+
+    def roll(self, now: float) -> None:
+        """Start a new day/month at ``now`` even if no poll arrived since midnight."""
+        if self.date is not None and (self.updated is None or now > self.updated):
+            self._roll(local_date(now, self.timezone))
+
+    def add(self, timestamp: float, flows: Tuple[float, ...], max_gap: float) -> bool:
+        """Integrate the interval since the previous poll. Returns False if skipped."""
+        if self.updated is not None and timestamp <= self.updated:
+            return False
+        self._roll(local_date(timestamp, self.timezone))
+
+        previous, elapsed = self._last, None
+        if previous is not None and self.updated is not None:
+            elapsed = timestamp - self.updated
+        self.updated = timestamp
+        self._last = flows
+        if elapsed is None or elapsed > max_gap:
+            return False
+
+        for index, (before, after) in enumerate(zip(previous, flows)):
+            if math.isnan(before) or math.isnan(after):
+                continue
+            kwh = (before + after) / 2.0 * elapsed / _WS_PER_KWH
+            for values in self.counters.values():
+                values[index] += kwh
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "timezone": self.timezone,
+            "date": self.date,
+            "updated": self.updated,
+        }
+        for period, values in self.counters.items():
+            result[period] = {name: round(value, 6) for name, value in zip(COUNTERS, values)}
+        return result
+
+    def restore(self, entry: Dict[str, Any]) -> None:
+        """Load counters saved by to_dict() (the next poll resets stale periods)."""
+        self.date = entry.get("date")
+        self.updated = entry.get("updated")
+        for period in PERIODS:
+            saved = entry.get(period) or {}
+            self.counters[period] = [float(saved.get(name) or 0.0) for name in COUNTERS]
+
+
+class EnergyMeter:
+    """Energy counters of all gateways."""
+
+    def __init__(self):
+        self._gateways: Dict[str, GatewayEnergy] = {}
+
+    def record(self, gateway_id: str, data: PowerwallData, timezone: str) -> bool:
+        """Integrate a successful poll into the gateway's counters."""
+        from app.config import settings  # late import
+
+        if not settings.energy or not data.timestamp:
+            return False
+        energy = self._gateways.get(gateway_id)
+        if energy is None or energy.timezone != timezone:
+            previous = energy
+            energy = self._gateways[gateway_id] = GatewayEnergy(timezone)
+            if previous is not None:
+                energy.restore(previous.to_dict())
+        return energy.add(data.timestamp, power_flows(data), settings.energy_max_gap)
+
+    def get(self, gateway_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Counters of a gateway as of ``now``, or None if nothing was recorded for it."""
+        energy = self._gateways.get(gateway_id)
+        if energy is None:
+            return None
+        energy.roll(time.time() if now is None else now)
+        return energy.to_dict()
+
+    def aggregate(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Counters summed over all gateways as of ``now``."""
+        now = time.time() if now is None else now
+        for energy in self._gateways.values():
+            energy.roll(now)
+        updated = [energy.updated for energy in self._gateways.values() if energy.updated]
+        result: Dict[str, Any] = {
+            "gateways": sorted(self._gateways),
+            "updated": max(updated) if updated else None,
+        }
+        for period in PERIODS:
+            totals = [0.0] * len(COUNTERS)
+            for energy in self._gateways.values():
+                for index, value in enumerate(energy.counters[period]):
+                    totals[index] += value
+            result[period] = {name: round(value, 6) for name, value in zip(COUNTERS, totals)}
+        return result
+
+    def gateway_ids(self) -> List[str]:
+        return list(self._gateways)
+
+    def dump(self) -> Dict[str, Any]:
+        """All counters in the file format (safe to hand to another thread)."""
+        return {
+            "version": ENERGY_VERSION,
+            "saved_at": datetime.now().timestamp(),
+            "gateways": {
+                gateway_id: energy.to_dict() for gateway_id, energy in self._gateways.items()
+            },
+        }
+
+    def save(self, path: str, payload: Optional[Dict[str, Any]] = None) -> int:
+        """Atomically write counters (default: dump()) to ``path``. Returns the gateway count."""
+        if payload is None:
+            payload = self.dump()
+        write_json_atomic(path, payload)
+        return len(payload["gateways"])
+
+    def load(self, path: str, timezones: Dict[str, str]) -> int:
+        """Restore counters saved by save() for the configured gateways.
+
+        Args:
+            path: Energy counter file
+            timezones: Timezone per configured gateway ID
+
+        Returns:
+            Number of gateways restored (missing or unreadable files restore none)
+        """
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable energy counters {path}: {e}")
+            return 0
+
+        if not isinstance(payload, dict) or payload.get("version") != ENERGY_VERSION:
+            logger.warning(f"Ignoring energy counters {path}: unsupported format")
+            return 0
+
+        restored = 0
+        for gateway_id, entry in (payload.get("gateways") or {}).items():
+            if gateway_id not in timezones:
+                continue
+            try:
+                energy = GatewayEnergy(timezones[gateway_id])
+                energy.restore(entry)
+            except Exception as e:
+                logger.debug(f"Skipping energy counters for {gateway_id}: {e}")
+                continue
+            self._gateways[gateway_id] = energy
+            restored += 1
+        return restored
+
+    def clear(self) -> None:
+        self._gateways.clear()
+
+
+# Global energy meter instance
+energy_meter = EnergyMeter()
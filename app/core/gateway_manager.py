@@ -6,8 +6,9 @@ performs background polling, caches data, and provides fast API responses.
 
 Architecture:
     - Singleton pattern (single gateway_manager instance)
-    - Background polling task runs every PW_CACHE_EXPIRE seconds (default: 5s)
-    - Concurrent polling of all gateways using asyncio.gather
+    - Background scheduler polls each gateway every PW_CACHE_EXPIRE seconds
+      (default: 5s) from a due-time heap, phase-offset and jittered per gateway
+    - Each gateway poll runs as its own task; a slow gateway never delays others
     - Cached data for instant API responses without blocking
     - Automatic reconnection on failure
 
@@ -34,8 +35,12 @@ Connection Modes:
         )
 
 Data Flow:
-    1. Background task calls _poll_gateway() for each gateway every N seconds
-    2. _poll_gateway() makes blocking pypowerwall calls in executor with timeouts
+    1. Background scheduler starts _poll_gateway() for each gateway when it is due
+    2. _poll_gateway() fetches the required aggregates, then fetches the optional
+       POLL_FIELDS that are due per DEFAULT_POLL_CADENCE concurrently in the
+       executor (capped per gateway by PW_POLL_CONCURRENCY) with per-call
+       timeouts; fields not due carry their previous value forward. Fields
+       derived from the same gateway API path share one read per cycle
     3. Results cached in self.cache[gateway_id] as GatewayStatus objects
     4. API endpoints read from cache (instant response, no blocking)
     5. Failed polls update gateway status to offline (automatic retry next cycle)
@@ -60,19 +65,261 @@ Performance:
     - Minimal memory footprint (only latest data cached)
 """
 import asyncio
+import heapq
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
 import pypowerwall
 from app.models.gateway import Gateway, GatewayStatus, PowerwallData, AggregateData
 from app.config import GatewayConfig
+from app.core.async_transport import AsyncGatewayTransport, AsyncTransportError
+from app.core.energy import energy_meter, energy_path
+from app.core.history import history_store
+from app.core.history_db import history_archive
+from app.core.views import materialized_views
+from app.core.warm_start import load_snapshot, save_snapshot, snapshot_path
 
 logger = logging.getLogger(__name__)
 
 
+def _is_cloud_config(config: GatewayConfig) -> bool:
+    """True when a gateway is read through the Tesla cloud (Cloud/FleetAPI)."""
+    return bool(config.cloud_mode or config.fleetapi or (config.email and not config.host))
+
+
+def _pool_sizes(gateway_configs: List[GatewayConfig]) -> Tuple[int, int]:
+    """Worker counts of the local and cloud read pools.
+
+    Each pool reserves every gateway's full thread limit (PW_GATEWAY_THREAD_LIMIT,
+    by default PW_POLL_CONCURRENCY + 1): max(floor, gateways * limit). A gateway
+    hung at its limit then cannot take threads another gateway is entitled to.
+    PW_LOCAL_POOL_SIZE / PW_CLOUD_POOL_SIZE override; smaller overrides are
+    honoured with a warning.
+    """
+    from app.config import settings
+
+    limit = settings.thread_limit
+    num_cloud = sum(1 for config in gateway_configs if _is_cloud_config(config))
+    sizes = []
+    for name, override, floor, count in (
+        ("PW_LOCAL_POOL_SIZE", settings.local_pool_size, 10, len(gateway_configs) - num_cloud),
+        ("PW_CLOUD_POOL_SIZE", settings.cloud_pool_size, 4, num_cloud),
+    ):
+        reserved = count * limit
+        if override and override < reserved:
+            logger.warning(
+                f"{name}={override} is below {count} gateway(s) x {limit} threads; "
+                f"a hung gateway can delay the others"
+            )
+        sizes.append(override or max(floor, reserved))
+    return sizes[0], sizes[1]
+
+
+class GatewayBusyError(Exception):
+    """Raised when a gateway already has PW_GATEWAY_THREAD_LIMIT executor threads.
+
+    New blocking work for that gateway is refused rather than queued so a hung
+    gateway cannot fill the shared thread pool and starve the others.
+    """
+
+
+def _parse_json(result: Any) -> Any:
+    """Decode a JSON string response; pass already-decoded values through."""
+    if isinstance(result, str):
+        return json.loads(result)
+    return result
+
+
+def _parse_json_as(expected: type) -> Callable[[Any], Any]:
+    """Build a parser that decodes JSON and drops results of the wrong type."""
+
+    def parse(result: Any) -> Any:
+        if not result:
+            return None
+        try:
+            result = _parse_json(result)
+        except json.JSONDecodeError:
+            return None
+        return result if isinstance(result, expected) else None
+
+    return parse
+
+
+class PollField(NamedTuple):
+    """One optional PowerwallData field fetched during a poll cycle.
+
+    Attributes:
+        name: PowerwallData attribute the result is stored in
+        fetch: Blocking call that takes the pypowerwall object (runs in executor)
+        timeout: Per-call timeout in seconds
+        parse: Optional post-processing applied to the raw result
+        supported: Optional predicate; the field is skipped when it returns False
+        path: Gateway API path the field derives from. It is read by the async
+            transport (PW_ASYNC_TRANSPORT), and read once per cycle in the
+            executor when several due fields share it
+        from_payload: Converts the raw ``path`` payload into what ``fetch``
+            would have returned
+    """
+
+    name: str
+    fetch: Callable[[Any], Any]
+    timeout: float
+    parse: Optional[Callable[[Any], Any]] = None
+    supported: Optional[Callable[[Any], bool]] = None
+    path: Optional[str] = None
+    from_payload: Optional[Callable[[Any], Any]] = None
+
+
+# Same mapping pypowerwall.Powerwall.grid_status() applies to the raw response
+_GRID_STATUS_MAP = {
+    "SystemGridConnected": "UP",
+    "SystemIslandedActive": "DOWN",
+    "SystemTransitionToGrid": "SYNCING",
+    "SystemTransitionToIsland": "SYNCING",
+    "SystemIslandedReady": "SYNCING",
+    "SystemMicroGridFaulted": "DOWN",
+    "SystemWaitForUser": "DOWN",
+}
+
+
+def _scaled_reserve(payload: Dict[str, Any]) -> Optional[float]:
+    """Tesla App reserve from /api/operation, as get_reserve(scale=True)."""
+    if payload is None or "backup_reserve_percent" not in payload:
+        return None
+    percent = float(payload["backup_reserve_percent"])
+    return max(0, float((percent / 0.95) - (5 / 0.95)))
+
+
+# Optional fields fetched concurrently after the required aggregates call.
+# Every entry is independent of the others, so the order here has no effect
+# on the result - only on the order requests are admitted by the semaphore.
+POLL_FIELDS: Tuple[PollField, ...] = (
+    PollField("vitals", lambda pw: pw.vitals(), 10.0),
+    PollField("strings", lambda pw: pw.strings(), 10.0),
+    PollField(
+        "soe",
+        lambda pw: pw.level(),
+        5.0,
+        path="/api/system_status/soe",
+        from_payload=lambda p: p.get("percentage") if p else None,
+    ),
+    PollField("freq", lambda pw: pw.freq(), 5.0),
+    PollField("status", lambda pw: pw.status(), 5.0),
+    PollField("version", lambda pw: pw.version(), 5.0),
+    PollField("alerts", lambda pw: pw.alerts(), 5.0),
+    PollField("temps", lambda pw: pw.temps(), 5.0),
+    PollField("site_name", lambda pw: pw.site_name(), 5.0),
+    # battery_blocks[].type gives "Powerwall3" / "Powerwall3Follower" etc.,
+    # which is more useful for model detection than system_status Type ("ACPW").
+    PollField(
+        "tedapi_config",
+        lambda pw: pw.tedapi.get_config(),
+        10.0,
+        parse=lambda r: r if r and isinstance(r, dict) else None,
+        supported=lambda pw: bool(
+            hasattr(pw, "tedapi") and pw.tedapi and hasattr(pw.tedapi, "get_config")
+        ),
+    ),
+    PollField(
+        "grid_status",
+        lambda pw: pw.grid_status(),
+        5.0,
+        path="/api/system_status/grid_status",
+        from_payload=lambda p: _GRID_STATUS_MAP.get(p.get("grid_status")) if p else None,
+    ),
+    # Full /api/system_status/grid_status response for the legacy endpoint
+    PollField(
+        "grid_status_detail",
+        lambda pw: pw.poll("/api/system_status/grid_status"),
+        5.0,
+        parse=_parse_json,
+        path="/api/system_status/grid_status",
+        from_payload=lambda p: p,
+    ),
+    # "self_consumption", "backup", or "autonomous" (time-based control)
+    PollField(
+        "mode",
+        lambda pw: pw.get_mode(),
+        5.0,
+        path="/api/operation",
+        from_payload=lambda p: p.get("real_mode") or None if p else None,
+    ),
+    # Tesla App scaled reserve setting (scale=True)
+    PollField(
+        "reserve",
+        lambda pw: pw.get_reserve(scale=True),
+        5.0,
+        path="/api/operation",
+        from_payload=_scaled_reserve,
+    ),
+    PollField("time_remaining", lambda pw: pw.get_time_remaining(), 5.0),
+    PollField("system_status", lambda pw: pw.system_status(), 5.0),
+    PollField(
+        "fan_speeds",
+        lambda pw: pw.get_fan_speeds(),
+        5.0,
+        supported=lambda pw: hasattr(pw, "get_fan_speeds"),
+    ),
+    PollField(
+        "networks",
+        lambda pw: pw.poll("/api/networks"),
+        5.0,
+        parse=_parse_json_as(list),
+    ),
+    PollField(
+        "powerwalls",
+        lambda pw: pw.poll("/api/powerwalls"),
+        5.0,
+        parse=_parse_json_as(dict),
+    ),
+    PollField("din", lambda pw: pw.din(), 5.0),
+)
+
+# Minimum seconds between fetches of each POLL_FIELDS entry (0 = every cycle).
+# Aggregates is always fetched every cycle and is not listed here. Fields that
+# are not due carry their previous value forward, so slow-changing data such as
+# firmware version or site configuration costs one gateway round-trip per
+# hour/day instead of one per cycle. Override per gateway with the
+# ``poll_cadence`` mapping in the gateway configuration.
+DEFAULT_POLL_CADENCE: Dict[str, float] = {
+    # Live power flow and battery state - every cycle
+    "soe": 0,
+    "freq": 0,
+    "strings": 0,
+    "grid_status": 0,
+    "grid_status_detail": 0,
+    "mode": 0,  # Must track Tesla app changes promptly (issue #14)
+    "reserve": 0,
+    "time_remaining": 0,
+    # Device telemetry
+    "vitals": 30,
+    "alerts": 30,
+    "system_status": 30,
+    "status": 60,
+    "temps": 60,
+    "fan_speeds": 60,
+    # Site configuration
+    "site_name": 3600,
+    "tedapi_config": 3600,
+    "networks": 3600,
+    "powerwalls": 3600,
+    # Identity
+    "version": 86400,
+    "din": 86400,
+}
+
+# Share of the poll budget the optional fields always get once aggregates has
+# returned. Aggregates has its own 10s timeout, so a slow aggregates read can
+# use up the whole budget; without this floor every optional field would then
+# be cancelled at once and stay "carried" for as long as aggregates stays slow.
+FIELD_BUDGET_FLOOR = 0.25
+
+
 class GatewayManager:
     """Manages multiple Powerwall gateway connections."""
 
@@ -81,6 +328,7 @@ class GatewayManager:
         self.connections: Dict[str, pypowerwall.Powerwall] = {}
         self.cache: Dict[str, GatewayStatus] = {}
         self._poll_task: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None  # Warm-start snapshot writer
         self._poll_interval = 5  # Default, will be set from config during initialize()
 
         # Exponential backoff tracking per gateway
@@ -91,13 +339,54 @@ class GatewayManager:
         self._last_successful_data: Dict[
             str, PowerwallData
         ] = {}  # Keep last good data for graceful degradation
+        self._warm_start_data: Dict[
+            str, PowerwallData
+        ] = {}  # Data loaded from the warm-start snapshot (until a poll replaces it)
         self._pending_configs: Dict[
             str, GatewayConfig
         ] = {}  # Gateways waiting for lazy initialization
-
-        # Dedicated thread pool for blocking pypowerwall operations
-        # Will be sized during initialize() based on gateway count
+        self._async_transports: Dict[
+            str, AsyncGatewayTransport
+        ] = {}  # Native asyncio readers for eligible local gateways (PW_ASYNC_TRANSPORT)
+        self._poll_semaphores: Dict[
+            str, asyncio.Semaphore
+        ] = {}  # Caps concurrent fetches per gateway during a poll cycle
+        self._poll_cadence: Dict[
+            str, Dict[str, float]
+        ] = {}  # Per-gateway cadence overrides (merged over DEFAULT_POLL_CADENCE)
+        self._field_last_fetch: Dict[
+            str, Dict[str, float]
+        ] = {}  # Monotonic time of the last successful fetch per field
+        self._snapshot_versions: Dict[
+            str, int
+        ] = {}  # Cache generation per gateway, bumped on every cache store
+        self._snapshot_seq = 0
+        # Signaled after each poll stores a snapshot (long-poll readers wait on it).
+        # Created lazily so it binds to the running event loop.
+        self._snapshot_condition: Optional[asyncio.Condition] = None
+
+        # Poll scheduler: min-heap of (due, seq, gateway_id, nominal_due) on the
+        # monotonic clock; seq breaks ties so gateway ids are never compared
+        self._poll_queue: List[Tuple[float, int, str, float]] = []
+        self._poll_seq = 0
+        self._poll_inflight: Dict[str, asyncio.Task] = {}
+        self._scheduler_stats: Dict[str, float] = self._new_scheduler_stats()
+
+        # Dedicated thread pools for blocking pypowerwall operations, one per
+        # kind of work so they cannot starve each other: a Tesla cloud slowdown
+        # or a 10s control call never takes a thread from local polling.
+        #   _executor          - local (TEDAPI / password) gateway reads
+        #   _cloud_executor    - Cloud and FleetAPI gateway reads
+        #   _control_executor  - cloud_control writes (set_reserve, set_mode)
+        # Sized during initialize() based on gateway count
         self._executor: Optional[ThreadPoolExecutor] = None
+        self._cloud_executor: Optional[ThreadPoolExecutor] = None
+        self._control_executor: Optional[ThreadPoolExecutor] = None
+
+        # Per-gateway executor thread accounting (see _run_blocking). Updated
+        # from worker threads, so guarded by a threading lock.
+        self._thread_lock = threading.Lock()
+        self._thread_counts: Dict[str, Dict[str, int]] = {}
 
         # Cloud connection for control operations (set_reserve, set_mode).
         # TEDAPI doesn't support POST/write APIs, so a separate cloud-mode
@@ -106,6 +395,17 @@ class GatewayManager:
         # TEDAPI for fast local reads, cloud for control writes.
         self._cloud_control: Optional[pypowerwall.Powerwall] = None
 
+    @staticmethod
+    def _new_scheduler_stats() -> Dict[str, float]:
+        return {
+            "last_lag": 0.0,
+            "max_lag": 0.0,
+            "polls_started": 0,
+            "skipped_in_flight": 0,
+            "deferred_backoff": 0,
+            "budget_exhausted": 0,
+        }
+
     async def initialize(
         self, gateway_configs: List[GatewayConfig], poll_interval: int = 5
     ):
@@ -119,17 +419,26 @@ class GatewayManager:
             gateway_configs: List of gateway configurations
             poll_interval: Polling frequency in seconds (from PW_CACHE_EXPIRE, default: 5)
         """
+        from app.config import settings
+
         self._poll_interval = poll_interval
 
-        # Size thread pool based on gateway count
-        # Formula: max(10, num_gateways * 3) to support concurrent API calls
+        # Size thread pools based on gateway count per connection mode
         num_gateways = len(gateway_configs)
-        pool_size = max(10, num_gateways * 3)
+        local_size, cloud_size = _pool_sizes(gateway_configs)
+        control_size = settings.control_pool_size or 2
         self._executor = ThreadPoolExecutor(
-            max_workers=pool_size, thread_name_prefix="pypowerwall"
+            max_workers=local_size, thread_name_prefix="pypowerwall"
+        )
+        self._cloud_executor = ThreadPoolExecutor(
+            max_workers=cloud_size, thread_name_prefix="pypowerwall-cloud"
+        )
+        self._control_executor = ThreadPoolExecutor(
+            max_workers=control_size, thread_name_prefix="pypowerwall-control"
         )
         logger.info(
-            f"Thread pool initialized with {pool_size} workers for {num_gateways} gateway(s)"
+            f"Thread pools initialized for {num_gateways} gateway(s): "
+            f"local={local_size}, cloud={cloud_size}, control={control_size} workers"
         )
 
         for config in gateway_configs:
@@ -170,14 +479,30 @@ class GatewayManager:
                 self.gateways[config.id] = gateway
                 self._pending_configs[config.id] = config  # All start as pending
 
-                self.cache[config.id] = GatewayStatus(
-                    gateway=gateway, online=False, error="Initializing..."
+                self._store_status(
+                    config.id,
+                    GatewayStatus(gateway=gateway, online=False, error="Initializing..."),
                 )
 
                 # Initialize backoff tracking
                 self._consecutive_failures[config.id] = 0
                 self._next_poll_time[config.id] = 0  # Poll immediately
 
+                if config.poll_cadence:
+                    unknown = set(config.poll_cadence) - set(DEFAULT_POLL_CADENCE)
+                    if unknown:
+                        logger.warning(
+                            f"Ignoring unknown poll_cadence fields for {config.id}: {sorted(unknown)}"
+                        )
+                    self._poll_cadence[config.id] = {
+                        **DEFAULT_POLL_CADENCE,
+                        **{
+                            name: max(0.0, float(seconds))
+                            for name, seconds in config.poll_cadence.items()
+                            if name in DEFAULT_POLL_CADENCE
+                        },
+                    }
+
                 # Determine and log connection mode
                 if config.fleetapi:
                     mode = "FleetAPI"
@@ -194,7 +519,6 @@ class GatewayManager:
 
         # Initialize cloud control connection for TEDAPI gateways with cloud credentials.
         # This enables hybrid operation: local TEDAPI reads + cloud control writes.
-        from app.config import settings
         for config in gateway_configs:
             if config.host and config.gw_pwd and config.email and not config.cloud_mode:
                 try:
@@ -210,7 +534,7 @@ class GatewayManager:
                     }
                     self._cloud_control = await asyncio.wait_for(
                         loop.run_in_executor(
-                            self._executor,
+                            self._get_control_executor(),
                             lambda kw=cloud_kwargs: pypowerwall.Powerwall(**kw),
                         ),
                         timeout=15.0,
@@ -224,9 +548,22 @@ class GatewayManager:
                         f"Cloud control connection failed (control will be unavailable): {e}"
                     )
 
+        # Serve the last known data immediately while gateways reconnect
+        if settings.warm_start:
+            self._load_warm_start()
+        if settings.energy:
+            self._load_energy()
+
+        # Restore persisted history before new samples arrive
+        if settings.history_db and settings.history_window > 0:
+            await history_archive.open(settings.history_db, list(self.gateways))
+            history_archive.start()
+
         # Start polling task
         if self.gateways:
             self._poll_task = asyncio.create_task(self._poll_gateways())
+            if (settings.warm_start or settings.energy) and settings.snapshot_interval > 0:
+                self._snapshot_task = asyncio.create_task(self._snapshot_loop())
             logger.info(
                 f"Gateway manager ready - {len(self.gateways)} gateway(s) will connect on first poll"
             )
@@ -241,45 +578,247 @@ class GatewayManager:
                 # Expected when cancelling the polling task during shutdown
                 pass
 
-        # Shutdown thread pool executor
-        if self._executor:
-            self._executor.shutdown(wait=False)
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self._snapshot_task = None
+        self._save_warm_start()
+        self._save_energy()
+
+        # Cancel polls still in flight and drop the schedule
+        for task in list(self._poll_inflight.values()):
+            task.cancel()
+        if self._poll_inflight:
+            await asyncio.gather(*self._poll_inflight.values(), return_exceptions=True)
+        self._poll_inflight.clear()
+        self._poll_queue.clear()
+
+        # Write the history recorded since the last flush
+        await history_archive.close()
+
+        for transport in self._async_transports.values():
+            await transport.close()
+        self._async_transports.clear()
+
+        # Shutdown thread pool executors
+        for executor in (self._executor, self._cloud_executor, self._control_executor):
+            if executor:
+                executor.shutdown(wait=False)
         logger.info("Gateway manager shutdown complete")
 
-    async def _poll_gateways(self):
-        """Background task to poll all gateways on a fixed cadence.
+    def _load_warm_start(self) -> None:
+        """Seed the cache from the warm-start snapshot (see app.core.warm_start).
+
+        Snapshot data goes into _last_successful_data, so get_gateway() serves
+        it under the normal graceful-degradation / PW_CACHE_TTL rules until the
+        first poll of each gateway replaces it.
+        """
+        from app.config import settings
+
+        path = snapshot_path(settings.cache_file)
+        if not path:
+            return
+        loaded = 0
+        for gateway_id, data in load_snapshot(path).items():
+            gateway = self.gateways.get(gateway_id)
+            if gateway is None:
+                continue
+            if data.field_freshness:
+                data.field_freshness = {name: "carried" for name in data.field_freshness}
+            self._last_successful_data[gateway_id] = data
+            self._warm_start_data[gateway_id] = data
+            self._store_status(
+                gateway_id,
+                GatewayStatus(
+                    gateway=gateway,
+                    online=False,
+                    error="Initializing...",
+                    last_updated=data.timestamp,
+                ),
+            )
+            loaded += 1
+        if loaded:
+            logger.info(f"Warm start: loaded last known data for {loaded} gateway(s) from {path}")
+
+    def _save_warm_start(self, data: Optional[Dict[str, PowerwallData]] = None) -> None:
+        """Write the last successful data per gateway to the warm-start snapshot."""
+        from app.config import settings
+
+        if data is None:
+            data = dict(self._last_successful_data)
+        path = snapshot_path(settings.cache_file)
+        if not settings.warm_start or not path or not data:
+            return
+        try:
+            count = save_snapshot(path, data)
+            logger.debug(f"Warm-start snapshot saved for {count} gateway(s) to {path}")
+        except Exception as e:
+            logger.warning(f"Unable to save warm-start snapshot to {path}: {e}")
+
+    def _load_energy(self) -> None:
+        """Restore the kWh counters saved by _save_energy() (see app.core.energy)."""
+        from app.config import settings
+
+        path = energy_path(settings.cache_file)
+        if not path:
+            return
+        timezones = {gateway_id: gateway.timezone for gateway_id, gateway in self.gateways.items()}
+        loaded = energy_meter.load(path, timezones)
+        if loaded:
+            logger.info(f"Energy counters restored for {loaded} gateway(s) from {path}")
+
+    def _save_energy(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Write the kWh counters next to PW_CACHE_FILE."""
+        from app.config import settings
+
+        path = energy_path(settings.cache_file)
+        if not settings.energy or not path or not energy_meter.gateway_ids():
+            return
+        try:
+            count = energy_meter.save(path, payload)
+            logger.debug(f"Energy counters saved for {count} gateway(s) to {path}")
+        except Exception as e:
+            logger.warning(f"Unable to save energy counters to {path}: {e}")
+
+    async def _snapshot_loop(self):
+        """Background task that saves the warm-start snapshot and energy counters periodically."""
+        from app.config import settings
 
-        Uses a fixed-tick scheduling pattern to ensure consistent poll-to-poll
-        intervals regardless of how long the actual poll takes. With the previous
-        sleep-after-poll approach the effective interval was poll_duration + sleep,
-        causing drift (e.g. ~8-9s actual interval when PW_CACHE_EXPIRE=5).
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.sleep(settings.snapshot_interval)
+                # File I/O off the event loop; copy the dict here so the worker
+                # never iterates the live one
+                await loop.run_in_executor(
+                    None, self._save_warm_start, dict(self._last_successful_data)
+                )
+                await loop.run_in_executor(None, self._save_energy, energy_meter.dump())
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in warm-start snapshot task: {e}")
 
-        The loop records the monotonic clock time (via ``loop.time()``) at the
-        start of each cycle and only sleeps for the *remaining* time after all
-        gateways have been polled, so the next cycle starts as close to the
-        configured interval as possible.
+    async def _poll_gateways(self):
+        """Background task that polls each gateway when it comes due.
+
+        Gateways are kept in a min-heap keyed on their next due time (monotonic
+        clock, ``loop.time()``). Each gateway runs on its own fixed cadence of
+        PW_CACHE_EXPIRE seconds: the first polls are phase-offset evenly across
+        one interval and every due time gets up to PW_POLL_JITTER x interval of
+        random jitter, so hundreds of gateways never fire in the same
+        millisecond. Due times advance from the nominal schedule rather than
+        from when a poll finished, so the cadence does not drift.
+
+        Polls are started as independent tasks and never awaited here, so one
+        slow gateway cannot delay any other. A gateway whose previous poll is
+        still running is skipped for that slot, and a gateway in exponential
+        backoff is re-queued for the end of its backoff period instead of
+        being woken every interval.
         """
+        loop = asyncio.get_running_loop()
+        interval = self._poll_interval
+        gateway_ids = list(self.gateways.keys())
+        self._poll_queue.clear()
+        start = loop.time()
+        for index, gateway_id in enumerate(gateway_ids):
+            nominal = start + interval * index / len(gateway_ids)
+            self._schedule_poll(gateway_id, nominal)
+
         while True:
             try:
-                loop = asyncio.get_running_loop()
-                loop_start = loop.time()
-
-                # Poll all gateways concurrently
-                tasks = [
-                    self._poll_gateway(gateway_id)
-                    for gateway_id in self.gateways.keys()
-                ]
-                await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Sleep only the remaining time to maintain fixed interval
-                elapsed = loop.time() - loop_start
-                sleep_time = max(0, self._poll_interval - elapsed)
-                await asyncio.sleep(sleep_time)
+                if not self._poll_queue:
+                    await asyncio.sleep(interval)
+                    continue
+
+                due, _, gateway_id, nominal = self._poll_queue[0]
+                now = loop.time()
+                if due > now:
+                    await asyncio.sleep(due - now)
+                    continue
+                heapq.heappop(self._poll_queue)
+
+                lag = now - due
+                stats = self._scheduler_stats
+                stats["last_lag"] = lag
+                stats["max_lag"] = max(stats["max_lag"], lag)
+
+                # Next slot on the nominal schedule; if the loop fell more than
+                # a full interval behind, re-anchor instead of firing a burst.
+                next_nominal = nominal + interval
+                if next_nominal <= now:
+                    next_nominal = now + interval
+
+                if gateway_id not in self.gateways:
+                    continue
+
+                backoff = self._next_poll_time.get(gateway_id, 0) - datetime.now().timestamp()
+                if backoff > 0:
+                    stats["deferred_backoff"] += 1
+                    self._schedule_poll(gateway_id, now + backoff)
+                    continue
+
+                if gateway_id in self._poll_inflight:
+                    stats["skipped_in_flight"] += 1
+                else:
+                    stats["polls_started"] += 1
+                    task = asyncio.create_task(
+                        self._poll_gateway(gateway_id), name=f"poll-{gateway_id}"
+                    )
+                    self._poll_inflight[gateway_id] = task
+                    task.add_done_callback(
+                        lambda _t, gid=gateway_id: self._poll_inflight.pop(gid, None)
+                    )
+                self._schedule_poll(gateway_id, next_nominal)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in polling task: {e}")
-                await asyncio.sleep(self._poll_interval)
+                await asyncio.sleep(interval)
+
+    def _schedule_poll(self, gateway_id: str, nominal: float) -> None:
+        """Queue the next poll of a gateway at its nominal time plus jitter."""
+        from app.config import settings
+
+        jitter = random.uniform(0, max(0.0, settings.poll_jitter) * self._poll_interval)
+        self._poll_seq += 1
+        heapq.heappush(
+            self._poll_queue, (nominal + jitter, self._poll_seq, gateway_id, nominal)
+        )
+
+    def get_scheduler_status(self) -> Dict[str, Any]:
+        """Get poll scheduler queue depth, lag and per-gateway due times.
+
+        Lag is how late (in seconds) the scheduler dispatched a gateway relative
+        to its due time; sustained lag means the event loop is overloaded.
+        """
+        try:
+            now = asyncio.get_running_loop().time()
+        except RuntimeError:
+            now = None
+
+        next_due = {}
+        for due, _, gateway_id, _ in self._poll_queue:
+            if now is not None:
+                next_due[gateway_id] = round(max(0.0, due - now), 3)
+
+        stats = self._scheduler_stats
+        return {
+            "running": bool(self._poll_task and not self._poll_task.done()),
+            "poll_interval": self._poll_interval,
+            "queue_depth": len(self._poll_queue),
+            "in_flight": len(self._poll_inflight),
+            "last_lag": round(stats["last_lag"], 4),
+            "max_lag": round(stats["max_lag"], 4),
+            "polls_started": stats["polls_started"],
+            "skipped_in_flight": stats["skipped_in_flight"],
+            "deferred_backoff": stats["deferred_backoff"],
+            "budget_exhausted": stats["budget_exhausted"],
+            "next_due": next_due,
+        }
 
     async def _poll_gateway(self, gateway_id: str) -> None:
         """Poll a single gateway for data with exponential backoff on failures."""
@@ -305,8 +844,6 @@ class GatewayManager:
 
                 from app.config import settings
 
-                loop = asyncio.get_running_loop()
-
                 try:
                     if config.cloud_mode and config.email:
                         cloud_kwargs = {
@@ -317,16 +854,13 @@ class GatewayManager:
                         }
                         if config.authpath:
                             cloud_kwargs["authpath"] = config.authpath
-                        pw = await asyncio.wait_for(
-                            loop.run_in_executor(
-                                self._executor,
-                                lambda kw=cloud_kwargs: pypowerwall.Powerwall(**kw),
-                            ),
+                        pw = await self._run_blocking(
+                            gateway_id,
+                            lambda kw=cloud_kwargs: pypowerwall.Powerwall(**kw),
                             timeout=15.0,
                         )
-                        connected = await asyncio.wait_for(
-                            loop.run_in_executor(self._executor, pw.is_connected),
-                            timeout=10.0,
+                        connected = await self._run_blocking(
+                            gateway_id, pw.is_connected, timeout=10.0
                         )
                         if not connected:
                             raise Exception(
@@ -359,16 +893,13 @@ class GatewayManager:
                             tedapi_kwargs["rsa_key_path"] = config.rsa_key_path
                         if config.wifi_host:
                             tedapi_kwargs["wifi_host"] = config.wifi_host
-                        pw = await asyncio.wait_for(
-                            loop.run_in_executor(
-                                self._executor,
-                                lambda kw=tedapi_kwargs: pypowerwall.Powerwall(**kw),
-                            ),
+                        pw = await self._run_blocking(
+                            gateway_id,
+                            lambda kw=tedapi_kwargs: pypowerwall.Powerwall(**kw),
                             timeout=15.0,
                         )
-                        connected = await asyncio.wait_for(
-                            loop.run_in_executor(self._executor, pw.is_connected),
-                            timeout=10.0,
+                        connected = await self._run_blocking(
+                            gateway_id, pw.is_connected, timeout=10.0
                         )
                         if not connected:
                             raise Exception(
@@ -378,6 +909,18 @@ class GatewayManager:
                     self.connections[gateway_id] = pw
                     del self._pending_configs[gateway_id]
 
+                    if settings.async_transport:
+                        transport = AsyncGatewayTransport.from_powerwall(
+                            pw,
+                            timeout=settings.timeout,
+                            max_connections=settings.poll_concurrency,
+                        )
+                        if transport:
+                            self._async_transports[gateway_id] = transport
+                            logger.info(
+                                f"Async transport enabled for hot-path reads on {gateway_id}"
+                            )
+
                     # Try to get site_id for cloud mode gateways
                     gateway = self.gateways[gateway_id]
                     mode_label = (
@@ -430,15 +973,36 @@ class GatewayManager:
             # Run blocking pypowerwall calls in dedicated executor with timeout protection
             loop = asyncio.get_running_loop()
 
-            # Fetch core data - aggregates is required, vitals/strings are optional
+            # One deadline covers the whole data fetch (PW_POLL_BUDGET) so a
+            # degraded gateway can't sit in a poll for the sum of every per-call
+            # timeout while its cache goes stale. Aggregates keeps its own 10s
+            # timeout since it decides online/offline; the optional fields get
+            # whatever is left, but at least FIELD_BUDGET_FLOOR of the budget.
+            budget = self._poll_budget()
+            deadline = loop.time() + budget
+
+            # Fetch core data - aggregates is required and is fetched first on its
+            # own; it doubles as the liveness check for the gateway.
             # Use asyncio.wait_for to timeout if pypowerwall hangs
             try:
-                aggregates = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        self._executor, pw.poll, "/api/meters/aggregates"
-                    ),
-                    timeout=10.0,  # 10 second timeout
-                )
+                aggregates = None
+                transport = self._async_transports.get(gateway_id)
+                if transport:
+                    try:
+                        aggregates = await asyncio.wait_for(
+                            transport.get("/api/meters/aggregates"), timeout=10.0
+                        )
+                    except (AsyncTransportError, asyncio.TimeoutError) as e:
+                        logger.debug(
+                            f"Async aggregates read failed for {gateway_id}, using executor: {e}"
+                        )
+                if aggregates is None:
+                    aggregates = await self._run_blocking(
+                        gateway_id,
+                        pw.poll,
+                        "/api/meters/aggregates",
+                        timeout=10.0,  # 10 second timeout
+                    )
             except asyncio.TimeoutError:
                 raise Exception(f"Timeout fetching aggregates from {gateway_id}")
             except Exception as e:
@@ -462,80 +1026,83 @@ class GatewayManager:
                         f"Applied neg_solar correction for {gateway_id}: solar clamped to 0"
                     )
 
-            # Build PowerwallData with required aggregates
-            data = PowerwallData(
-                aggregates=aggregates, timestamp=datetime.now().timestamp()
-            )
-
-            # Try to get optional vitals and strings (don't fail if these aren't available)
-            try:
-                data.vitals = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.vitals), timeout=10.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Vitals not available for {gateway_id}: {e}")
-
-            try:
-                data.strings = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.strings), timeout=10.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Strings not available for {gateway_id}: {e}")
-
-            # Try to get additional data
-            try:
-                data.soe = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.level), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"SOE not available for {gateway_id}: {e}")
-
-            try:
-                data.freq = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.freq), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Frequency not available for {gateway_id}: {e}")
-
-            try:
-                data.status = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.status), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Status not available for {gateway_id}: {e}")
-
-            try:
-                data.version = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.version), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Version not available for {gateway_id}: {e}")
-
-            logger.debug(f"Gateway {gateway_id} aggregates: {data.aggregates}")
+            logger.debug(f"Gateway {gateway_id} aggregates: {aggregates}")
+            timestamp = datetime.now().timestamp()
 
-            # Try to get alerts (for caching)
-            try:
-                data.alerts = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.alerts), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Alerts not available for {gateway_id}: {e}")
-
-            # Try to get temps (for caching)
-            try:
-                data.temps = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.temps), timeout=5.0
+            # Fetch the optional fields that are due this cycle (see
+            # DEFAULT_POLL_CADENCE) concurrently. The fields are independent of
+            # each other, so the cycle takes roughly as long as the slowest call
+            # instead of the sum of all of them. The per-gateway semaphore caps how
+            # many requests are in flight against one gateway at a time.
+            last_data = self._last_successful_data.get(gateway_id)
+            due_fields = self._due_poll_fields(gateway_id, last_data)
+            semaphore = self._get_poll_semaphore(gateway_id)
+            # Fields derived from the same API path (grid_status and
+            # grid_status_detail, mode and reserve) share one executor read
+            path_counts: Dict[str, int] = {}
+            for field in due_fields:
+                if field.path:
+                    path_counts[field.path] = path_counts.get(field.path, 0) + 1
+            shared_reads: Dict[str, Optional[asyncio.Future]] = {
+                path: None for path, count in path_counts.items() if count > 1
+            }
+            tasks = {
+                asyncio.ensure_future(
+                    self._fetch_field(gateway_id, pw, field, semaphore, shared_reads)
+                ): field
+                for field in due_fields
+            }
+            stragglers = set()
+            if tasks:
+                _, pending = await asyncio.wait(
+                    tasks,
+                    timeout=max(deadline - loop.time(), budget * FIELD_BUDGET_FLOOR),
                 )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Temps not available for {gateway_id}: {e}")
+                for task in pending:
+                    task.cancel()
+                    stragglers.add(tasks[task].name)
+                for read in shared_reads.values():
+                    if read is not None:
+                        read.cancel()
+                if stragglers:
+                    self._scheduler_stats["budget_exhausted"] += 1
+                    logger.debug(
+                        f"Poll budget of {budget:.1f}s exhausted for {gateway_id}, "
+                        f"carrying over: {sorted(stragglers)}"
+                    )
 
-            # Try to get site name (for caching)
-            try:
-                data.site_name = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.site_name), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Site name not available for {gateway_id}: {e}")
+            # Build the snapshot locally; it only becomes visible to API readers
+            # when it is stored in the cache below, so readers never observe a
+            # partially populated PowerwallData. Every other field - not due
+            # this cycle, cut off by the budget, or failed - is treated the
+            # same way: it keeps its previous value and is tagged "carried" in
+            # field_freshness, or "failed" when there is no previous value.
+            data = PowerwallData(aggregates=aggregates, timestamp=timestamp)
+            freshness = {"aggregates": "fresh"}
+            fetched = {}
+            last_fetch = self._field_last_fetch.setdefault(gateway_id, {})
+            fetched_at = loop.time()
+            for task, field in tasks.items():
+                if field.name in stragglers:
+                    continue
+                ok, value = task.result()
+                if ok:
+                    fetched[field.name] = value
+                    setattr(data, field.name, value)
+                    freshness[field.name] = "fresh"
+                    last_fetch[field.name] = fetched_at
+
+            # A transient failure must not wipe a known value (e.g. operation
+            # mode, issue #14); failed fields are retried on the next cycle
+            for field in POLL_FIELDS:
+                if field.name in fetched:
+                    continue
+                if last_data:
+                    setattr(data, field.name, getattr(last_data, field.name))
+                    freshness[field.name] = "carried"
+                else:
+                    freshness[field.name] = "failed"
+            data.field_freshness = freshness
 
             # Detect PW3 status from pypowerwall TEDAPI connection
             try:
@@ -549,129 +1116,6 @@ class GatewayManager:
             except Exception:
                 pass
 
-            # Cache TEDAPI config for battery block type enrichment (PW3 systems)
-            # battery_blocks[].type gives "Powerwall3" / "Powerwall3Follower" etc.,
-            # which is more useful for model detection than system_status Type ("ACPW").
-            try:
-                if hasattr(pw, "tedapi") and pw.tedapi and hasattr(pw.tedapi, "get_config"):
-                    tedapi_config = await asyncio.wait_for(
-                        loop.run_in_executor(self._executor, pw.tedapi.get_config),
-                        timeout=10.0,
-                    )
-                    if tedapi_config and isinstance(tedapi_config, dict):
-                        data.tedapi_config = tedapi_config
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"TEDAPI config not available for {gateway_id}: {e}")
-
-            # Try to get grid status (for caching)
-            try:
-                data.grid_status = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.grid_status), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Grid status not available for {gateway_id}: {e}")
-
-            # Try to get detailed grid status from API (for /api/system_status/grid_status endpoint)
-            try:
-                grid_status_response = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        self._executor, pw.poll, "/api/system_status/grid_status"
-                    ),
-                    timeout=5.0,
-                )
-                if isinstance(grid_status_response, str):
-                    data.grid_status_detail = json.loads(grid_status_response)
-                else:
-                    data.grid_status_detail = grid_status_response
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Grid status detail not available for {gateway_id}: {e}")
-
-            # Try to get operation mode (for /api/operation endpoint)
-            # Mode can be "self_consumption", "backup", or "autonomous" (time-based control).
-            # This is fetched from /api/operation on the gateway via pw.get_mode() and
-            # must be polled on every cycle so that mode changes made in the Tesla app
-            # are reflected promptly (fixes issue #14).
-            # Pre-fill from last known good value so a transient failure doesn't wipe the cache.
-            last_data = self._last_successful_data.get(gateway_id)
-            if last_data and last_data.mode:
-                data.mode = last_data.mode
-            try:
-                data.mode = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.get_mode),
-                    timeout=5.0,
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Operation mode not available for {gateway_id}: {e}")
-
-            # Try to get reserve and time remaining (for caching)
-            try:
-                # Request the Tesla App scaled reserve setting (scale=True)
-                data.reserve = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, lambda: pw.get_reserve(scale=True)), timeout=5.0
-                )
-                data.time_remaining = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.get_time_remaining),
-                    timeout=5.0,
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(
-                    f"Reserve/time remaining not available for {gateway_id}: {e}"
-                )
-
-            # Try to get system status for /pod endpoint (for caching)
-            try:
-                data.system_status = await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, pw.system_status), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"System status not available for {gateway_id}: {e}")
-
-            # Try to get fan speeds for /fans endpoint (TEDAPI only)
-            try:
-                if hasattr(pw, "get_fan_speeds"):
-                    data.fan_speeds = await asyncio.wait_for(
-                        loop.run_in_executor(self._executor, pw.get_fan_speeds),
-                        timeout=5.0,
-                    )
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Fan speeds not available for {gateway_id}: {e}")
-
-            # Try to get networks for /api/system/networks endpoint
-            try:
-                networks_result = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        self._executor, lambda: pw.poll("/api/networks")
-                    ),
-                    timeout=5.0,
-                )
-                if networks_result and isinstance(networks_result, list):
-                    data.networks = networks_result
-                elif networks_result and isinstance(networks_result, str):
-                    try:
-                        data.networks = json.loads(networks_result)
-                    except json.JSONDecodeError:
-                        pass
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Networks not available for {gateway_id}: {e}")
-
-            # Try to get powerwalls for /api/powerwalls endpoint
-            try:
-                powerwalls_result = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        self._executor, lambda: pw.poll("/api/powerwalls")
-                    ),
-                    timeout=5.0,
-                )
-                if powerwalls_result and isinstance(powerwalls_result, dict):
-                    data.powerwalls = powerwalls_result
-                elif powerwalls_result and isinstance(powerwalls_result, str):
-                    try:
-                        data.powerwalls = json.loads(powerwalls_result)
-                    except json.JSONDecodeError:
-                        pass
-            except (asyncio.TimeoutError, Exception) as e:
-                logger.debug(f"Powerwalls not available for {gateway_id}: {e}")
-
             # Update cache
             gateway = self.gateways[gateway_id]
 
@@ -697,10 +1141,19 @@ class GatewayManager:
                         f"Exponential backoff reset for {gateway_id} after {previous_failures} failures"
                     )
 
-            self.cache[gateway_id] = GatewayStatus(
-                gateway=gateway, data=data, online=True, last_updated=data.timestamp
+            self._store_status(
+                gateway_id,
+                GatewayStatus(
+                    gateway=gateway, data=data, online=True, last_updated=data.timestamp
+                ),
             )
 
+            # Build derived views (/pod, /freq, /csv, ...) once per snapshot
+            materialized_views.refresh(gateway_id, data)
+            history_store.record(gateway_id, data)
+            energy_meter.record(gateway_id, data, gateway.timezone)
+            await self._notify_snapshot()
+
             # Fire-and-forget MQTT publish after the cache is updated.
             # Importing here (late import) avoids a circular dependency at module
             # load time (publisher.py → config → gateway_manager).
@@ -729,6 +1182,10 @@ class GatewayManager:
             now = datetime.now().timestamp()
             self._next_poll_time[gateway_id] = now + backoff_seconds
 
+            # Refetch every field once the gateway is back - a reboot or
+            # firmware update may have changed the slow-cadence values too.
+            self._field_last_fetch.pop(gateway_id, None)
+
             logger.debug(
                 f"Exponential backoff for {gateway_id}: failure #{failure_count}, waiting {backoff_seconds}s before retry"
             )
@@ -751,9 +1208,11 @@ class GatewayManager:
             gateway.online = False
             gateway.last_error = str(e)
 
-            self.cache[gateway_id] = GatewayStatus(
-                gateway=gateway, online=False, error=str(e), last_updated=now
+            self._store_status(
+                gateway_id,
+                GatewayStatus(gateway=gateway, online=False, error=str(e), last_updated=now),
             )
+            await self._notify_snapshot()
 
             # Publish the offline status to MQTT so HA reflects gateway going offline.
             from app.mqtt.publisher import mqtt_publisher
@@ -763,6 +1222,237 @@ class GatewayManager:
                     name=f"mqtt-publish-{gateway_id}",
                 )
 
+    def _poll_budget(self) -> float:
+        """Seconds allowed for one gateway's data fetch (PW_POLL_BUDGET).
+
+        0 (default) means automatic: 80% of the poll interval, but at least 2s
+        so very short intervals still leave time for the gateway to answer.
+        """
+        from app.config import settings
+
+        if settings.poll_budget > 0:
+            return float(settings.poll_budget)
+        return max(2.0, 0.8 * self._poll_interval)
+
+    def _due_poll_fields(
+        self, gateway_id: str, last_data: Optional[PowerwallData]
+    ) -> List[PollField]:
+        """Select the POLL_FIELDS entries that should be fetched this cycle.
+
+        Everything is due when there is no previous snapshot to carry values
+        forward from. A field that failed is never marked as fetched, so it is
+        retried on the next cycle regardless of its cadence.
+        """
+        if last_data is None:
+            return list(POLL_FIELDS)
+
+        cadence = self._poll_cadence.get(gateway_id, DEFAULT_POLL_CADENCE)
+        last_fetch = self._field_last_fetch.get(gateway_id, {})
+        now = asyncio.get_running_loop().time()
+        # Half a poll interval of slack keeps a 30s field on a 5s cycle from
+        # slipping to every 35s because of a few milliseconds of jitter.
+        slack = self._poll_interval / 2
+
+        due = []
+        for field in POLL_FIELDS:
+            interval = cadence.get(field.name, 0)
+            fetched_at = last_fetch.get(field.name)
+            if interval <= 0 or fetched_at is None or now - fetched_at + slack >= interval:
+                due.append(field)
+        return due
+
+    async def _run_blocking(
+        self, gateway_id: str, fn: Callable[..., Any], *args, timeout: float
+    ) -> Any:
+        """Run a blocking pypowerwall call for a gateway in the executor.
+
+        asyncio.wait_for() can abandon an executor future but not the thread
+        running it, so every call is admitted against a per-gateway thread limit
+        (PW_GATEWAY_THREAD_LIMIT). A slot is released when the thread actually
+        finishes, not when the caller stops waiting; calls that time out while
+        their thread keeps running are tracked as abandoned. When a gateway is at
+        its limit new work is refused with GatewayBusyError instead of queued.
+
+        Raises:
+            GatewayBusyError: The gateway has no free thread slots.
+            asyncio.TimeoutError: The call did not finish within ``timeout``.
+        """
+        from app.config import settings
+
+        limit = settings.thread_limit
+        with self._thread_lock:
+            counts = self._thread_counts.setdefault(
+                gateway_id,
+                {"active": 0, "abandoned": 0, "abandoned_total": 0, "refused_total": 0},
+            )
+            if counts["active"] >= limit:
+                counts["refused_total"] += 1
+                raise GatewayBusyError(
+                    f"{gateway_id} has {counts['active']} executor threads in use "
+                    f"({counts['abandoned']} abandoned), refusing new work"
+                )
+            counts["active"] += 1
+
+        state = {"finished": False, "abandoned": False}
+
+        def run():
+            try:
+                return fn(*args)
+            finally:
+                with self._thread_lock:
+                    state["finished"] = True
+                    counts["active"] -= 1
+                    if state["abandoned"]:
+                        counts["abandoned"] -= 1
+
+        future = self._executor_for(gateway_id).submit(run)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except BaseException:
+            with self._thread_lock:
+                if future.cancel():
+                    # Never started - run() will not release the slot
+                    if not state["finished"]:
+                        state["finished"] = True
+                        counts["active"] -= 1
+                elif not state["finished"]:
+                    state["abandoned"] = True
+                    counts["abandoned"] += 1
+                    counts["abandoned_total"] += 1
+            raise
+
+    def _executor_for(self, gateway_id: str) -> ThreadPoolExecutor:
+        """Get the thread pool serving a gateway's reads (local or cloud)."""
+        gateway = self.gateways.get(gateway_id)
+        if gateway is not None and (gateway.cloud_mode or gateway.fleetapi):
+            if self._cloud_executor is None:
+                self._cloud_executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="pypowerwall-cloud"
+                )
+            return self._cloud_executor
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=10, thread_name_prefix="pypowerwall"
+            )
+        return self._executor
+
+    def _get_control_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool reserved for cloud_control writes."""
+        if self._control_executor is None:
+            self._control_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="pypowerwall-control"
+            )
+        return self._control_executor
+
+    def get_executor_health(self) -> Dict[str, Any]:
+        """Get executor thread accounting for /stats connection_health."""
+        from app.config import settings
+
+        with self._thread_lock:
+            per_gateway = {gid: dict(c) for gid, c in self._thread_counts.items()}
+        pools = {
+            name: executor._max_workers if executor else 0
+            for name, executor in (
+                ("local", self._executor),
+                ("cloud", self._cloud_executor),
+                ("control", self._control_executor),
+            )
+        }
+        return {
+            "pools": pools,
+            "thread_limit_per_gateway": settings.thread_limit,
+            "active_threads": sum(c["active"] for c in per_gateway.values()),
+            "abandoned_threads": sum(c["abandoned"] for c in per_gateway.values()),
+            "abandoned_total": sum(c["abandoned_total"] for c in per_gateway.values()),
+            "refused_total": sum(c["refused_total"] for c in per_gateway.values()),
+            "gateways": per_gateway,
+        }
+
+    def _get_poll_semaphore(self, gateway_id: str) -> asyncio.Semaphore:
+        """Get the per-gateway semaphore limiting concurrent poll fetches."""
+        semaphore = self._poll_semaphores.get(gateway_id)
+        if semaphore is None:
+            from app.config import settings
+
+            semaphore = asyncio.Semaphore(max(1, settings.poll_concurrency))
+            self._poll_semaphores[gateway_id] = semaphore
+        return semaphore
+
+    async def _fetch_field(
+        self,
+        gateway_id: str,
+        pw: pypowerwall.Powerwall,
+        field: PollField,
+        semaphore: asyncio.Semaphore,
+        shared_reads: Optional[Dict[str, Optional[asyncio.Future]]] = None,
+    ) -> Tuple[bool, Any]:
+        """Fetch one optional poll field in the executor.
+
+        Never raises - failures are logged at debug level, matching the
+        "optional data" handling of the poll loop.
+
+        Args:
+            shared_reads: Paths read once for this cycle and shared by every
+                field derived from them; the first field to need a path starts
+                the read and the others await the same result
+
+        Returns:
+            (True, value) on success, (False, None) if the field is unsupported,
+            timed out or raised.
+        """
+        transport = self._async_transports.get(gateway_id)
+        if transport and field.path:
+            # Served from the event loop; the transport's connection pool limits
+            # concurrency, so no executor thread or semaphore slot is needed
+            try:
+                payload = await asyncio.wait_for(
+                    transport.get(field.path), timeout=field.timeout
+                )
+                return True, field.from_payload(payload)
+            except (AsyncTransportError, asyncio.TimeoutError) as e:
+                logger.debug(
+                    f"Async {field.name} read failed for {gateway_id}, using executor: {e}"
+                )
+            except Exception as e:
+                logger.debug(f"{field.name} not available for {gateway_id}: {e}")
+                return False, None
+
+        try:
+            if field.supported is not None and not field.supported(pw):
+                return False, None
+            if shared_reads is not None and field.path in shared_reads:
+                read = shared_reads[field.path]
+                if read is None:
+                    read = asyncio.ensure_future(
+                        self._read_path(gateway_id, pw, field.path, field.timeout, semaphore)
+                    )
+                    shared_reads[field.path] = read
+                # shield: a cancelled field must not cancel its siblings' read
+                return True, field.from_payload(await asyncio.shield(read))
+            async with semaphore:
+                result = await self._run_blocking(
+                    gateway_id, field.fetch, pw, timeout=field.timeout
+                )
+            if field.parse is not None:
+                result = field.parse(result)
+            return True, result
+        except (asyncio.TimeoutError, Exception) as e:
+            logger.debug(f"{field.name} not available for {gateway_id}: {e}")
+            return False, None
+
+    async def _read_path(
+        self,
+        gateway_id: str,
+        pw: pypowerwall.Powerwall,
+        path: str,
+        timeout: float,
+        semaphore: asyncio.Semaphore,
+    ) -> Any:
+        """Read and decode one gateway API path in the executor."""
+        async with semaphore:
+            payload = await self._run_blocking(gateway_id, pw.poll, path, timeout=timeout)
+        return _parse_json(payload)
+
     def get_gateway(self, gateway_id: str) -> Optional[GatewayStatus]:
         """Get status for a specific gateway with graceful degradation support.
 
@@ -824,6 +1514,73 @@ class GatewayManager:
         )
         return status
 
+    def _is_warm_started(self, gateway_id: str) -> bool:
+        """True while a gateway's last good data is still its warm-start snapshot."""
+        data = self._warm_start_data.get(gateway_id)
+        return data is not None and self._last_successful_data.get(gateway_id) is data
+
+    def _store_status(self, gateway_id: str, status: GatewayStatus) -> None:
+        """Replace a gateway's cached status and bump its snapshot version."""
+        self.cache[gateway_id] = status
+        self._snapshot_seq += 1
+        self._snapshot_versions[gateway_id] = self._snapshot_seq
+
+    def get_snapshot_version(self, gateway_id: Optional[str] = None) -> int:
+        """Version of a gateway's cached status; changes whenever the cache is updated.
+
+        Versions increase monotonically across all gateways. 0 means the
+        status was never stored through the poll path. Without a gateway_id
+        the latest version of any gateway is returned.
+        """
+        if gateway_id is None:
+            return self._snapshot_seq
+        return self._snapshot_versions.get(gateway_id, 0)
+
+    def _get_snapshot_condition(self) -> asyncio.Condition:
+        if self._snapshot_condition is None:
+            self._snapshot_condition = asyncio.Condition()
+        return self._snapshot_condition
+
+    async def _notify_snapshot(self) -> None:
+        """Wake long-poll readers after a poll stored a new snapshot."""
+        condition = self._snapshot_condition
+        if condition is None:
+            return  # Nobody has waited yet
+        async with condition:
+            condition.notify_all()
+
+    async def wait_for_snapshot(
+        self, gateway_id: Optional[str], after: int, timeout: Optional[float]
+    ) -> bool:
+        """Wait until a gateway's snapshot version differs from ``after``.
+
+        Versions only grow within a process but restart at 0 with it, so an
+        ``after`` ahead of the current version comes from before a restart and
+        is treated as stale rather than waited out.
+
+        Args:
+            gateway_id: Gateway to watch, or None for any gateway
+            after: Last snapshot version the caller has seen
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if a newer (or, after a restart, any other) snapshot exists,
+            False if the timeout expired first
+        """
+        def is_newer() -> bool:
+            return self.get_snapshot_version(gateway_id) != after
+
+        if is_newer():
+            return True
+
+        condition = self._get_snapshot_condition()
+        try:
+            async with condition:
+                await asyncio.wait_for(condition.wait_for(is_newer), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     def get_all_gateways(self) -> Dict[str, GatewayStatus]:
         """Get status for all gateways with graceful degradation applied."""
         result = {}
@@ -891,15 +1648,11 @@ class GatewayManager:
 
         try:
             method_func = getattr(pw, method)
-            loop = asyncio.get_running_loop()
             logger.debug(
                 f"[{gateway_id}] call_api({method}) starting (timeout={timeout}s)"
             )
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self._executor, lambda: method_func(*args, **kwargs)
-                ),
-                timeout=timeout,
+            result = await self._run_blocking(
+                gateway_id, lambda: method_func(*args, **kwargs), timeout=timeout
             )
             logger.debug(f"[{gateway_id}] call_api({method}) completed successfully")
             return result
@@ -942,7 +1695,7 @@ class GatewayManager:
             loop = asyncio.get_running_loop()
             result = await asyncio.wait_for(
                 loop.run_in_executor(
-                    self._executor, lambda: method_func(*args, **kwargs)
+                    self._get_control_executor(), lambda: method_func(*args, **kwargs)
                 ),
                 timeout=timeout,
             )
@@ -994,15 +1747,11 @@ class GatewayManager:
 
         try:
             method_func = getattr(pw.tedapi, method)
-            loop = asyncio.get_running_loop()
             logger.debug(
                 f"[{gateway_id}] call_tedapi({method}) starting (timeout={timeout}s)"
             )
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self._executor, lambda: method_func(*args, **kwargs)
-                ),
-                timeout=timeout,
+            result = await self._run_blocking(
+                gateway_id, lambda: method_func(*args, **kwargs), timeout=timeout
             )
             logger.debug(f"[{gateway_id}] call_tedapi({method}) completed successfully")
             return result
@@ -1028,6 +1777,11 @@ class GatewayManager:
         - Battery %: Simple average (TODO: weight by capacity when available)
         - Power flows: Simple sum (works for most cases)
         - Grid power: Calculated as site - solar
+        - Only online gateways contribute, except right after a restart: a
+          gateway still serving its warm-start snapshot (not yet replaced by
+          a poll) contributes it under the get_gateway() graceful-degradation
+          rules (PW_CACHE_TTL). It is counted in num_reporting, not num_online.
+          Other offline gateways are left out, even within PW_CACHE_TTL
 
         Future considerations:
         - Different aggregation strategies per metric type
@@ -1040,11 +1794,16 @@ class GatewayManager:
 
         for gateway_id, status in self.cache.items():
             aggregate.num_gateways += 1
-
-            if not status.online or not status.data:
+            if not status.online:
+                if not self._is_warm_started(gateway_id):
+                    continue
+                status = self.get_gateway(gateway_id)
+            if not status.data:
                 continue
 
-            aggregate.num_online += 1
+            if status.online:
+                aggregate.num_online += 1
+            aggregate.num_reporting += 1
             data = status.data
 
             # Aggregate battery percentage
@@ -1076,15 +1835,15 @@ class GatewayManager:
             aggregate.gateways[gateway_id] = status
 
         # Calculate average battery percentage (simple average for now)
-        if aggregate.num_online > 0:
-            aggregate.total_battery_percent /= aggregate.num_online
+        if aggregate.num_reporting > 0:
+            aggregate.total_battery_percent /= aggregate.num_reporting
 
         # Grid power is the site power (positive = importing, negative = exporting)
         # The "site" meter in aggregates measures grid interaction directly
         aggregate.total_grid_power = aggregate.total_site_power
 
         # Get grid status from default gateway if available
-        default_gateway = self.cache.get("default")
+        default_gateway = aggregate.gateways.get("default")
         if default_gateway and default_gateway.data:
             aggregate.grid_status = default_gateway.data.grid_status
 
@@ -0,0 +1,641 @@
+"""
+In-memory time series of poll samples, one ring buffer per gateway.
+
+The gateway cache only holds the latest PowerwallData. To let dashboards draw
+recent charts without an external TSDB, _poll_gateway also appends a few key
+values of every successful poll to a fixed-size ring buffer:
+
+    timestamp                       - PowerwallData.timestamp (Unix seconds)
+    site, battery, load, solar      - instant_power from aggregates (W)
+    soe                             - state of energy (%)
+    freq                            - grid frequency (Hz)
+    reserve                         - backup reserve (%)
+    grid_status                     - UP / DOWN / SYNCING, stored as a code
+
+Storage
+-------
+Each field is a preallocated array.array column ("d" doubles, one signed
+byte for grid status), so a sample costs 65 bytes and no Python objects are
+kept per sample. The capacity is PW_HISTORY_WINDOW / PW_CACHE_EXPIRE samples
+(24 h at 5 s = 17,280 samples, about 1.1 MB per gateway); once full, the
+oldest sample is overwritten. Missing values are stored as NaN (-1 for grid
+status) and read back as None.
+
+Samples are kept in timestamp order: a sample that is not newer than the
+last one (e.g. after a clock step back) is skipped.
+
+Rollups
+-------
+Each sample is also folded into 1-minute, 15-minute and 1-hour buckets
+(ROLLUP_TIERS) holding min/max/mean/last of the power flows and SOE. Buckets
+are updated in place as samples arrive (sum and count give the mean), so no
+tier is ever rebuilt by rescanning samples. Tiers are ring buffers too and
+keep longer spans than the raw samples:
+
+    raw   PW_HISTORY_WINDOW (default 24 h)
+    1m    2 days    (2,880 buckets)
+    15m   30 days   (2,880 buckets)
+    1h    90 days   (2,160 buckets)
+
+A bucket costs 188 bytes, so the tiers add a fixed ~1.5 MB per gateway.
+
+query() answers a range from the coarsest tier whose interval does not
+exceed the requested resolution and that still covers the range's start, so
+a week-long chart reads 15-minute buckets instead of 100k raw samples.
+
+Downsampling
+------------
+downsample() reduces each series of a result to a fixed number of points with
+Largest-Triangle-Three-Buckets (LTTB), which keeps the points that shape the
+line (peaks, dips, steps) rather than averaging them away, so a chart can ask
+for exactly as many points as it has pixels.
+"""
+import logging
+import math
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.models.gateway import PowerwallData
+
+logger = logging.getLogger(__name__)
+
+# Numeric columns besides the timestamp, in storage order
+FIELDS: Tuple[str, ...] = ("site", "battery", "load", "solar", "soe", "freq", "reserve")
+POWER_FIELDS: Tuple[str, ...] = ("site", "battery", "load", "solar")
+
+# Fields summarized by the rollup tiers
+ROLLUP_FIELDS: Tuple[str, ...] = (*POWER_FIELDS, "soe")
+
+# Rollup tiers: (name, bucket seconds, retention seconds), finest first
+ROLLUP_TIERS: Tuple[Tuple[str, int, int], ...] = (
+    ("1m", 60, 2 * 86400),
+    ("15m", 900, 30 * 86400),
+    ("1h", 3600, 90 * 86400),
+)
+
+# Default number of points query() aims for when no resolution is given
+AUTO_POINTS = 500
+
+# Input points per output point read for LTTB downsampling (see downsample())
+LTTB_OVERSAMPLE = 4
+
+_GRID_CODES = {"DOWN": 0, "UP": 1, "SYNCING": 2}
+_GRID_NAMES = {code: name for name, code in _GRID_CODES.items()}
+_NO_GRID = -1
+
+_NAN = float("nan")
+
+
+def _value(value: Any) -> float:
+    try:
+        return float(value) if value is not None else _NAN
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def _optional(value: Optional[float]) -> Optional[float]:
+    return None if value is None or math.isnan(value) else value
+
+
+# Row layouts shared with persistent backends (app/core/history_db.py):
+#   sample row: (timestamp, *FIELDS values, grid status code)
+#   bucket row: (bucket start, *(min, max, sum, count, last) per ROLLUP_FIELDS)
+BUCKET_STATS: Tuple[str, ...] = ("min", "max", "sum", "count", "last")
+
+
+def sample_columns(rows: List[Tuple]) -> Dict[str, List[Any]]:
+    """Columns (as RingBuffer.read returns them) from sample rows."""
+    result: Dict[str, List[Any]] = {"timestamp": [row[0] for row in rows]}
+    for offset, field in enumerate(FIELDS, start=1):
+        result[field] = [_optional(row[offset]) for row in rows]
+    result["grid_status"] = [_GRID_NAMES.get(row[-1]) for row in rows]
+    return result
+
+
+def bucket_columns(rows: List[Tuple]) -> Dict[str, List[Any]]:
+    """Columns (as RollupBuffer.read returns them) from bucket rows."""
+    result: Dict[str, List[Any]] = {"timestamp": [row[0] for row in rows]}
+    for number, field in enumerate(ROLLUP_FIELDS):
+        offset = 1 + number * len(BUCKET_STATS)
+        result[f"{field}_min"] = [_optional(row[offset]) for row in rows]
+        result[f"{field}_max"] = [_optional(row[offset + 1]) for row in rows]
+        result[f"{field}_mean"] = [
+            row[offset + 2] / row[offset + 3] if row[offset + 3] else None for row in rows
+        ]
+        result[f"{field}_last"] = [_optional(row[offset + 4]) for row in rows]
+    return result
+
+
+def sample_values(data: PowerwallData) -> Tuple[float, ...]:
+    """The numeric FIELDS of a poll, in column order (NaN when missing)."""
+    aggregates = data.aggregates or {}
+    power = [
+        _value((aggregates.get(key) or {}).get("instant_power")) for key in POWER_FIELDS
+    ]
+    return (*power, _value(data.soe), _value(data.freq), _value(data.reserve))
+
+
+def lttb(
+    timestamps: Sequence[float], values: Sequence[float], points: int
+) -> Tuple[List[float], List[float]]:
+    """Largest-Triangle-Three-Buckets: ``points`` of a series that keep its shape.
+
+    The first and last points are kept; every other output point is the one
+    in its bucket forming the largest triangle with the previously chosen
+    point and the mean of the next bucket. Series with no more than
+    ``points`` points are returned unchanged.
+    """
+    count = len(timestamps)
+    if points >= count:
+        return list(timestamps), list(values)
+    if points < 3:
+        raise ValueError("LTTB needs at least 3 points")
+
+    every = (count - 2) / (points - 2)
+    out_t = [timestamps[0]]
+    out_v = [values[0]]
+    chosen = 0
+    bucket_start = 1
+    for index in range(points - 2):
+        bucket_end = int((index + 1) * every) + 1
+        next_end = min(int((index + 2) * every) + 1, count)
+        # Mean of the next bucket (the last point for the final bucket)
+        if bucket_end < next_end:
+            span = next_end - bucket_end
+            mean_t = sum(timestamps[bucket_end:next_end]) / span
+            mean_v = sum(values[bucket_end:next_end]) / span
+        else:
+            mean_t, mean_v = timestamps[-1], values[-1]
+
+        anchor_t, anchor_v = timestamps[chosen], values[chosen]
+        dt = anchor_t - mean_t
+        dv = mean_v - anchor_v
+        best, best_area = bucket_start, -1.0
+        for position in range(bucket_start, bucket_end):
+            area = abs(dt * (values[position] - anchor_v) - (anchor_t - timestamps[position]) * dv)
+            if area > best_area:
+                best, best_area = position, area
+        out_t.append(timestamps[best])
+        out_v.append(values[best])
+        chosen = best
+        bucket_start = bucket_end
+
+    out_t.append(timestamps[-1])
+    out_v.append(values[-1])
+    return out_t, out_v
+
+
+def downsample(data: Dict[str, List[Any]], points: int) -> Dict[str, Dict[str, List[float]]]:
+    """Reduce each numeric column of a query result to ``points`` points with LTTB.
+
+    Each series keeps its own timestamps, so the result maps every column to
+    {"timestamp": [...], "value": [...]}. Missing (None) values are dropped
+    before downsampling; non-numeric columns (grid_status) are left out.
+    """
+    timestamps = data["timestamp"]
+    result: Dict[str, Dict[str, List[float]]] = {}
+    for column, values in data.items():
+        if column in ("timestamp", "grid_status"):
+            continue
+        present = [position for position, value in enumerate(values) if value is not None]
+        if len(present) == len(values):
+            series_t, series_v = timestamps, values
+        else:
+            series_t = [timestamps[position] for position in present]
+            series_v = [values[position] for position in present]
+        chosen_t, chosen_v = lttb(series_t, series_v, points)
+        result[column] = {"timestamp": chosen_t, "value": chosen_v}
+    return result
+
+
+class _Ring:
+    """Index bookkeeping shared by the ring buffers: a timestamp column in
+    ascending order, stored circularly in a fixed number of slots."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self.timestamps = array("d", bytes(8 * self.capacity))
+        self._start = 0  # Physical index of the oldest entry
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _index(self, position: int) -> int:
+        """Physical index of the position-th oldest entry."""
+        return (self._start + position) % self.capacity
+
+    def _claim(self) -> int:
+        """Physical index for a new newest entry, evicting the oldest when full."""
+        if self._count < self.capacity:
+            self._count += 1
+            return self._index(self._count - 1)
+        index = self._start
+        self._start = (self._start + 1) % self.capacity
+        return index
+
+    def _arrays(self) -> List[array]:
+        return [self.timestamps]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return sum(column.itemsize * len(column) for column in self._arrays())
+
+    def last_timestamp(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return self.timestamps[self._index(self._count - 1)]
+
+    def _bisect(self, timestamp: float) -> int:
+        """Position of the first entry at or after timestamp."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[self._index(middle)] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def positions(self, start: Optional[float] = None, end: Optional[float] = None) -> range:
+        """Positions (oldest = 0) of the entries with start <= timestamp <= end."""
+        first = self._bisect(start) if start is not None else 0
+        last = self._bisect(math.nextafter(end, math.inf)) if end is not None else self._count
+        return range(first, max(first, last))
+
+    def first_timestamp(self) -> Optional[float]:
+        return self.timestamps[self._start] if self._count else None
+
+    def next_timestamp(self, timestamp: float) -> Optional[float]:
+        """Oldest timestamp at or after ``timestamp``, None if there is none."""
+        position = self._bisect(timestamp)
+        return self.timestamps[self._index(position)] if position < self._count else None
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
+
+
+class RingBuffer(_Ring):
+    """Fixed-capacity, column-oriented ring buffer of poll samples."""
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.columns: Dict[str, array] = {
+            field: array("d", bytes(8 * self.capacity)) for field in FIELDS
+        }
+        self.grid = array("b", bytes(self.capacity))
+
+    def _arrays(self) -> List[array]:
+        return [self.timestamps, self.grid, *self.columns.values()]
+
+    def append(self, timestamp: float, values: Tuple[float, ...], grid_status: Optional[str]) -> bool:
+        """Add a sample, overwriting the oldest when full.
+
+        Returns False (and stores nothing) if the sample is not newer than
+        the last one.
+        """
+        last = self.last_timestamp()
+        if last is not None and timestamp <= last:
+            return False
+
+        index = self._claim()
+        self.timestamps[index] = timestamp
+        for column, value in zip(self.columns.values(), values):
+            column[index] = value
+        self.grid[index] = _GRID_CODES.get(grid_status, _NO_GRID)
+        return True
+
+    def read(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, List[Any]]:
+        """Samples in [start, end] as columns: {"timestamp": [...], "site": [...], ...}."""
+        indexes = [self._index(position) for position in self.positions(start, end)]
+        result: Dict[str, List[Any]] = {"timestamp": [self.timestamps[i] for i in indexes]}
+        for field, column in self.columns.items():
+            result[field] = [_optional(column[i]) for i in indexes]
+        result["grid_status"] = [_GRID_NAMES.get(self.grid[i]) for i in indexes]
+        return result
+
+    def rows(self, after: Optional[float] = None) -> List[Tuple]:
+        """Sample rows newer than ``after`` (all when None)."""
+        first = self._bisect(math.nextafter(after, math.inf)) if after is not None else 0
+        rows = []
+        for position in range(first, self._count):
+            i = self._index(position)
+            values = (column[i] for column in self.columns.values())
+            rows.append((self.timestamps[i], *values, self.grid[i]))
+        return rows
+
+    def restore(self, row: Tuple) -> bool:
+        """Append a sample row read back from a persistent backend."""
+        values = tuple(_value(value) for value in row[1:-1])
+        return self.append(row[0], values, _GRID_NAMES.get(row[-1]))
+
+
+class RollupBuffer(_Ring):
+    """Ring buffer of fixed-interval buckets with min/max/mean/last per field.
+
+    The timestamp column holds bucket start times (multiples of interval).
+    """
+
+    def __init__(self, interval: int, capacity: int):
+        super().__init__(capacity)
+        self.interval = interval
+
+        def column(typecode: str = "d") -> array:
+            return array(typecode, bytes(array(typecode).itemsize * self.capacity))
+
+        self.mins = {field: column() for field in ROLLUP_FIELDS}
+        self.maxs = {field: column() for field in ROLLUP_FIELDS}
+        self.sums = {field: column() for field in ROLLUP_FIELDS}
+        self.lasts = {field: column() for field in ROLLUP_FIELDS}
+        self.counts = {field: column("I") for field in ROLLUP_FIELDS}
+
+    def _arrays(self) -> List[array]:
+        columns = [self.timestamps]
+        for stats in (self.mins, self.maxs, self.sums, self.lasts, self.counts):
+            columns.extend(stats.values())
+        return columns
+
+    def add(self, timestamp: float, values: Tuple[float, ...]):
+        """Fold a sample's ROLLUP_FIELDS values into its bucket."""
+        bucket = timestamp - timestamp % self.interval
+        last = self.last_timestamp()
+        if last is not None and bucket < last:
+            return
+        if last == bucket:
+            index = self._index(self._count - 1)
+        else:
+            index = self._claim()
+            self.timestamps[index] = bucket
+            for field in ROLLUP_FIELDS:
+                self.counts[field][index] = 0
+                self.sums[field][index] = 0.0
+                self.mins[field][index] = self.maxs[field][index] = self.lasts[field][index] = _NAN
+
+        for field, value in zip(ROLLUP_FIELDS, values):
+            if math.isnan(value):
+                continue
+            count = self.counts[field][index]
+            if count == 0 or value < self.mins[field][index]:
+                self.mins[field][index] = value
+            if count == 0 or value > self.maxs[field][index]:
+                self.maxs[field][index] = value
+            self.sums[field][index] += value
+            self.lasts[field][index] = value
+            self.counts[field][index] = count + 1
+
+    def read(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, List[Any]]:
+        """Buckets overlapping [start, end] as columns.
+
+        Columns: "timestamp" (bucket start) and "{field}_{min|max|mean|last}"
+        for each of ROLLUP_FIELDS.
+        """
+        if start is not None:
+            start -= start % self.interval  # Include the bucket containing start
+        indexes = [self._index(position) for position in self.positions(start, end)]
+        result: Dict[str, List[Any]] = {"timestamp": [self.timestamps[i] for i in indexes]}
+        for field in ROLLUP_FIELDS:
+            counts = self.counts[field]
+            result[f"{field}_min"] = [_optional(self.mins[field][i]) for i in indexes]
+            result[f"{field}_max"] = [_optional(self.maxs[field][i]) for i in indexes]
+            result[f"{field}_mean"] = [
+                self.sums[field][i] / counts[i] if counts[i] else None for i in indexes
+            ]
+            result[f"{field}_last"] = [_optional(self.lasts[field][i]) for i in indexes]
+        return result
+
+    def rows(self, since: Optional[float] = None) -> List[Tuple]:
+        """Bucket rows starting at or after ``since`` (all when None).
+
+        The newest bucket may still be filling; persisting it again on the
+        next flush (upsert) keeps the stored copy current.
+        """
+        first = self._bisect(since) if since is not None else 0
+        rows = []
+        for position in range(first, self._count):
+            i = self._index(position)
+            row: List[Any] = [self.timestamps[i]]
+            for field in ROLLUP_FIELDS:
+                row += [
+                    self.mins[field][i],
+                    self.maxs[field][i],
+                    self.sums[field][i],
+                    self.counts[field][i],
+                    self.lasts[field][i],
+                ]
+            rows.append(tuple(row))
+        return rows
+
+    def restore(self, row: Tuple):
+        """Load a bucket row read back from a persistent backend."""
+        last = self.last_timestamp()
+        if last is not None and row[0] < last:
+            return
+        index = self._index(self._count - 1) if last == row[0] else self._claim()
+        self.timestamps[index] = row[0]
+        for number, field in enumerate(ROLLUP_FIELDS):
+            low, high, total, count, latest = row[1 + number * len(BUCKET_STATS):][:len(BUCKET_STATS)]
+            self.mins[field][index] = _value(low)
+            self.maxs[field][index] = _value(high)
+            self.sums[field][index] = total or 0.0
+            self.counts[field][index] = count or 0
+            self.lasts[field][index] = _value(latest)
+
+
+class GatewayHistory:
+    """Raw samples and rollup tiers of one gateway."""
+
+    def __init__(self, capacity: int):
+        self.raw = RingBuffer(capacity)
+        self.rollups: Dict[str, RollupBuffer] = {
+            name: RollupBuffer(interval, math.ceil(retention / interval))
+            for name, interval, retention in ROLLUP_TIERS
+        }
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.raw.memory_bytes + sum(r.memory_bytes for r in self.rollups.values())
+
+    def tier(self, name: str) -> _Ring:
+        """The raw ring ("raw") or a rollup tier by name."""
+        return self.raw if name == "raw" else self.rollups[name]
+
+    def add(self, timestamp: float, values: Tuple[float, ...], grid_status: Optional[str]) -> bool:
+        """Store a sample and fold it into every rollup tier."""
+        if not self.raw.append(timestamp, values, grid_status):
+            return False
+        rollup_values = tuple(values[FIELDS.index(field)] for field in ROLLUP_FIELDS)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, rollup_values)
+        return True
+
+
+class HistoryStore:
+    """Poll history (raw samples and rollups), keyed by gateway id."""
+
+    def __init__(self):
+        self._gateways: Dict[str, GatewayHistory] = {}
+
+    @staticmethod
+    def capacity() -> int:
+        """Raw samples per gateway for PW_HISTORY_WINDOW at the poll interval."""
+        from app.config import settings  # late import
+
+        interval = max(1, settings.cache_expire)
+        return math.ceil(settings.history_window / interval) + 1
+
+    def record(self, gateway_id: str, data: PowerwallData) -> bool:
+        """Add a successful poll's sample to the gateway's history."""
+        from app.config import settings  # late import
+
+        if settings.history_window <= 0 or not data.timestamp:
+            return False
+        history = self._gateways.get(gateway_id)
+        if history is None:
+            history = self._gateways[gateway_id] = GatewayHistory(self.capacity())
+        if not history.add(data.timestamp, sample_values(data), data.grid_status):
+            logger.debug(f"History sample for {gateway_id} skipped: not newer than the last one")
+            return False
+        return True
+
+    def get(self, gateway_id: str) -> Optional[GatewayHistory]:
+        return self._gateways.get(gateway_id)
+
+    def read(
+        self, gateway_id: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Optional[Dict[str, List[Any]]]:
+        """Raw samples of a gateway in [start, end], or None if it has no history."""
+        history = self._gateways.get(gateway_id)
+        return history.raw.read(start, end) if history is not None else None
+
+    @staticmethod
+    def tiers() -> List[Tuple[str, float, float]]:
+        """(name, interval, retention) of every tier, finest first."""
+        from app.config import settings  # late import
+
+        return [("raw", max(1, settings.cache_expire), settings.history_window), *ROLLUP_TIERS]
+
+    def select_tier(
+        self,
+        start: float,
+        resolution: float,
+        now: Optional[float] = None,
+        retention: Optional[Dict[str, float]] = None,
+    ) -> Tuple[str, float]:
+        """Tier to answer a range starting at ``start`` with points ``resolution`` s apart.
+
+        The coarsest tier whose interval is at most ``resolution`` and whose
+        retention reaches back to ``start``; if no such tier covers the start,
+        the finest tier that does (or else the coarsest tier). ``retention``
+        overrides the in-memory retention per tier name (e.g. when a
+        persistent backend keeps tiers longer).
+        """
+        now = time.time() if now is None else now
+        tiers = [
+            (name, interval, (retention or {}).get(name, kept))
+            for name, interval, kept in self.tiers()
+        ]
+        covering = [tier for tier in tiers if tier[2] > 0 and start >= now - tier[2]] or tiers[-1:]
+        fitting = [tier for tier in covering if tier[1] <= resolution]
+        name, interval, _ = fitting[-1] if fitting else covering[0]
+        return name, interval
+
+    def query(
+        self,
+        gateway_id: str,
+        start: float,
+        end: float,
+        resolution: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Columns of a gateway's history in [start, end] from the best tier.
+
+        Args:
+            resolution: Desired seconds between points; default
+                (end - start) / AUTO_POINTS
+        """
+        if resolution is None:
+            resolution = (end - start) / AUTO_POINTS
+        name, interval = self.select_tier(start, resolution)
+        return {"resolution": name, "interval": interval, "data": self.read_tier(gateway_id, name, start, end)}
+
+    def read_tier(
+        self, gateway_id: str, name: str, start: Optional[float], end: Optional[float]
+    ) -> Dict[str, List[Any]]:
+        """Columns of one tier ("raw", "1m", ...) of a gateway in [start, end]."""
+        history = self._gateways.get(gateway_id)
+        if history is not None:
+            return history.tier(name).read(start, end)
+        return sample_columns([]) if name == "raw" else bucket_columns([])
+
+    def first_timestamp(self, gateway_id: str, name: str) -> Optional[float]:
+        """Oldest timestamp held in memory for a gateway's tier."""
+        history = self._gateways.get(gateway_id)
+        return history.tier(name).first_timestamp() if history is not None else None
+
+    def next_timestamp(self, gateway_id: str, name: str, timestamp: float) -> Optional[float]:
+        """Oldest timestamp at or after ``timestamp`` held in memory for a gateway's tier."""
+        history = self._gateways.get(gateway_id)
+        return history.tier(name).next_timestamp(timestamp) if history is not None else None
+
+    def rows_since(
+        self, gateway_id: str, marks: Dict[str, Optional[float]]
+    ) -> Tuple[List[Tuple], Dict[str, List[Tuple]], Dict[str, Optional[float]]]:
+        """Rows added since the given marks, for persisting in a batch.
+
+        ``marks`` maps "raw" to the last persisted sample timestamp and each
+        rollup tier to the start of the last persisted bucket (that bucket is
+        returned again as it may have changed). Returns (sample rows, bucket
+        rows per tier, new marks).
+        """
+        history = self._gateways.get(gateway_id)
+        if history is None:
+            return [], {}, dict(marks)
+        samples = history.raw.rows(marks.get("raw"))
+        if not samples:
+            return [], {}, dict(marks)  # Buckets only change when samples arrive
+        buckets = {name: r.rows(marks.get(name)) for name, r in history.rollups.items()}
+        new_marks = dict(marks)
+        new_marks["raw"] = samples[-1][0]
+        for name, rows in buckets.items():
+            if rows:
+                new_marks[name] = rows[-1][0]
+        return samples, buckets, new_marks
+
+    def restore(
+        self, gateway_id: str, samples: List[Tuple], buckets: Dict[str, List[Tuple]]
+    ):
+        """Rebuild a gateway's in-memory history from persisted rows (oldest first)."""
+        history = self._gateways.get(gateway_id)
+        if history is None:
+            history = self._gateways[gateway_id] = GatewayHistory(self.capacity())
+        for row in samples:
+            history.raw.restore(row)
+        for name, rows in buckets.items():
+            for row in rows:
+                history.rollups[name].restore(row)
+
+    def gateway_ids(self) -> List[str]:
+        return list(self._gateways)
+
+    def clear(self):
+        self._gateways.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sample counts and memory use per gateway."""
+        return {
+            "capacity": self.capacity(),
+            "gateways": {
+                gateway_id: {
+                    "samples": len(history.raw),
+                    "buckets": {name: len(r) for name, r in history.rollups.items()},
+                    "memory_bytes": history.memory_bytes,
+                }
+                for gateway_id, history in self._gateways.items()
+            },
+        }
+
+
+# Global history store instance
+history_store = HistoryStore()
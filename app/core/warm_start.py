@@ -0,0 +1,115 @@
+"""
+Warm-start snapshots of the last good data per gateway.
+
+After a restart the gateway cache is empty until lazy initialization and the
+first full poll complete, which can take 15+ seconds per gateway. To bridge
+that gap the gateway manager periodically writes the last successful
+PowerwallData for every gateway to a compact JSON file next to PW_CACHE_FILE
+(``{PW_CACHE_FILE}.snapshot.json``) and loads it back in initialize().
+
+Loaded data is treated exactly like data from a gateway that just went offline:
+it is only served while it is younger than PW_CACHE_TTL and only when
+PW_GRACEFUL_DEGRADATION is enabled (see GatewayManager.get_gateway).
+
+File format
+-----------
+    {
+        "version": 1,
+        "saved_at": 1712345678.9,
+        "gateways": {
+            "<gateway_id>": {"last_updated": 1712345678.1, "data": {...}}
+        }
+    }
+
+``data`` is PowerwallData with unset (None) fields omitted. Writes go to a
+temporary file that is atomically renamed over the snapshot, so a crash
+mid-write never leaves a truncated file behind.
+"""
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.models.gateway import PowerwallData
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(cache_file: Optional[str]) -> Optional[str]:
+    """Snapshot file location for a PW_CACHE_FILE path."""
+    if not cache_file:
+        return None
+    return f"{cache_file}.snapshot.json"
+
+
+def save_snapshot(path: str, data: Dict[str, PowerwallData]) -> int:
+    """Atomically write the last good data per gateway to ``path``.
+
+    Returns:
+        Number of gateways written
+    """
+    gateways = {
+        gateway_id: {
+            "last_updated": pw_data.timestamp,
+            "data": pw_data.model_dump(mode="json", exclude_none=True),
+        }
+        for gateway_id, pw_data in data.items()
+        if pw_data is not None and pw_data.timestamp
+    }
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": datetime.now().timestamp(),
+        "gateways": gateways,
+    }
+    write_json_atomic(path, payload)
+    return len(gateways)
+
+
+def write_json_atomic(path: str, payload: Any) -> None:
+    """Write ``payload`` as compact JSON via a temporary file renamed over ``path``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".snapshot-", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_snapshot(path: str) -> Dict[str, PowerwallData]:
+    """Load a snapshot written by save_snapshot().
+
+    Missing, unreadable or incompatible files are ignored (an empty dict is
+    returned) - a warm start is an optimization, never a startup requirement.
+    """
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable warm-start snapshot {path}: {e}")
+        return {}
+
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring warm-start snapshot {path}: unsupported format")
+        return {}
+
+    result = {}
+    for gateway_id, entry in (payload.get("gateways") or {}).items():
+        try:
+            result[gateway_id] = PowerwallData(**entry["data"])
+        except Exception as e:
+            logger.debug(f"Skipping warm-start data for {gateway_id}: {e}")
+    return result
@@ -41,11 +41,20 @@ Routing Structure:
        - GET  /api/aggregate/battery      -> Aggregated battery data
        - GET  /api/aggregate/power        -> Aggregated power data
        
-    5. WebSocket streaming (prefix: /ws):
+    5. Poll history API (prefix: /api/history):
+       - GET  /api/history/{id}           -> Samples or rollups for a time range
+       - GET  /api/history/{id}.ndjson    -> Streaming NDJSON export
+       
+    6. WebSocket streaming (prefix: /ws):
        - WS   /ws/gateway/{id}            -> Real-time gateway data
        - WS   /ws/aggregate               -> Real-time aggregate data
+       - WS   /ws/stream                  -> Multiplexed subscriptions
+    
+    7. Server-Sent Events (prefix: /sse):
+       - GET  /sse/gateway/{id}           -> Gateway data as an event stream
+       - GET  /sse/aggregate              -> Aggregate data as an event stream
     
-    6. Static files:
+    8. Static files:
        - /static/*                        -> Static assets (CSS, JS, images)
     
     Note: FastAPI will raise an error at startup if routes conflict.
@@ -63,7 +72,7 @@ from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings, SERVER_VERSION
-from app.api import legacy, gateways, aggregates, websockets
+from app.api import legacy, gateways, aggregates, history, websockets, sse
 from app.core.gateway_manager import gateway_manager
 from app.utils.transform import get_static
 from app.utils.stats_tracker import stats_tracker
@@ -316,7 +325,9 @@ static_path = Path(__file__).parent / "static"
 # routes are not shadowed by legacy endpoints that share the /api/* path prefix.
 app.include_router(gateways.router, prefix="/api/gateways", tags=["Gateways"])
 app.include_router(aggregates.router, prefix="/api/aggregate", tags=["Aggregates"])
+app.include_router(history.router, prefix="/api/history", tags=["History"])
 app.include_router(websockets.router, prefix="/ws", tags=["WebSockets"])
+app.include_router(sse.router, prefix="/sse", tags=["Server-Sent Events"])
 
 app.include_router(legacy.router, tags=["Legacy Proxy Compatibility"])
 
@@ -339,6 +350,12 @@ async def get_mqtt_status():
         "tls": settings.mqtt_tls,
     }
 
+
+@app.get("/api/scheduler/status", tags=["Gateways"])
+async def get_scheduler_status():
+    """Get poll scheduler queue depth, dispatch lag and per-gateway due times."""
+    return gateway_manager.get_scheduler_status()
+
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
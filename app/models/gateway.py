@@ -104,6 +104,7 @@ class PowerwallData(BaseModel):
         version: Powerwall firmware version
         status: Operating status string (e.g., "Running", "Standby")
         device_type: Device model (e.g., "Gateway", "Powerwall 2")
+        field_freshness: Per-field "fresh"/"carried"/"failed" tags for the polled fields
         timestamp: Unix timestamp when data was collected
 
     Usage:
@@ -141,6 +142,7 @@ class PowerwallData(BaseModel):
     pw3: Optional[bool] = None  # True if Powerwall 3 system
     tedapi_mode: Optional[str] = None  # TEDAPI mode (e.g., "FleetAPI")
     tedapi_config: Optional[Dict[str, Any]] = None  # Cached /tedapi/config response; battery_blocks[].type used for model detection
+    field_freshness: Optional[Dict[str, str]] = None  # Per-field "fresh" (fetched this poll), "carried" (previous poll's value) or "failed" (no value yet)
     timestamp: Optional[float] = None
 
 
@@ -195,7 +197,8 @@ class AggregateData(BaseModel):
     - Fleet management and analytics
 
     Aggregation Logic:
-        - Only online gateways with valid data are included
+        - Only online gateways with valid data are included, plus offline
+          gateways still serving their warm-start snapshot (within PW_CACHE_TTL)
         - Power values are summed (watts)
         - Battery percentage is averaged across all systems
         - Each gateway's individual status is preserved in gateways dict
@@ -216,6 +219,8 @@ class AggregateData(BaseModel):
         total_grid_power: Total grid power (same as site_power, for compatibility)
         num_gateways: Total number of configured gateways
         num_online: Number of currently connected gateways
+        num_reporting: Number of gateways whose data is included (online, or
+            warm-started and not yet polled successfully)
         gateways: Individual status for each gateway by ID
         timestamp: Unix timestamp when aggregation was performed
 
@@ -246,5 +251,6 @@ class AggregateData(BaseModel):
     grid_status: Optional[str] = None  # "UP", "DOWN", etc. from primary gateway
     num_gateways: int = 0
     num_online: int = 0
+    num_reporting: int = 0
     gateways: Dict[str, GatewayStatus] = Field(default_factory=dict)
     timestamp: float = 0.0
@@ -19,6 +19,11 @@ Sensors (numeric):
     home        — Home load (W, device_class=power)
     powerwall   — Powerwall power (W, device_class=power, positive=discharging)
     reserve     — Backup reserve target (%)
+    energy_*    — Energy today (kWh, device_class=energy, state_class=total_increasing):
+                  solar_produced, home_consumed, grid_imported, grid_exported,
+                  battery_charged, battery_discharged — usable in the HA Energy
+                  dashboard; the counters reset at local midnight. Only
+                  announced when the energy counters are enabled (PW_ENERGY)
 
 Text sensors:
     grid_status — "UP" | "DOWN" | "unknown"
@@ -42,9 +47,22 @@ import json
 import logging
 from typing import Optional
 
+from app.core.energy import COUNTERS
+
 logger = logging.getLogger(__name__)
 
 
+# Friendly names of the energy counters (see app/core/energy.py)
+_ENERGY_NAMES = {
+    "solar_produced": "Solar Energy Today",
+    "home_consumed": "Home Energy Today",
+    "grid_imported": "Grid Import Today",
+    "grid_exported": "Grid Export Today",
+    "battery_charged": "Battery Charge Today",
+    "battery_discharged": "Battery Discharge Today",
+}
+
+
 def _device_block(gateway_id: str, gateway_name: str, version: Optional[str]) -> dict:
     """Build the shared HA device block for all sensors on this gateway."""
     return {
@@ -75,6 +93,8 @@ def build_discovery_payloads(
     Returns:
         List of (topic, json_payload_str) tuples, one per sensor/binary sensor.
     """
+    from app.config import settings  # late import
+
     device = _device_block(gateway_id, gateway_name, version)
     data_prefix = f"{topic_prefix}/{gateway_id}"
     avail_topic = f"{data_prefix}/availability"
@@ -152,6 +172,20 @@ def build_discovery_payloads(
             payload["icon"] = icon
         return disc_topic, json.dumps(payload)
 
+    # Without PW_ENERGY nothing is published on the energy topics, so the
+    # sensors would only ever show "unknown" in HA
+    energy_sensors = [
+        sensor(
+            f"energy_{name}", _ENERGY_NAMES[name],
+            f"{data_prefix}/energy/{name}",
+            unit="kWh",
+            device_class="energy",
+            state_class="total_increasing",
+            icon="mdi:lightning-bolt",
+        )
+        for name in COUNTERS
+    ] if settings.energy else []
+
     results: list[tuple[str, str]] = [
         # --- Numeric sensors ---
         sensor(
@@ -200,6 +234,8 @@ def build_discovery_payloads(
             state_class="measurement",
             icon="mdi:battery-lock",
         ),
+        # --- Energy sensors (kWh today) ---
+        *energy_sensors,
         # --- Text sensors ---
         sensor(
             "grid_status", "Grid Status",
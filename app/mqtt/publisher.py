@@ -42,6 +42,13 @@ Topic layout
     {prefix}/{gateway_id}/online          str    — "true" | "false"
     {prefix}/{gateway_id}/aggregates      JSON   — full aggregates dict
     {prefix}/{gateway_id}/status          JSON   — summary dict
+    {prefix}/{gateway_id}/energy/{name}   float  — kWh today (solar_produced,
+                                                   home_consumed, grid_imported,
+                                                   grid_exported, battery_charged,
+                                                   battery_discharged)
+    {prefix}/{gateway_id}/energy          JSON   — day/month/total kWh counters
+    {prefix}/aggregate/energy             JSON   — counters summed over all gateways
+                                                   (once per poll cycle)
     {prefix}/{gateway_id}/availability    str    — "online" | "offline" (LWT)
 """
 import asyncio
@@ -63,6 +70,7 @@ class MqttPublisher:
         self._shutdown: bool = False
         self._discovery_sent: Set[str] = set()   # gateway IDs with discovery published
         self._backoff: int = 2           # current reconnect backoff in seconds
+        self._energy_cycle: Set[str] = set()     # gateways published since the last aggregate
 
     # ------------------------------------------------------------------
     # Public API
@@ -262,6 +270,24 @@ class MqttPublisher:
                     f"{prefix}/status", json.dumps(summary), retain, qos
                 )
 
+                # Energy counters (kWh) integrated from every poll
+                from app.core.energy import energy_meter  # late import
+                energy = energy_meter.get(gateway_id)
+                if energy is not None:
+                    for name, value in energy["day"].items():
+                        await self._safe_publish(
+                            f"{prefix}/energy/{name}", f"{value:.3f}", retain, qos
+                        )
+                    await self._safe_publish(
+                        f"{prefix}/energy", json.dumps(energy), retain, qos
+                    )
+                    if self._energy_cycle_done(gateway_id, energy_meter.gateway_ids()):
+                        await self._safe_publish(
+                            f"{settings.mqtt_topic_prefix}/aggregate/energy",
+                            json.dumps(energy_meter.aggregate()),
+                            retain, qos,
+                        )
+
             # Mark availability as online
             await self._safe_publish(
                 f"{prefix}/availability", "online", retain, qos
@@ -275,6 +301,24 @@ class MqttPublisher:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _energy_cycle_done(self, gateway_id: str, gateway_ids) -> bool:
+        """True when {prefix}/aggregate/energy is due after this gateway's publish.
+
+        Gateways are polled on staggered schedules, so there is no single point
+        where all of them have been published. A publish cycle ends once every
+        gateway with energy counters has published since the last aggregate, or
+        when a gateway comes round again first (e.g. another one is in backoff).
+        The aggregate then goes out once per cycle rather than once per gateway.
+        """
+        if gateway_id in self._energy_cycle:
+            self._energy_cycle = {gateway_id}
+            return True
+        self._energy_cycle.add(gateway_id)
+        if self._energy_cycle.issuperset(gateway_ids):
+            self._energy_cycle.clear()
+            return True
+        return False
+
     async def _safe_publish(
         self, topic: str, payload: str, retain: bool, qos: int
     ) -> None:
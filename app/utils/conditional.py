@@ -0,0 +1,143 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for cache-backed routes.
+
+Scrapers read the same endpoints every few seconds while the underlying data
+only changes once per poll. Routes marked with @snapshot_cached get validators
+derived from the gateway snapshot(s) they are served from:
+
+    ETag:          strong tag over (gateway id, snapshot version, data timestamp)
+                   for every gateway in the route's scope
+    Last-Modified: newest PowerwallData.timestamp in the scope
+
+A request whose If-None-Match (or, without it, If-Modified-Since) matches gets
+a bodiless 304 before the route handler runs, so nothing is built or encoded.
+
+Usage
+-----
+The router must use SnapshotRoute as its route class, and the marker goes
+*below* the route decorator (it must be applied before the route is created):
+
+    router = APIRouter(route_class=SnapshotRoute)
+
+    @router.get("/vitals")
+    @snapshot_cached(lambda request: [get_default_gateway()])
+    async def get_vitals():
+        ...
+
+Routes without the marker are not affected.
+"""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.gateway_manager import gateway_manager
+
+GatewayScope = Callable[[Request], Iterable[str]]
+
+
+def snapshot_cached(scope: GatewayScope):
+    """Mark a route as served from the cached snapshots of the scoped gateways.
+
+    Args:
+        scope: Returns the gateway ids the response is built from. May raise
+            HTTPException (e.g. no gateways configured); the request is then
+            handled without conditional processing.
+    """
+
+    def decorator(endpoint):
+        endpoint.__snapshot_scope__ = scope
+        return endpoint
+
+    return decorator
+
+
+def all_gateways(request: Request) -> Iterable[str]:
+    """Scope for routes built from every configured gateway."""
+    return list(gateway_manager.gateways)
+
+
+def path_gateway(request: Request) -> Iterable[str]:
+    """Scope for routes addressing one gateway via the {gateway_id} path parameter."""
+    return [request.path_params["gateway_id"]]
+
+
+def snapshot_validators(gateway_ids: Iterable[str]) -> Optional[Tuple[str, Optional[float]]]:
+    """Compute (etag, last_modified) for the current snapshots of gateway_ids.
+
+    Returns None when a gateway is unknown (the handler decides how to fail)
+    or the scope is empty.
+    """
+    parts = []
+    last_modified = None
+    for gateway_id in gateway_ids:
+        status = gateway_manager.get_gateway(gateway_id)
+        if status is None:
+            return None
+        timestamp = status.data.timestamp if status.data else None
+        parts.append(
+            f"{gateway_id}:{gateway_manager.get_snapshot_version(gateway_id)}:{timestamp!r}"
+        )
+        if timestamp and (last_modified is None or timestamp > last_modified):
+            last_modified = timestamp
+
+    if not parts:
+        return None
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=10).hexdigest()
+    return f'"{digest}"', last_modified
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= since
+    return False
+
+
+class SnapshotRoute(APIRoute):
+    """APIRoute adding ETag/Last-Modified and 304 handling to @snapshot_cached routes."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        scope: Optional[GatewayScope] = getattr(self.endpoint, "__snapshot_scope__", None)
+        if scope is None:
+            return handler
+
+        async def conditional_handler(request: Request) -> Response:
+            if request.method not in ("GET", "HEAD"):
+                return await handler(request)
+            try:
+                validators = snapshot_validators(scope(request))
+            except HTTPException:
+                validators = None
+            if validators is None:
+                return await handler(request)
+
+            etag, last_modified = validators
+            headers = {"ETag": etag}
+            if last_modified:
+                headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+            if is_not_modified(request, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+
+            response = await handler(request)
+            if response.status_code == 200:
+                response.headers.update(headers)
+            return response
+
+        return conditional_handler
@@ -0,0 +1,68 @@
+"""JSON-Patch (RFC 6902) style diffs between two JSON-compatible documents.
+
+Used by the delta websocket protocol to send only what changed between two
+snapshots of a stream. Objects are diffed key by key; lists and scalars that
+differ are replaced as a whole (live data lists are short and change
+wholesale, so element-wise list diffs would not pay off).
+"""
+from typing import Any, Dict, List
+
+
+def _escape(key: Any) -> str:
+    """Escape an object key for use in a JSON Pointer (RFC 6901)."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(old: Any, new: Any) -> bool:
+    # 1 == 1.0 == True in Python, but they encode differently
+    return type(old) is type(new) and old == new
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Return the add/remove/replace operations turning ``old`` into ``new``."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if _same(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply operations produced by diff() and return the patched document.
+
+    Objects along the paths are modified in place; a replace of the root
+    ("" path) returns the new value.
+    """
+    for op in ops:
+        if op["path"] == "":
+            document = op["value"]
+            continue
+
+        tokens = [_unescape(token) for token in op["path"].split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        key = tokens[-1]
+        if isinstance(parent, list):
+            key = int(key)
+
+        if op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = op["value"]
+    return document
@@ -1,9 +1,14 @@
 """Pytest configuration and fixtures."""
 import pytest
-from unittest.mock import Mock
+from unittest.mock import DEFAULT, Mock
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api import sse
+from app.core.energy import energy_meter
 from app.core.gateway_manager import gateway_manager
+from app.core.history import history_store
+from app.core.response_cache import response_cache
+from app.core.views import materialized_views
 
 
 @pytest.fixture(autouse=True)
@@ -14,12 +19,48 @@ def reset_gateway_manager():
     gateway_manager.cache.clear()
     gateway_manager._cloud_control = None
     gateway_manager._executor = None
+    gateway_manager._cloud_executor = None
+    gateway_manager._control_executor = None
+    gateway_manager._poll_semaphores.clear()
+    gateway_manager._poll_cadence.clear()
+    gateway_manager._field_last_fetch.clear()
+    gateway_manager._last_successful_data.clear()
+    gateway_manager._warm_start_data.clear()
+    gateway_manager._poll_queue.clear()
+    gateway_manager._async_transports.clear()
+    gateway_manager._thread_counts.clear()
+    gateway_manager._snapshot_versions.clear()
+    gateway_manager._snapshot_condition = None
+    gateway_manager._scheduler_stats = gateway_manager._new_scheduler_stats()
+    response_cache.clear()
+    materialized_views.clear()
+    sse._events.clear()
+    history_store.clear()
+    energy_meter.clear()
     yield
     gateway_manager.gateways.clear()
     gateway_manager.connections.clear()
     gateway_manager.cache.clear()
     gateway_manager._cloud_control = None
     gateway_manager._executor = None
+    gateway_manager._cloud_executor = None
+    gateway_manager._control_executor = None
+    gateway_manager._poll_semaphores.clear()
+    gateway_manager._poll_cadence.clear()
+    gateway_manager._field_last_fetch.clear()
+    gateway_manager._last_successful_data.clear()
+    gateway_manager._warm_start_data.clear()
+    gateway_manager._poll_queue.clear()
+    gateway_manager._async_transports.clear()
+    gateway_manager._thread_counts.clear()
+    gateway_manager._snapshot_versions.clear()
+    gateway_manager._snapshot_condition = None
+    gateway_manager._scheduler_stats = gateway_manager._new_scheduler_stats()
+    response_cache.clear()
+    materialized_views.clear()
+    sse._events.clear()
+    history_store.clear()
+    energy_meter.clear()
 
 
 @pytest.fixture
@@ -80,6 +121,12 @@ def mock_pypowerwall():
     mock.get_time_remaining.return_value = 8.5
     mock.get_mode.return_value = "self_consumption"
     mock.grid_status.return_value = "UP"
+    # Paths the poll loop reads directly; other paths return the aggregates
+    payloads = {
+        "/api/operation": {"real_mode": "self_consumption", "backup_reserve_percent": 24},
+        "/api/system_status/grid_status": {"grid_status": "SystemGridConnected"},
+    }
+    mock.poll.side_effect = lambda path, *args, **kwargs: payloads.get(path, DEFAULT)
     mock.system_status.return_value = {
         "nominal_full_pack_energy": 13500,
         "nominal_energy_remaining": 11547,
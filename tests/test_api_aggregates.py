@@ -217,3 +217,66 @@ def test_gateway_port_field_stored(mock_gateway_manager, mock_pypowerwall):
 def test_gateway_port_none_by_default(connected_gateway):
     """Gateway port defaults to None."""
     assert connected_gateway.gateway.port is None
+
+
+def test_aggregate_conditional_get(client, connected_gateway):
+    """Test aggregate routes honor If-None-Match across all gateways."""
+    etag = client.get("/api/aggregate/power").headers["etag"]
+    assert client.get("/api/aggregate/power", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/aggregate/power", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_aggregate_energy(client, two_gateways):
+    """Test /api/aggregate/energy sums the counters of all gateways."""
+    import time
+    from app.core.energy import energy_meter
+
+    now = time.time()
+    for gateway_id, status in two_gateways.items():
+        for offset in (0.0, 60.0):
+            data = status.data.model_copy(update={"timestamp": now - 60 + offset})
+            energy_meter.record(gateway_id, data, status.gateway.timezone)
+
+    response = client.get("/api/aggregate/energy")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["gateways"] == ["home", "south"]
+    home = energy_meter.get("home")["total"]["home_consumed"]
+    assert home > 0
+    assert data["total"]["home_consumed"] == pytest.approx(2 * home, abs=1e-5)
+
+
+def test_aggregate_includes_warm_start_data(client, two_gateways, monkeypatch):
+    """Test warm-start data counts within PW_CACHE_TTL, other offline data does not."""
+    import time
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "cache_ttl", 60)
+    south = two_gateways["south"]
+    data = south.data.model_copy(update={"timestamp": time.time() - 10})
+    gateway_manager._last_successful_data["south"] = data
+    gateway_manager._warm_start_data["south"] = data
+    gateway_manager._store_status(
+        "south", GatewayStatus(gateway=south.gateway, online=False, error="Initializing...")
+    )
+
+    aggregate = client.get("/api/aggregate/").json()
+    assert aggregate["num_online"] == 1
+    assert aggregate["num_reporting"] == 2
+    assert aggregate["gateways"]["south"]["online"] is False
+    power = data.aggregates["load"]["instant_power"]
+    assert aggregate["total_load_power"] == pytest.approx(2 * power)
+    assert client.get("/api/aggregate/soe").json()["num_gateways"] == 1  # Online only
+
+    # A gateway that went offline after polling is left out, even within PW_CACHE_TTL
+    gateway_manager._last_successful_data["south"] = data.model_copy()
+    gateway_manager._store_status("south", gateway_manager.cache["south"])
+    aggregate = client.get("/api/aggregate/").json()
+    assert aggregate["num_reporting"] == 1
+    assert aggregate["total_load_power"] == pytest.approx(power)
+
+    # Past PW_CACHE_TTL warm-start data drops out too
+    gateway_manager._last_successful_data["south"] = data
+    monkeypatch.setattr(settings, "cache_ttl", 5)
+    gateway_manager._store_status("south", gateway_manager.cache["south"])
+    assert client.get("/api/aggregate/").json()["num_reporting"] == 1
@@ -56,3 +56,61 @@ def test_get_gateway_aggregates(client, connected_gateway):
     data = response.json()
     assert "site" in data
     assert "solar" in data
+
+
+def test_get_gateway_conditional(client, connected_gateway, mock_gateway_manager):
+    """Test gateway status ETag follows the snapshot version."""
+    etag = client.get("/api/gateways/test-gateway").headers["etag"]
+    assert client.get("/api/gateways/test-gateway", headers={"If-None-Match": etag}).status_code == 304
+
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    response = client.get("/api/gateways/test-gateway", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_next_snapshot_long_poll(client, connected_gateway, mock_gateway_manager):
+    """Test /next returns a newer snapshot at once and 204 when none arrives."""
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+
+    response = client.get("/api/gateways/test-gateway/next?after=0")
+    assert response.status_code == 200
+    assert response.json()["version"] == version
+    assert response.json()["status"]["online"] is True
+
+    response = client.get(f"/api/gateways/test-gateway/next?after={version}&timeout=0.05")
+    assert response.status_code == 204
+    assert response.headers["x-snapshot-version"] == str(version)
+
+    assert client.get("/api/gateways/missing/next").status_code == 404
+
+
+def test_next_snapshot_after_restart(client, connected_gateway, mock_gateway_manager):
+    """Test an ``after`` ahead of the current version (pre-restart) is stale."""
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+
+    response = client.get(f"/api/gateways/test-gateway/next?after={version + 1000}&timeout=5")
+    assert response.status_code == 200
+    assert response.json()["version"] == version
+
+
+def test_get_gateway_energy(client, connected_gateway):
+    """Test per-gateway energy counters and 404 for unknown gateways."""
+    import time
+    from app.core.energy import energy_meter
+
+    assert client.get("/api/gateways/test-gateway/energy").json() == {}
+    now = time.time()
+    for offset in (0.0, 60.0):
+        data = connected_gateway.data.model_copy(update={"timestamp": now - 60 + offset})
+        energy_meter.record("test-gateway", data, connected_gateway.gateway.timezone)
+
+    response = client.get("/api/gateways/test-gateway/energy")
+    assert response.status_code == 200
+    counters = response.json()
+    assert counters["timezone"] == connected_gateway.gateway.timezone
+    assert set(counters) >= {"day", "month", "total"}
+    assert counters["total"]["home_consumed"] > 0
+    assert client.get("/api/gateways/nonexistent/energy").status_code == 404
@@ -0,0 +1,109 @@
+"""Tests for the poll history API endpoints."""
+import time
+
+from app.core.history import history_store
+from app.models.gateway import PowerwallData
+
+
+def test_history_unknown_gateway(client, connected_gateway):
+    """Test /api/history/{id} returns 404 for unknown gateways."""
+    assert client.get("/api/history/missing").status_code == 404
+
+
+def test_history_raw_samples(client, connected_gateway):
+    """Test a short range is answered with raw samples."""
+    now = time.time()
+    for n in range(3):
+        history_store.record("test-gateway", PowerwallData(soe=80.0 + n, timestamp=now - 30 + n))
+
+    response = client.get("/api/history/test-gateway", params={"start": now - 60, "end": now})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resolution"] == "raw"
+    assert body["points"] == 3
+    assert body["data"]["soe"] == [80.0, 81.0, 82.0]
+
+
+def test_history_resolution_selects_rollup(client, connected_gateway):
+    """Test ?resolution= reads the matching rollup tier."""
+    body = client.get("/api/history/test-gateway", params={"resolution": "15m"}).json()
+    assert body["resolution"] == "15m"
+    assert body["interval"] == 900
+    assert "soe_mean" in body["data"]
+
+
+def test_history_invalid_parameters(client, connected_gateway):
+    """Test invalid resolution and inverted ranges are rejected."""
+    assert client.get("/api/history/test-gateway?resolution=soon").status_code == 400
+    assert client.get("/api/history/test-gateway?start=10&end=5").status_code == 400
+
+
+def test_history_points_downsampling(client, connected_gateway):
+    """Test ?points= returns at most that many LTTB points per series."""
+    now = time.time()
+    for n in range(600):
+        soe = 90.0 if n == 321 else 50.0
+        history_store.record("test-gateway", PowerwallData(soe=soe, timestamp=now - 600 + n))
+
+    body = client.get(
+        "/api/history/test-gateway", params={"start": now - 600, "end": now, "points": 50}
+    ).json()
+    assert body["resolution"] == "raw"
+    assert body["downsample"] == "lttb"
+    assert body["points"] == 50
+    assert len(body["data"]["soe"]["value"]) == 50
+    assert 90.0 in body["data"]["soe"]["value"]
+    assert "grid_status" not in body["data"]
+
+    assert client.get("/api/history/test-gateway?points=2").status_code == 422
+
+
+def test_history_export_ndjson_and_csv(client, connected_gateway):
+    """Test the streaming NDJSON and CSV exports of raw samples."""
+    import json
+
+    now = time.time()
+    for n in range(5):
+        history_store.record(
+            "test-gateway", PowerwallData(soe=80.0 + n, grid_status="UP", timestamp=now - 10 + n)
+        )
+    params = {"start": now - 60, "end": now}
+
+    response = client.get("/api/history/test-gateway.ndjson", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-history-resolution"] == "raw"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["soe"] for row in rows] == [80.0, 81.0, 82.0, 83.0, 84.0]
+    assert rows[0]["grid_status"] == "UP"
+    assert rows[0]["site"] is None
+
+    response = client.get("/csv/history", params=params)
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "timestamp,site,battery,load,solar,soe,freq,reserve,grid_status"
+    assert len(lines) == 6
+    assert lines[1].split(",")[5] == "80.0"
+
+    assert client.get("/api/history/missing.ndjson").status_code == 404
+    assert client.get("/csv/history", params={"gateway_id": "missing"}).status_code == 404
+
+
+def test_history_rejects_non_finite_range(client, connected_gateway):
+    """Test nan/inf range bounds are rejected instead of looping forever."""
+    for params in ({"end": "nan"}, {"start": "-inf"}, {"end": "inf"}):
+        assert client.get("/api/history/test-gateway", params=params).status_code == 400
+        assert client.get("/api/history/test-gateway.ndjson", params=params).status_code == 400
+        assert client.get("/csv/history", params=params).status_code == 400
+
+
+def test_history_export_skips_empty_stretches(client, connected_gateway):
+    """Test exporting from the epoch jumps straight to the stored samples."""
+    now = time.time()
+    for timestamp in (now - 7200, now - 7199, now - 7198, now - 10, now - 9, now - 8):
+        history_store.record("test-gateway", PowerwallData(soe=50.0, timestamp=timestamp))
+
+    started = time.perf_counter()
+    response = client.get("/api/history/test-gateway.ndjson", params={"start": 0, "end": now})
+    assert time.perf_counter() - started < 1.0
+    assert len(response.text.splitlines()) == 6
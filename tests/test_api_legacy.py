@@ -191,6 +191,33 @@ def test_endpoint_without_gateway(client, mock_gateway_manager):
     assert response.status_code == 503
 
 
+def test_response_bytes_encoded_once_per_snapshot(client, connected_gateway):
+    """Test cached views are encoded once and re-encoded only for a new snapshot."""
+    from app.core.response_cache import response_cache
+
+    first = client.get("/vitals")
+    second = client.get("/vitals")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.content == second.content
+    assert response_cache.misses == 1
+    assert response_cache.hits == 1
+
+    # A new poll stores a new PowerwallData object
+    new_data = connected_gateway.data.model_copy(update={"soe": 42.0, "timestamp": 1234567895.0})
+    connected_gateway.data = new_data
+    assert client.get("/soe").json() == {"percentage": 42.0}
+    assert client.get("/vitals").json() == connected_gateway.data.vitals
+    assert response_cache.misses == 3
+
+
+def test_response_cache_empty_default(client, connected_gateway):
+    """Test cached views return their safe default before the first poll."""
+    connected_gateway.data = None
+    assert client.get("/alerts").json() == []
+    assert client.get("/soe").json() == {"percentage": None}
+
+
 # ---------------------------------------------------------------------------
 # /control/<path> endpoint tests (cloud control routing)
 # ---------------------------------------------------------------------------
@@ -454,7 +481,34 @@ def test_api_operation_defaults_when_neither_mode_available(client, connected_ga
 def test_api_operation_all_mode_values(client, connected_gateway):
     """Test /api/operation correctly returns each valid mode string."""
     for mode in ("self_consumption", "backup", "autonomous"):
-        connected_gateway.data.mode = mode
+        # Each poll stores a new snapshot (cached bodies are per snapshot)
+        connected_gateway.data = connected_gateway.data.model_copy(update={"mode": mode})
         response = client.get("/api/operation")
         assert response.status_code == 200
         assert response.json()["real_mode"] == mode
+
+
+def test_conditional_get_returns_304(client, connected_gateway):
+    """Test cache-backed routes send validators and honor conditional requests."""
+    response = client.get("/aggregates")
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"] == "Fri, 13 Feb 2009 23:31:30 GMT"
+
+    cached = client.get("/aggregates", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    since = client.get("/pod", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert since.status_code == 304
+
+    # A new snapshot changes the validators
+    connected_gateway.data = connected_gateway.data.model_copy(update={"timestamp": 1234567895.0})
+    fresh = client.get("/aggregates", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+
+
+def test_conditional_get_skips_uncached_routes(client, connected_gateway):
+    """Test routes that are not served from the snapshot get no validators."""
+    assert "etag" not in client.get("/stats").headers
@@ -0,0 +1,79 @@
+"""Tests for Server-Sent Events streaming endpoints."""
+import asyncio
+
+import pytest
+
+from app.api import sse
+
+
+class FakeRequest:
+    """Minimal Request stand-in for driving the event generator directly."""
+
+    def __init__(self, last_event_id=None):
+        self.headers = {"last-event-id": last_event_id} if last_event_id else {}
+        self.query_params = {}
+
+    async def is_disconnected(self):
+        return False
+
+
+async def next_event(events, timeout=1.0):
+    return await asyncio.wait_for(events.__anext__(), timeout)
+
+
+def test_sse_gateway_unknown(client, connected_gateway):
+    """Test /sse/gateway/{id} returns 404 for unknown gateways."""
+    response = client.get("/sse/gateway/missing")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sse_sends_current_event_then_updates(connected_gateway, mock_gateway_manager):
+    """Test the current snapshot is sent first and each poll pushes a new event."""
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+    events = sse.event_stream(FakeRequest(), "gateway/test-gateway", "test-gateway")
+    first = await next_event(events)
+    assert first.startswith(b"id: %s-%d\nevent: update\ndata: {" % (sse.BOOT_ID.encode(), version))
+    assert b'"soe":85.5' in first
+
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    await mock_gateway_manager._notify_snapshot()
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+    assert (await next_event(events)).startswith(b"id: %s-%d\n" % (sse.BOOT_ID.encode(), version))
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sse_resume_skips_seen_version(monkeypatch, connected_gateway, mock_gateway_manager):
+    """Test Last-Event-ID at the current version only waits for newer data."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "sse_heartbeat", 0.01)
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+
+    event_id = f"{sse.BOOT_ID}-{version}"
+    events = sse.event_stream(FakeRequest(event_id), "gateway/test-gateway", "test-gateway")
+    assert await next_event(events) == sse.KEEPALIVE
+    await events.aclose()
+
+    # An older id gets the current snapshot straight away
+    older = f"{sse.BOOT_ID}-{version - 1}"
+    events = sse.event_stream(FakeRequest(older), "gateway/test-gateway", "test-gateway")
+    assert (await next_event(events)).startswith(f"id: {event_id}\n".encode())
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sse_resume_from_another_process_is_stale(connected_gateway, mock_gateway_manager):
+    """Test an id with the current version but another boot id gets the snapshot."""
+    version = mock_gateway_manager.get_snapshot_version("test-gateway")
+    for stale in (f"0badc0de-{version}", str(version)):
+        events = sse.event_stream(FakeRequest(stale), "gateway/test-gateway", "test-gateway")
+        assert (await next_event(events)).startswith(f"id: {sse.BOOT_ID}-{version}\n".encode())
+        await events.aclose()
+
+
+def test_sse_events_encoded_once(connected_gateway):
+    """Test every client of a stream shares the same encoded event."""
+    assert sse.encode_event("aggregate")[1] is sse.encode_event("aggregate")[1]
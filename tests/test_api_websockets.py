@@ -0,0 +1,402 @@
+"""Tests for WebSocket streaming endpoints."""
+import asyncio
+
+import pytest
+
+from app.api import websockets
+
+
+def test_ws_aggregate_sends_frame_on_connect(client, connected_gateway):
+    """Test /ws/aggregate sends the current aggregate as soon as it connects."""
+    with client.websocket_connect("/ws/aggregate") as ws:
+        data = ws.receive_json()
+    assert data["total_battery_percent"] == 85.5
+    assert data["num_online"] == 1
+
+
+def test_ws_gateway_unknown(client, connected_gateway):
+    """Test /ws/gateway/{id} reports unknown gateways."""
+    with client.websocket_connect("/ws/gateway/missing") as ws:
+        assert ws.receive_json() == {"error": "Gateway not found"}
+
+
+class FakeSocket:
+    """Minimal WebSocket stand-in recording sent text frames."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+class StalledSocket(FakeSocket):
+    """Socket whose sends never complete (a client that stopped reading)."""
+
+    def __init__(self):
+        super().__init__()
+        self.closed = None
+
+    async def send_text(self, text):
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+async def drain():
+    """Let the per-client writer tasks flush their queues."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_hub_encodes_once_per_stream(monkeypatch, connected_gateway):
+    """Test a published frame is built once and shared by all subscribers."""
+    built = []
+
+    def fake_build_payload(stream):
+        built.append(stream)
+        return {"stream": stream}
+
+    monkeypatch.setattr(websockets, "build_payload", fake_build_payload)
+
+    hub = websockets.ConnectionManager()
+    sockets = [FakeSocket() for _ in range(3)]
+    for ws in sockets:
+        await hub.connect(ws, "aggregate")
+    assert built == ["aggregate"]  # Later subscribers reuse the cached frame
+
+    await hub.publish("aggregate")
+    await drain()
+    assert built == ["aggregate", "aggregate"]
+    assert all(ws.sent == ['{"stream":"aggregate"}'] * 2 for ws in sockets)
+
+    for ws in sockets:
+        hub.disconnect(ws)
+    assert hub.subscriptions == {}
+    assert hub._hub_task is None
+
+
+@pytest.mark.asyncio
+async def test_hub_pushes_on_poll(monkeypatch, connected_gateway, mock_gateway_manager):
+    """Test frames go out when a poll stores data, only for affected streams."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_heartbeat", 0)
+    hub = websockets.ConnectionManager()
+    aggregate, gateway, other = FakeSocket(), FakeSocket(), FakeSocket()
+    await hub.connect(aggregate, "aggregate")
+    await hub.connect(gateway, "gateway/test-gateway")
+    await hub.connect(other, "gateway/other")
+    await asyncio.sleep(0)
+
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    await mock_gateway_manager._notify_snapshot()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert len(aggregate.sent) == 2
+    assert len(gateway.sent) == 2
+    assert len(other.sent) == 1  # Unchanged stream is not resent
+
+    for ws in (aggregate, gateway, other):
+        hub.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_hub_heartbeat_resends_frames(monkeypatch, connected_gateway):
+    """Test the current frame is resent when no poll completes in time."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_heartbeat", 0.01)
+    hub = websockets.ConnectionManager()
+    ws = FakeSocket()
+    await hub.connect(ws, "aggregate")
+    await asyncio.sleep(0.05)
+    hub.disconnect(ws)
+
+    assert len(ws.sent) >= 2
+
+
+@pytest.mark.asyncio
+async def test_hub_delta_frames(connected_gateway, mock_gateway_manager):
+    """Test delta subscribers get a snapshot, then shared JSON-Patch frames."""
+    import json
+    from app.utils.json_diff import apply_patch
+
+    hub = websockets.ConnectionManager()
+    full, delta_a, delta_b = FakeSocket(), FakeSocket(), FakeSocket()
+    await hub.connect(full, "gateway/test-gateway")
+    await hub.connect(delta_a, "gateway/test-gateway", websockets.DELTA)
+    await hub.connect(delta_b, "gateway/test-gateway", websockets.DELTA)
+
+    await drain()
+    snapshot = json.loads(delta_a.sent[0])
+    assert snapshot["type"] == "snapshot"
+    document = snapshot["data"]
+
+    connected_gateway.data = connected_gateway.data.model_copy(update={"soe": 42.0})
+    mock_gateway_manager._store_status("test-gateway", connected_gateway)
+    await hub.publish("gateway/test-gateway")
+    await drain()
+
+    patch = json.loads(delta_a.sent[1])
+    assert delta_a.sent[1] is delta_b.sent[1]  # Encoded once, shared
+    assert patch["type"] == "patch"
+    assert patch["base"] == snapshot["version"]
+    assert patch["ops"] == [{"op": "replace", "path": "/data/soe", "value": 42.0}]
+    assert apply_patch(document, patch["ops"]) == json.loads(full.sent[1])
+
+    for ws in (full, delta_a, delta_b):
+        hub.disconnect(ws)
+
+
+def test_ws_delta_negotiated_by_query(client, connected_gateway):
+    """Test ?delta=yes selects the delta protocol."""
+    with client.websocket_connect("/ws/aggregate?delta=yes") as ws:
+        frame = ws.receive_json()
+    assert frame["type"] == "snapshot"
+    assert frame["data"]["total_battery_percent"] == 85.5
+
+
+@pytest.mark.asyncio
+async def test_slow_client_keeps_latest_frames(monkeypatch, connected_gateway):
+    """Test a stalled client's queue stays bounded and drops the oldest frames."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_queue_size", 2)
+    monkeypatch.setattr(settings, "ws_send_timeout", 0)
+    hub = websockets.ConnectionManager()
+    slow, fast = StalledSocket(), FakeSocket()
+    await hub.connect(slow, "aggregate")
+    await hub.connect(fast, "aggregate")
+    await drain()  # The slow client's first frame is now stuck in flight
+
+    for n in range(5):
+        await hub.broadcast({"n": n})
+        await drain()
+
+    client = hub.clients[slow]
+    assert [frame for _, frame in client.queue] == ['{"n":3}', '{"n":4}']
+    assert client.dropped == 3
+    assert len(fast.sent) == 6  # Fast clients are not held back
+
+    stats = hub.get_stats()
+    depths = {c["id"]: c["queue_depth"] for c in stats["clients"]}
+    assert depths[client.id] == 2
+    assert depths[hub.clients[fast].id] == 0
+
+    for ws in (slow, fast):
+        hub.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_delta_client_resyncs_after_drop(monkeypatch, connected_gateway, mock_gateway_manager):
+    """Test a delta client that loses a patch is sent a fresh snapshot."""
+    import json
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_queue_size", 1)
+    hub = websockets.ConnectionManager()
+    ws = FakeSocket()
+    await hub.connect(ws, "gateway/test-gateway", websockets.DELTA)
+
+    # Two updates queue before the writer runs; the first patch is dropped
+    for soe in (40.0, 41.0):
+        connected_gateway.data = connected_gateway.data.model_copy(update={"soe": soe})
+        mock_gateway_manager._store_status("test-gateway", connected_gateway)
+        await hub.publish("gateway/test-gateway")
+    await drain()
+
+    frames = [json.loads(text) for text in ws.sent]
+    assert [frame["type"] for frame in frames] == ["snapshot"]
+    assert frames[0]["data"]["data"]["soe"] == 41.0
+    assert hub.clients[ws].dropped == 2
+
+    hub.disconnect(ws)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_evicted(monkeypatch, connected_gateway):
+    """Test a client is disconnected after repeated send timeouts."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_send_timeout", 0.01)
+    monkeypatch.setattr(settings, "ws_evict_after", 2)
+    hub = websockets.ConnectionManager()
+    ws = StalledSocket()
+    await hub.connect(ws, "aggregate")
+    await hub.broadcast({"n": 1})
+    await asyncio.sleep(0.1)
+
+    assert ws not in hub.clients
+    assert hub.subscriptions == {}
+    assert hub.evicted == 1
+    assert ws.closed == 1013
+
+
+def test_ws_clients_endpoint(client, connected_gateway):
+    """Test GET /ws/clients lists connected clients."""
+    with client.websocket_connect("/ws/aggregate") as ws:
+        ws.receive_json()
+        data = client.get("/ws/clients").json()
+    assert data["connections"] == 1
+    assert data["clients"][0]["streams"] == ["aggregate"]
+    assert data["clients"][0]["sent"] == 1
+
+
+def test_ws_stream_multiplexed_views(client, connected_gateway):
+    """Test /ws/stream serves several gateway views and the aggregate on one socket."""
+    with client.websocket_connect("/ws/stream") as ws:
+        ws.send_json({"action": "subscribe", "gateway": "test-gateway", "views": ["soe", "power"]})
+        assert ws.receive_json() == {
+            "type": "subscribed",
+            "streams": ["gateway/test-gateway/soe", "gateway/test-gateway/power"],
+        }
+        soe = ws.receive_json()
+        power = ws.receive_json()
+        ws.send_json({"action": "subscribe", "view": "aggregate", "fields": ["num_online"]})
+        ws.receive_json()
+        aggregate = ws.receive_json()
+
+    assert soe["type"] == "update"
+    assert soe["stream"] == "gateway/test-gateway/soe"
+    assert soe["data"] == {"soe": 85.5, "timestamp": 1234567890.0}
+    assert set(power["data"]) == {"site", "battery", "load", "solar", "timestamp"}
+    assert aggregate["stream"] == "aggregate?fields=num_online"
+    assert aggregate["data"] == {"num_online": 1}
+
+
+def test_ws_stream_rejects_bad_messages(client, connected_gateway):
+    """Test /ws/stream answers malformed requests with an error frame."""
+    with client.websocket_connect("/ws/stream") as ws:
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"action": "subscribe", "view": "nope", "gateway": "test-gateway"})
+        assert "unknown view" in ws.receive_json()["error"]
+        ws.send_json({"action": "subscribe", "view": "soe"})
+        assert ws.receive_json()["error"] == "view 'soe' requires a gateway"
+        ws.send_json({"action": "subscribe", "view": "soe", "gateway": "made-up"})
+        assert ws.receive_json()["error"] == "unknown gateway 'made-up'"
+
+
+def test_ws_stream_caps_channels_per_connection(client, connected_gateway, monkeypatch):
+    """Test field masks cannot create more than PW_WS_MAX_CHANNELS streams per socket."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ws_max_channels", 2)
+    with client.websocket_connect("/ws/stream") as ws:
+        for field in ("site", "solar"):
+            ws.send_json({"action": "subscribe", "gateway": "test-gateway",
+                          "view": "power", "fields": [field]})
+            assert ws.receive_json()["type"] == "subscribed"
+            ws.receive_json()
+        ws.send_json({"action": "subscribe", "gateway": "test-gateway",
+                      "view": "power", "fields": ["load"]})
+        reply = ws.receive_json()
+        assert reply["type"] == "error"
+        assert "at most 2" in reply["error"]
+        # Re-subscribing to a held stream is still allowed
+        ws.send_json({"action": "subscribe", "gateway": "test-gateway",
+                      "view": "power", "fields": ["site"]})
+        assert ws.receive_json()["type"] == "subscribed"
+
+
+@pytest.mark.asyncio
+async def test_hub_routes_frames_to_matching_subscribers(connected_gateway, mock_gateway_manager):
+    """Test a view's frame only goes to its subscribers and masks share frames."""
+    import json
+
+    hub = websockets.ConnectionManager()
+    soe_a, soe_b, vitals = FakeSocket(), FakeSocket(), FakeSocket()
+    for ws in (soe_a, soe_b, vitals):
+        await hub.connect(ws, fmt=websockets.MUX)
+    await hub.subscribe(soe_a, "gateway/test-gateway/soe", ["soe"])
+    await hub.subscribe(soe_b, "gateway/test-gateway/soe", ["soe"])
+    await hub.subscribe(vitals, "gateway/test-gateway/vitals")
+    await drain()
+
+    assert soe_a.sent[0] is soe_b.sent[0]  # Same stream and mask: one encoding
+    assert json.loads(soe_a.sent[0])["data"] == {"soe": 85.5}
+    assert len(vitals.sent) == 1
+
+    hub.unsubscribe(vitals, "gateway/test-gateway/vitals")
+    await hub.publish("gateway/test-gateway/soe?fields=soe")
+    await hub.publish("gateway/test-gateway/vitals")
+    await drain()
+    assert len(soe_a.sent) == 2
+    assert len(vitals.sent) == 1
+
+    for ws in (soe_a, soe_b, vitals):
+        hub.disconnect(ws)
+    assert hub.subscriptions == {}
+
+
+def test_ws_unavailable_encoding_rejected(client, connected_gateway):
+    """Test an unknown ?encoding= gets an error frame instead of data."""
+    with client.websocket_connect("/ws/aggregate?encoding=xml") as ws:
+        assert "Unknown encoding 'xml'" in ws.receive_json()["error"]
+
+
+@pytest.mark.asyncio
+async def test_hub_encodes_once_per_encoding(connected_gateway):
+    """Test JSON and MessagePack subscribers each share one encoded frame."""
+    msgpack = pytest.importorskip("msgpack")
+    from app.core import encodings
+
+    hub = websockets.ConnectionManager()
+    text_ws, packed_a, packed_b = FakeSocket(), FakeSocket(), FakeSocket()
+    await hub.connect(text_ws, "aggregate")
+    await hub.connect(packed_a, "aggregate", encoding=encodings.MSGPACK)
+    await hub.connect(packed_b, "aggregate", encoding=encodings.MSGPACK)
+    await drain()
+
+    assert isinstance(text_ws.sent[0], str)
+    assert packed_a.sent[0] is packed_b.sent[0]
+    assert msgpack.unpackb(packed_a.sent[0])["total_battery_percent"] == 85.5
+
+    for ws in (text_ws, packed_a, packed_b):
+        hub.disconnect(ws)
+
+
+def test_binary_encodings_accept_the_same_payloads():
+    """Test msgpack and CBOR both fall back to str() for unsupported values."""
+    msgpack = pytest.importorskip("msgpack")
+    cbor2 = pytest.importorskip("cbor2")
+    from datetime import datetime
+    from decimal import Decimal
+    from app.core import encodings
+
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    payload = {"value": Opaque(), "amount": Decimal("1.5"), "at": datetime(2024, 6, 1, 12, 0)}
+    packed = msgpack.unpackb(encodings.encode(payload, encodings.MSGPACK))
+    cbor = cbor2.loads(encodings.encode(payload, encodings.CBOR))
+    assert packed["value"] == cbor["value"] == "opaque"
+    assert set(packed) == set(cbor) == set(payload)
+
+
+def test_ws_gateway_msgpack_subprotocol(client, connected_gateway):
+    """Test the pw-msgpack subprotocol selects binary frames."""
+    msgpack = pytest.importorskip("msgpack")
+    with client.websocket_connect("/ws/gateway/test-gateway", subprotocols=["pw-msgpack"]) as ws:
+        frame = msgpack.unpackb(ws.receive_bytes())
+    assert frame["data"]["soe"] == 85.5
+
+
+def test_ws_aggregate_cbor_query(client, connected_gateway):
+    """Test ?encoding=cbor selects CBOR delta frames."""
+    cbor2 = pytest.importorskip("cbor2")
+    with client.websocket_connect("/ws/aggregate?encoding=cbor&delta=yes") as ws:
+        frame = cbor2.loads(ws.receive_bytes())
+    assert frame["type"] == "snapshot"
+    assert frame["data"]["num_online"] == 1
@@ -0,0 +1,56 @@
+"""Tests for the async hot-path gateway transport."""
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.core.async_transport import AsyncGatewayTransport, AsyncTransportError
+
+
+def make_transport():
+    client = Mock()
+    client.host = "192.168.91.1"
+    client.auth = {"AuthCookie": "abc", "UserRecord": "def"}
+    client.authmode = "cookie"
+    return AsyncGatewayTransport(client, timeout=5, max_connections=2)
+
+
+def test_from_powerwall_rejects_non_local_modes():
+    """Test TEDAPI/cloud connections are not eligible for the async transport."""
+    pw = Mock()
+    pw.mode = "cloud"
+    assert AsyncGatewayTransport.from_powerwall(pw, timeout=5, max_connections=2) is None
+
+    pw.mode = "local"
+    pw.client = Mock()  # Not a PyPowerwallLocal (e.g. TEDAPI client)
+    assert AsyncGatewayTransport.from_powerwall(pw, timeout=5, max_connections=2) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_of_same_path_are_coalesced(monkeypatch):
+    """Test concurrent requests for one path share a single HTTP request."""
+    transport = make_transport()
+    calls = []
+
+    async def fake_request(path):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return {"real_mode": "self_consumption", "backup_reserve_percent": 24}
+
+    monkeypatch.setattr(transport, "_request", fake_request)
+    results = await asyncio.gather(*(transport.get("/api/operation") for _ in range(3)))
+
+    assert calls == ["/api/operation"]
+    assert all(r["real_mode"] == "self_consumption" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_unsupported_path_and_missing_session_raise():
+    """Test paths outside the hot set and missing auth raise AsyncTransportError."""
+    transport = make_transport()
+    with pytest.raises(AsyncTransportError):
+        await transport.get("/api/system_status")
+
+    transport._client.auth = {}
+    with pytest.raises(AsyncTransportError):
+        await transport.get("/api/operation")
+    await transport.close()
@@ -0,0 +1,130 @@
+"""Tests for the kWh energy counters."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.energy import EnergyMeter, GatewayEnergy, local_date, power_flows
+from app.models.gateway import PowerwallData
+
+TZ = "America/Los_Angeles"
+
+
+def poll(timestamp, site=0.0, battery=0.0, load=0.0, solar=0.0):
+    return PowerwallData(
+        aggregates={
+            "site": {"instant_power": site},
+            "battery": {"instant_power": battery},
+            "load": {"instant_power": load},
+            "solar": {"instant_power": solar},
+        },
+        timestamp=timestamp,
+    )
+
+
+def local(*args, tz=TZ):
+    return datetime(*args, tzinfo=ZoneInfo(tz)).timestamp()
+
+
+def test_power_flows_split_signs():
+    """Test import/export and charge/discharge come from the power's sign."""
+    flows = dict(zip(
+        ("solar", "home", "import", "export", "charge", "discharge"),
+        power_flows(poll(1.0, site=-1500, battery=-800, load=700, solar=3000)),
+    ))
+    assert flows == {
+        "solar": 3000, "home": 700, "import": 0, "export": 1500, "charge": 800, "discharge": 0,
+    }
+
+
+def test_integrates_between_polls(monkeypatch):
+    """Test the trapezoidal rule between consecutive polls, in kWh."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "energy_max_gap", 7200)
+    meter = EnergyMeter()
+    start = local(2024, 6, 1, 12, 0)
+    meter.record("home", poll(start, site=1000, solar=2000), TZ)
+    meter.record("home", poll(start + 3600, site=3000, solar=2000), TZ)
+
+    counters = meter.get("home", now=start + 3600)
+    assert counters["date"] == "2024-06-01"
+    assert counters["day"]["grid_imported"] == pytest.approx(2.0)
+    assert counters["day"]["solar_produced"] == pytest.approx(2.0)
+    assert counters["day"]["grid_exported"] == 0
+    assert counters["month"] == counters["day"]
+    assert counters["total"] == counters["day"]
+
+
+def test_long_gap_and_old_samples_add_nothing():
+    """Test gaps over PW_ENERGY_MAX_GAP and non-increasing timestamps are skipped."""
+    energy = GatewayEnergy(TZ)
+    start = local(2024, 6, 1, 12, 0)
+    flows = (1000.0,) * 6
+    assert not energy.add(start, flows, 300)
+    assert not energy.add(start + 600, flows, 300)
+    assert not energy.add(start + 600, flows, 300)
+    assert energy.add(start + 660, flows, 300)
+    assert energy.counters["total"][0] == pytest.approx(1000 * 60 / 3.6e6)
+
+
+def test_day_and_month_reset_in_gateway_timezone():
+    """Test day/month counters reset at local midnight, total keeps counting."""
+    energy = GatewayEnergy(TZ)
+    flows = (3600.0,) * 6  # 1 Wh per second
+    # 23:59:00 to 00:01:00 local time across a month boundary
+    start = local(2024, 6, 30, 23, 59)
+    energy.add(start, flows, 300)
+    energy.add(start + 30, flows, 300)
+    assert energy.date == "2024-06-30"
+    assert energy.counters["day"][0] == pytest.approx(0.03)
+
+    energy.add(start + 90, flows, 300)
+    assert energy.date == "2024-07-01"
+    assert energy.counters["day"][0] == pytest.approx(0.06)
+    assert energy.counters["month"][0] == pytest.approx(0.06)
+    assert energy.counters["total"][0] == pytest.approx(0.09)
+
+    # Still June 30 in UTC-7 at 06:00 UTC on July 1
+    assert local_date(local(2024, 7, 1, 6, 0, tz="UTC"), TZ) == "2024-06-30"
+
+
+def test_aggregate_sums_gateways():
+    """Test the aggregate counters are the sums over all gateways."""
+    meter = EnergyMeter()
+    start = local(2024, 6, 1, 12, 0)
+    for gateway_id, load in (("home", 1000), ("cabin", 500)):
+        meter.record(gateway_id, poll(start, load=load), TZ)
+        meter.record(gateway_id, poll(start + 180, load=load), TZ)
+
+    aggregate = meter.aggregate(now=start + 180)
+    assert aggregate["gateways"] == ["cabin", "home"]
+    assert aggregate["updated"] == start + 180
+    assert aggregate["total"]["home_consumed"] == pytest.approx(0.075)
+
+
+def test_save_and_load(tmp_path):
+    """Test counters survive a restart and stale days reset on the next poll."""
+    path = str(tmp_path / "energy.json")
+    meter = EnergyMeter()
+    start = local(2024, 6, 1, 12, 0)
+    meter.record("home", poll(start, solar=6000), TZ)
+    meter.record("home", poll(start + 60, solar=6000), TZ)
+    assert meter.save(path) == 1
+
+    restored = EnergyMeter()
+    assert restored.load(path, {"home": TZ, "other": TZ}) == 1
+    assert restored.get("home", now=start + 60)["total"]["solar_produced"] == pytest.approx(0.1)
+
+    # First poll after the restart (next day) starts a new day, adds nothing
+    next_day = local(2024, 6, 2, 8, 0)
+    assert not restored.record("home", poll(next_day, solar=6000), TZ)
+    counters = restored.get("home", now=next_day)
+    assert counters["date"] == "2024-06-02"
+    assert counters["day"]["solar_produced"] == 0
+    assert counters["month"]["solar_produced"] == pytest.approx(0.1)
+
+    # Read after midnight without a poll since
+    assert restored.get("home", now=local(2024, 7, 1, 0, 5))["month"]["solar_produced"] == 0
+
+    assert EnergyMeter().load(str(tmp_path / "missing.json"), {"home": TZ}) == 0
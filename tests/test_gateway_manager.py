@@ -428,3 +428,577 @@ async def test_initialize_cloud_control_exception_is_handled(monkeypatch):
 
     await gm.shutdown()
 
+
+
+@pytest.mark.asyncio
+async def test_polling_fetches_optional_fields_concurrently(
+    mock_gateway_manager, mock_pypowerwall, monkeypatch
+):
+    """Test optional fields are fetched in parallel, capped by PW_POLL_CONCURRENCY."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.config import settings
+    from app.models.gateway import Gateway, GatewayStatus
+
+    monkeypatch.setattr(settings, "poll_concurrency", 2)
+    gateway = Gateway(id="conc-test", name="Concurrency Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["conc-test"] = gateway
+    mock_gateway_manager.connections["conc-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["conc-test"] = GatewayStatus(gateway=gateway, online=False)
+    mock_gateway_manager._executor = ThreadPoolExecutor(max_workers=8)
+    mock_gateway_manager._poll_semaphores.clear()
+
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def slow(value):
+        def call(*args, **kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["now"] -= 1
+            return value
+        return call
+
+    mock_pypowerwall.vitals.side_effect = slow({"TEPOD--1": {}})
+    mock_pypowerwall.strings.side_effect = slow({"A": {}})
+    mock_pypowerwall.temps.side_effect = slow({"TEPOD--1": 20.0})
+    mock_pypowerwall.alerts.side_effect = slow(["GridCodesWrite"])
+
+    try:
+        await mock_gateway_manager._poll_gateway("conc-test")
+    finally:
+        mock_gateway_manager._executor.shutdown(wait=False)
+        mock_gateway_manager._poll_semaphores.clear()
+
+    status = mock_gateway_manager.get_gateway("conc-test")
+    assert status.online is True
+    assert status.data.alerts == ["GridCodesWrite"]
+    assert status.data.strings == {"A": {}}
+    assert in_flight["max"] == 2
+
+
+@pytest.mark.asyncio
+async def test_polling_keeps_last_mode_when_fetch_fails(mock_gateway_manager, mock_pypowerwall):
+    """Test a failed /api/operation read carries the previous operation mode forward."""
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="mode-test", name="Mode Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["mode-test"] = gateway
+    mock_gateway_manager.connections["mode-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["mode-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    await mock_gateway_manager._poll_gateway("mode-test")
+    assert mock_gateway_manager.get_gateway("mode-test").data.mode == "self_consumption"
+
+    poll = mock_pypowerwall.poll.side_effect
+
+    def poll_without_operation(path, *args, **kwargs):
+        if path == "/api/operation":
+            raise Exception("Not available")
+        return poll(path, *args, **kwargs)
+
+    mock_pypowerwall.poll.side_effect = poll_without_operation
+    await mock_gateway_manager._poll_gateway("mode-test")
+
+    status = mock_gateway_manager.get_gateway("mode-test")
+    assert status.online is True
+    assert status.data.mode == "self_consumption"
+
+
+@pytest.mark.asyncio
+async def test_polling_skips_fields_not_due(mock_gateway_manager, mock_pypowerwall):
+    """Test slow-cadence fields are carried forward instead of refetched."""
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="cadence-test", name="Cadence Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["cadence-test"] = gateway
+    mock_gateway_manager.connections["cadence-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["cadence-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    await mock_gateway_manager._poll_gateway("cadence-test")
+    await mock_gateway_manager._poll_gateway("cadence-test")
+
+    # Daily/hourly fields fetched once, every-cycle fields fetched twice
+    assert mock_pypowerwall.version.call_count == 1
+    assert mock_pypowerwall.site_name.call_count == 1
+    assert mock_pypowerwall.level.call_count == 2
+    operation_reads = [
+        c for c in mock_pypowerwall.poll.call_args_list if c.args == ("/api/operation",)
+    ]
+    assert len(operation_reads) == 2
+
+    status = mock_gateway_manager.get_gateway("cadence-test")
+    assert status.data.version == "23.44.0"
+    assert status.data.vitals == mock_pypowerwall.vitals.return_value
+
+
+@pytest.mark.asyncio
+async def test_polling_reads_shared_paths_once(mock_gateway_manager, mock_pypowerwall):
+    """Test fields derived from one API path share a single executor read."""
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="shared-test", name="Shared Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["shared-test"] = gateway
+    mock_gateway_manager.connections["shared-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["shared-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    await mock_gateway_manager._poll_gateway("shared-test")
+
+    paths = [c.args[0] for c in mock_pypowerwall.poll.call_args_list]
+    assert paths.count("/api/operation") == 1
+    assert paths.count("/api/system_status/grid_status") == 1
+    data = mock_gateway_manager.get_gateway("shared-test").data
+    assert data.mode == "self_consumption"
+    assert data.reserve == 20
+    assert data.grid_status == "UP"
+    assert data.grid_status_detail == {"grid_status": "SystemGridConnected"}
+
+
+@pytest.mark.asyncio
+async def test_poll_cadence_override_from_config(mock_gateway_manager):
+    """Test per-gateway poll_cadence from config overrides the defaults."""
+    from app.config import GatewayConfig
+    from app.core.gateway_manager import DEFAULT_POLL_CADENCE
+
+    config = GatewayConfig(
+        id="override",
+        name="Override",
+        host="192.168.91.1",
+        gw_pwd="password123",
+        poll_cadence={"version": 0, "vitals": 5, "bogus": 1},
+    )
+    await mock_gateway_manager.initialize([config], poll_interval=5)
+
+    cadence = mock_gateway_manager._poll_cadence["override"]
+    assert cadence["version"] == 0
+    assert cadence["vitals"] == 5
+    assert cadence["site_name"] == DEFAULT_POLL_CADENCE["site_name"]
+    assert "bogus" not in cadence
+
+    await mock_gateway_manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_slow_gateway_does_not_block_others(mock_gateway_manager, monkeypatch):
+    """Test each gateway is polled on its own cadence, independent of slow peers."""
+    from app.config import settings
+    from app.models.gateway import Gateway
+
+    monkeypatch.setattr(settings, "poll_jitter", 0)
+    polls = {"fast": 0, "slow": 0}
+
+    async def fake_poll(gateway_id):
+        polls[gateway_id] += 1
+        if gateway_id == "slow":
+            await asyncio.sleep(10)
+
+    monkeypatch.setattr(mock_gateway_manager, "_poll_gateway", fake_poll)
+    for gateway_id in polls:
+        mock_gateway_manager.gateways[gateway_id] = Gateway(id=gateway_id, name=gateway_id)
+    mock_gateway_manager._poll_interval = 0.05
+
+    mock_gateway_manager._poll_task = asyncio.create_task(mock_gateway_manager._poll_gateways())
+    await asyncio.sleep(0.3)
+
+    status = mock_gateway_manager.get_scheduler_status()
+    await mock_gateway_manager.shutdown()
+
+    assert polls["fast"] >= 4
+    assert polls["slow"] == 1  # Still in flight - later slots are skipped
+    assert status["running"] is True
+    assert status["queue_depth"] == 2
+    assert status["in_flight"] == 1
+    assert status["skipped_in_flight"] >= 3
+    assert set(status["next_due"]) == {"fast", "slow"}
+
+
+def test_scheduler_status_endpoint(client):
+    """Test the scheduler status endpoint reports queue depth and lag."""
+    response = client.get("/api/scheduler/status")
+    assert response.status_code == 200
+    data = response.json()
+    for key in ("queue_depth", "in_flight", "last_lag", "max_lag", "next_due"):
+        assert key in data
+
+
+@pytest.mark.asyncio
+async def test_polling_uses_async_transport_for_hot_paths(mock_gateway_manager, mock_pypowerwall):
+    """Test hot-path fields come from the async transport, others from the executor."""
+    from app.core.async_transport import AsyncTransportError
+    from app.models.gateway import Gateway, GatewayStatus
+
+    payloads = {
+        "/api/meters/aggregates": mock_pypowerwall.poll.return_value,
+        "/api/system_status/soe": {"percentage": 42.0},
+        "/api/system_status/grid_status": {"grid_status": "SystemIslandedActive"},
+        "/api/operation": {"real_mode": "backup", "backup_reserve_percent": 100},
+    }
+
+    class FakeTransport:
+        async def get(self, path):
+            if path == "/api/operation":
+                raise AsyncTransportError("HTTP 401")
+            return payloads[path]
+
+    gateway = Gateway(id="async-test", name="Async Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["async-test"] = gateway
+    mock_gateway_manager.connections["async-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["async-test"] = GatewayStatus(gateway=gateway, online=False)
+    mock_gateway_manager._async_transports["async-test"] = FakeTransport()
+
+    try:
+        await mock_gateway_manager._poll_gateway("async-test")
+    finally:
+        mock_gateway_manager._async_transports.clear()
+
+    data = mock_gateway_manager.get_gateway("async-test").data
+    assert data.soe == 42.0
+    assert data.grid_status == "DOWN"
+    assert data.grid_status_detail == {"grid_status": "SystemIslandedActive"}
+    mock_pypowerwall.level.assert_not_called()
+    mock_pypowerwall.grid_status.assert_not_called()
+    # /api/operation failed on the transport - fell back to the executor
+    assert data.mode == "self_consumption"
+    assert data.reserve == 20
+    assert data.vitals is not None
+
+
+@pytest.mark.asyncio
+async def test_poll_budget_publishes_partial_snapshot(
+    mock_gateway_manager, mock_pypowerwall, monkeypatch
+):
+    """Test fields still running at the budget deadline are carried over."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.config import settings
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="budget-test", name="Budget Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["budget-test"] = gateway
+    mock_gateway_manager.connections["budget-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["budget-test"] = GatewayStatus(gateway=gateway, online=False)
+    mock_gateway_manager._executor = ThreadPoolExecutor(max_workers=4)
+
+    # First poll completes normally
+    await mock_gateway_manager._poll_gateway("budget-test")
+    assert mock_gateway_manager.get_gateway("budget-test").data.field_freshness["soe"] == "fresh"
+
+    # Second poll: get_time_remaining hangs past the 0.2s budget
+    monkeypatch.setattr(settings, "poll_budget", 0.2)
+    mock_pypowerwall.level.return_value = 50.0
+    mock_pypowerwall.get_time_remaining.side_effect = lambda: time.sleep(1) or 1.0
+
+    started = time.monotonic()
+    try:
+        await mock_gateway_manager._poll_gateway("budget-test")
+    finally:
+        mock_gateway_manager._executor.shutdown(wait=False)
+    assert time.monotonic() - started < 0.9
+
+    data = mock_gateway_manager.get_gateway("budget-test").data
+    assert data.soe == 50.0
+    assert data.field_freshness["soe"] == "fresh"
+    assert data.time_remaining == 8.5
+    assert data.field_freshness["time_remaining"] == "carried"
+    assert data.field_freshness["version"] == "carried"  # Not due (daily cadence)
+
+
+@pytest.mark.asyncio
+async def test_hung_threads_are_tracked_and_new_work_refused(mock_gateway_manager, monkeypatch):
+    """Test abandoned executor threads count against the per-gateway limit."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.config import settings
+    from app.core.gateway_manager import GatewayBusyError
+
+    monkeypatch.setattr(settings, "gateway_thread_limit", 2)
+    mock_gateway_manager._executor = ThreadPoolExecutor(max_workers=4)
+    release = threading.Event()
+
+    try:
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await mock_gateway_manager._run_blocking("hung", release.wait, timeout=0.05)
+
+        health = mock_gateway_manager.get_executor_health()
+        assert health["gateways"]["hung"]["abandoned"] == 2
+        assert health["abandoned_threads"] == 2
+
+        # At the limit: refused immediately rather than queued
+        with pytest.raises(GatewayBusyError):
+            await mock_gateway_manager._run_blocking("hung", lambda: 1, timeout=1)
+        # Other gateways are unaffected
+        assert await mock_gateway_manager._run_blocking("other", lambda: 1, timeout=1) == 1
+
+        release.set()
+        await asyncio.sleep(0.05)
+        health = mock_gateway_manager.get_executor_health()
+        assert health["gateways"]["hung"]["active"] == 0
+        assert health["gateways"]["hung"]["abandoned"] == 0
+        assert health["gateways"]["hung"]["abandoned_total"] == 2
+        assert health["refused_total"] == 1
+    finally:
+        release.set()
+        mock_gateway_manager._executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_hung_gateway_leaves_other_gateways_their_share(mock_gateway_manager):
+    """Test the default thread limit is one gateway's share of the pool."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.config import settings
+    from app.core.gateway_manager import GatewayBusyError
+
+    limit = settings.thread_limit
+    assert settings.gateway_thread_limit == 0
+    assert limit == settings.poll_concurrency + 1
+    # A pool sized for two gateways
+    mock_gateway_manager._executor = ThreadPoolExecutor(max_workers=2 * limit)
+    release = threading.Event()
+
+    try:
+        for _ in range(limit):
+            with pytest.raises(asyncio.TimeoutError):
+                await mock_gateway_manager._run_blocking("hung", release.wait, timeout=0.01)
+        with pytest.raises(GatewayBusyError):
+            await mock_gateway_manager._run_blocking("hung", lambda: 1, timeout=1)
+
+        # The other gateway still gets all of its threads at once
+        barrier = threading.Barrier(limit, timeout=2)
+        results = await asyncio.gather(*(
+            mock_gateway_manager._run_blocking("healthy", barrier.wait, timeout=2)
+            for _ in range(limit)
+        ))
+        assert sorted(results) == list(range(limit))
+    finally:
+        release.set()
+        mock_gateway_manager._executor.shutdown(wait=False)
+
+
+def test_pool_sizes_reserve_each_gateways_thread_limit(monkeypatch, caplog):
+    """Test each read pool holds the full thread limit of every gateway in its mode."""
+    from app.config import GatewayConfig, settings
+    from app.core.gateway_manager import _pool_sizes
+
+    local = [GatewayConfig(id=f"local{i}", name="Local", host=f"192.168.91.{i}", gw_pwd="pw") for i in range(4)]
+    cloud = [GatewayConfig(id=f"cloud{i}", name="Cloud", email="user@example.com") for i in range(2)]
+
+    monkeypatch.setattr(settings, "gateway_thread_limit", 6)
+    assert _pool_sizes(local + cloud) == (24, 12)
+    monkeypatch.setattr(settings, "gateway_thread_limit", 0)
+    assert _pool_sizes(local[:1] + cloud[:1]) == (10, 4)  # Floors
+
+    monkeypatch.setattr(settings, "local_pool_size", 8)
+    with caplog.at_level("WARNING"):
+        assert _pool_sizes(local)[0] == 8
+    assert "PW_LOCAL_POOL_SIZE=8" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_executor_pools_isolated_by_connection_mode(mock_gateway_manager):
+    """Test local reads, cloud reads and control writes run on separate pools."""
+    import threading
+    from app.models.gateway import Gateway
+
+    mock_gateway_manager.gateways["local"] = Gateway(id="local", name="Local", host="192.168.91.1")
+    mock_gateway_manager.gateways["cloud"] = Gateway(id="cloud", name="Cloud", cloud_mode=True)
+    control = Mock()
+    control.set_reserve.side_effect = lambda level: threading.current_thread().name
+    mock_gateway_manager._cloud_control = control
+
+    def thread_name():
+        return threading.current_thread().name
+
+    try:
+        local_thread = await mock_gateway_manager._run_blocking("local", thread_name, timeout=1)
+        cloud_thread = await mock_gateway_manager._run_blocking("cloud", thread_name, timeout=1)
+        control_thread = await mock_gateway_manager.cloud_control("set_reserve", 20)
+    finally:
+        await mock_gateway_manager.shutdown()
+
+    assert local_thread.startswith("pypowerwall_")
+    assert cloud_thread.startswith("pypowerwall-cloud_")
+    assert control_thread.startswith("pypowerwall-control_")
+
+
+@pytest.mark.asyncio
+async def test_warm_start_snapshot_round_trip(mock_gateway_manager, monkeypatch, tmp_path):
+    """Test last good data is saved at shutdown and served after initialize()."""
+    from datetime import datetime
+    from app.config import GatewayConfig, settings
+    from app.models.gateway import PowerwallData
+
+    monkeypatch.setattr(settings, "cache_file", str(tmp_path / ".powerwall"))
+    monkeypatch.setattr(settings, "cache_ttl", 300)
+    config = GatewayConfig(id="warm", name="Warm", host="192.168.91.1", gw_pwd="password123")
+
+    await mock_gateway_manager.initialize([config], poll_interval=5)
+    mock_gateway_manager._last_successful_data["warm"] = PowerwallData(
+        aggregates={"site": {"instant_power": 100}},
+        soe=64.0,
+        field_freshness={"soe": "fresh"},
+        timestamp=datetime.now().timestamp(),
+    )
+    await mock_gateway_manager.shutdown()
+    assert (tmp_path / ".powerwall.snapshot.json").exists()
+
+    # Simulate a restart
+    mock_gateway_manager.cache.clear()
+    mock_gateway_manager._last_successful_data.clear()
+    monkeypatch.setattr(mock_gateway_manager, "_poll_gateways", lambda: asyncio.sleep(0))
+    await mock_gateway_manager.initialize([config], poll_interval=5)
+
+    status = mock_gateway_manager.get_gateway("warm")
+    assert status.online is False
+    assert status.data.soe == 64.0
+    assert status.data.field_freshness == {"soe": "carried"}
+    mock_gateway_manager._last_successful_data.clear()
+    await mock_gateway_manager.shutdown()
+
+
+def test_warm_start_ignores_corrupt_snapshot(tmp_path):
+    """Test an unreadable snapshot file is ignored rather than failing startup."""
+    from app.core.warm_start import load_snapshot
+
+    path = tmp_path / "snapshot.json"
+    path.write_text("{not json")
+    assert load_snapshot(str(path)) == {}
+    assert load_snapshot(str(tmp_path / "missing.json")) == {}
+
+
+@pytest.mark.asyncio
+async def test_poll_materializes_registered_views(mock_gateway_manager, mock_pypowerwall):
+    """Test a successful poll builds each registered view once for the new snapshot."""
+    from app.core.views import materialized_views, register_view
+    from app.models.gateway import Gateway, GatewayStatus
+
+    calls = []
+
+    @register_view("test_view")
+    def _test_view(data):
+        calls.append(data.timestamp)
+        return {"soe": data.soe}
+
+    try:
+        gateway = Gateway(id="view-test", name="View Test", host="192.168.1.100")
+        mock_gateway_manager.gateways["view-test"] = gateway
+        mock_gateway_manager.connections["view-test"] = mock_pypowerwall
+        mock_gateway_manager.cache["view-test"] = GatewayStatus(gateway=gateway, online=False)
+
+        await mock_gateway_manager._poll_gateway("view-test")
+        assert len(calls) == 1
+
+        data = mock_gateway_manager.get_gateway("view-test").data
+        assert materialized_views.get("view-test", "test_view", data) == {"soe": 85.5}
+        assert materialized_views.get("view-test", "pod", data)["PW1_name"] == "TEPOD--1234"
+        assert len(calls) == 1  # Served from the poll-time result
+    finally:
+        materialized_views._builders.pop("test_view", None)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_snapshot_wakes_on_poll(mock_gateway_manager, mock_pypowerwall):
+    """Test long-poll waiters are released as soon as a poll stores new data."""
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="next-test", name="Next Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["next-test"] = gateway
+    mock_gateway_manager.connections["next-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["next-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    waiter = asyncio.create_task(mock_gateway_manager.wait_for_snapshot("next-test", 0, 5.0))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await mock_gateway_manager._poll_gateway("next-test")
+    assert await asyncio.wait_for(waiter, 1.0) is True
+
+    version = mock_gateway_manager.get_snapshot_version("next-test")
+    assert await mock_gateway_manager.wait_for_snapshot("next-test", version, 0.01) is False
+
+
+@pytest.mark.asyncio
+async def test_poll_records_history(mock_gateway_manager, mock_pypowerwall):
+    """Test each successful poll appends a sample to the gateway's history."""
+    from app.core.history import history_store
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="history-test", name="History Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["history-test"] = gateway
+    mock_gateway_manager.connections["history-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["history-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    await mock_gateway_manager._poll_gateway("history-test")
+
+    history = history_store.read("history-test")
+    assert len(history["timestamp"]) == 1
+    assert history["soe"] == [85.5]
+
+
+@pytest.mark.asyncio
+async def test_slow_aggregates_leaves_optional_fields_a_slice(
+    mock_gateway_manager, mock_pypowerwall, monkeypatch
+):
+    """Test aggregates using up the budget does not cancel every optional field."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.config import settings
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="slow-agg", name="Slow Aggregates", host="192.168.1.100")
+    mock_gateway_manager.gateways["slow-agg"] = gateway
+    mock_gateway_manager.connections["slow-agg"] = mock_pypowerwall
+    mock_gateway_manager.cache["slow-agg"] = GatewayStatus(gateway=gateway, online=False)
+    mock_gateway_manager._executor = ThreadPoolExecutor(max_workers=8)
+
+    aggregates = mock_pypowerwall.poll.return_value
+    await mock_gateway_manager._poll_gateway("slow-agg")
+
+    # Aggregates answers after the whole 0.4s budget has passed
+    monkeypatch.setattr(settings, "poll_budget", 0.4)
+    poll = mock_pypowerwall.poll.side_effect
+    mock_pypowerwall.poll.side_effect = lambda path, *args, **kwargs: (
+        time.sleep(0.5) or aggregates if path == "/api/meters/aggregates" else poll(path)
+    )
+    mock_pypowerwall.level.return_value = 50.0
+    try:
+        await mock_gateway_manager._poll_gateway("slow-agg")
+    finally:
+        mock_gateway_manager._executor.shutdown(wait=False)
+
+    data = mock_gateway_manager.get_gateway("slow-agg").data
+    assert data.soe == 50.0
+    assert data.field_freshness["soe"] == "fresh"
+    assert data.field_freshness["grid_status"] == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_failed_field_is_carried_or_tagged_failed(mock_gateway_manager, mock_pypowerwall):
+    """Test a field whose fetch raises keeps its last value, like a budget straggler."""
+    from app.models.gateway import Gateway, GatewayStatus
+
+    gateway = Gateway(id="fail-test", name="Fail Test", host="192.168.1.100")
+    mock_gateway_manager.gateways["fail-test"] = gateway
+    mock_gateway_manager.connections["fail-test"] = mock_pypowerwall
+    mock_gateway_manager.cache["fail-test"] = GatewayStatus(gateway=gateway, online=False)
+
+    # No previous value to carry: tagged "failed"
+    mock_pypowerwall.vitals.side_effect = Exception("Not available")
+    await mock_gateway_manager._poll_gateway("fail-test")
+    data = mock_gateway_manager.get_gateway("fail-test").data
+    assert data.vitals is None
+    assert data.field_freshness["vitals"] == "failed"
+    assert data.field_freshness["soe"] == "fresh"
+
+    # A known value survives a failed fetch
+    mock_pypowerwall.level.side_effect = Exception("Connection reset")
+    await mock_gateway_manager._poll_gateway("fail-test")
+    data = mock_gateway_manager.get_gateway("fail-test").data
+    assert data.soe == 85.5
+    assert data.field_freshness["soe"] == "carried"
+    assert set(data.field_freshness) >= {"soe", "vitals", "mode", "grid_status"}
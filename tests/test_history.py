@@ -0,0 +1,179 @@
+"""Tests for the in-memory poll history ring buffers."""
+import math
+import time
+
+import pytest
+
+from app.core.history import (
+    FIELDS,
+    ROLLUP_FIELDS,
+    HistoryStore,
+    RingBuffer,
+    RollupBuffer,
+    downsample,
+    lttb,
+)
+from app.models.gateway import PowerwallData
+
+
+def sample(n):
+    return tuple(float(n) for _ in FIELDS)
+
+
+def test_ring_buffer_overwrites_oldest():
+    """Test the buffer keeps the newest samples once full."""
+    buffer = RingBuffer(3)
+    for n in range(5):
+        assert buffer.append(100.0 + n, sample(n), "UP")
+
+    assert len(buffer) == 3
+    data = buffer.read()
+    assert data["timestamp"] == [102.0, 103.0, 104.0]
+    assert data["soe"] == [2.0, 3.0, 4.0]
+    assert data["grid_status"] == ["UP", "UP", "UP"]
+
+
+def test_ring_buffer_range_and_missing_values():
+    """Test range reads are inclusive and NaN/unknown read back as None."""
+    buffer = RingBuffer(10)
+    for n in range(6):
+        values = sample(n) if n != 3 else tuple(math.nan for _ in FIELDS)
+        buffer.append(10.0 * n, values, "DOWN" if n != 3 else None)
+
+    data = buffer.read(20.0, 40.0)
+    assert data["timestamp"] == [20.0, 30.0, 40.0]
+    assert data["site"] == [2.0, None, 4.0]
+    assert data["grid_status"] == ["DOWN", None, "DOWN"]
+    assert buffer.read(41.0, 49.0)["timestamp"] == []
+
+
+def test_ring_buffer_skips_out_of_order_samples():
+    """Test a sample not newer than the last one is not stored."""
+    buffer = RingBuffer(4)
+    assert buffer.append(10.0, sample(1), "UP")
+    assert not buffer.append(10.0, sample(2), "UP")
+    assert not buffer.append(5.0, sample(3), "UP")
+    assert len(buffer) == 1
+
+
+def test_ring_buffer_memory_is_fixed():
+    """Test memory use depends only on capacity, not on samples stored."""
+    buffer = RingBuffer(1000)
+    before = buffer.memory_bytes
+    for n in range(2500):
+        buffer.append(float(n), sample(n), "UP")
+    assert buffer.memory_bytes == before == 1000 * (8 * (len(FIELDS) + 1) + 1)
+
+
+def test_history_store_capacity_from_window(monkeypatch):
+    """Test capacity follows PW_HISTORY_WINDOW and the poll interval."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "history_window", 3600)
+    monkeypatch.setattr(settings, "cache_expire", 5)
+    assert HistoryStore.capacity() == 721
+
+    monkeypatch.setattr(settings, "history_window", 0)
+    store = HistoryStore()
+    assert not store.record("gw", PowerwallData(soe=50.0, timestamp=1.0))
+    assert store.get("gw") is None
+
+
+def test_rollup_buckets_update_incrementally():
+    """Test min/max/mean/last per bucket as samples arrive."""
+    rollup = RollupBuffer(60, 10)
+    for timestamp, value in ((0.0, 10.0), (20.0, 30.0), (40.0, 20.0), (65.0, 5.0)):
+        rollup.add(timestamp, tuple(value for _ in ROLLUP_FIELDS))
+
+    data = rollup.read()
+    assert data["timestamp"] == [0.0, 60.0]
+    assert data["soe_min"] == [10.0, 5.0]
+    assert data["soe_max"] == [30.0, 5.0]
+    assert data["soe_mean"] == [20.0, 5.0]
+    assert data["soe_last"] == [20.0, 5.0]
+    # A range starting mid-bucket includes that bucket
+    assert rollup.read(30.0, 61.0)["timestamp"] == [0.0, 60.0]
+
+
+def test_rollup_ignores_missing_values():
+    """Test NaN values do not affect a bucket's statistics."""
+    rollup = RollupBuffer(60, 10)
+    rollup.add(0.0, (math.nan,) * len(ROLLUP_FIELDS))
+    data = rollup.read()
+    assert data["site_mean"] == [None]
+    assert data["site_min"] == [None]
+    rollup.add(1.0, (4.0,) * len(ROLLUP_FIELDS))
+    assert rollup.read()["site_mean"] == [4.0]
+
+
+def test_select_tier_coarsest_covering(monkeypatch):
+    """Test a range is answered by the coarsest tier within resolution that covers it."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "history_window", 86400)
+    monkeypatch.setattr(settings, "cache_expire", 5)
+    store = HistoryStore()
+    now = 10_000_000.0
+
+    assert store.select_tier(now - 3600, 5, now) == ("raw", 5)
+    assert store.select_tier(now - 3600, 300, now) == ("1m", 60)
+    assert store.select_tier(now - 7 * 86400, 7 * 86400 / 500, now) == ("15m", 900)
+    assert store.select_tier(now - 60 * 86400, 3600, now) == ("1h", 3600)
+    # Raw samples no longer cover a 3-day-old start: fall back to 15m buckets
+    assert store.select_tier(now - 3 * 86400, 5, now) == ("15m", 900)
+
+
+def test_history_store_query_rollups(monkeypatch):
+    """Test query() reads rollups recorded from poll data."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "history_window", 3600)
+    store = HistoryStore()
+    now = time.time()
+    base = now - now % 60 - 600
+    for n in range(120):
+        store.record("gw", PowerwallData(soe=float(n), timestamp=base + 5 * n))
+
+    result = store.query("gw", base, base + 599, resolution=60)
+    assert result["resolution"] == "1m"
+    assert len(result["data"]["timestamp"]) == 10
+    assert result["data"]["soe_min"][0] == 0.0
+    assert result["data"]["soe_max"][0] == 11.0
+
+
+@pytest.mark.parametrize("value,seconds", [("24h", 86400), ("90m", 5400), ("7d", 604800), ("120", 120)])
+def test_parse_duration(value, seconds):
+    """Test PW_HISTORY_WINDOW accepts unit suffixes."""
+    from app.config import parse_duration
+
+    assert parse_duration(value) == seconds
+
+
+def test_lttb_keeps_shape():
+    """Test LTTB returns exactly the requested points, endpoints and spikes."""
+    timestamps = [float(n) for n in range(10000)]
+    values = [0.0] * 10000
+    values[4321] = 5000.0
+    values[7000] = -300.0
+
+    chosen_t, chosen_v = lttb(timestamps, values, 100)
+    assert len(chosen_t) == len(chosen_v) == 100
+    assert chosen_t[0] == 0.0 and chosen_t[-1] == 9999.0
+    assert 4321.0 in chosen_t and 7000.0 in chosen_t
+    assert chosen_t == sorted(chosen_t)
+    assert lttb(timestamps[:50], values[:50], 100) == (timestamps[:50], values[:50])
+
+
+def test_downsample_per_series():
+    """Test each numeric column is downsampled on its own, skipping gaps."""
+    data = {
+        "timestamp": [float(n) for n in range(10)],
+        "site": [float(n) for n in range(10)],
+        "soe": [None, None, 50.0, 51.0, None, 52.0, None, None, None, None],
+        "grid_status": ["UP"] * 10,
+    }
+    result = downsample(data, 3)
+    assert set(result) == {"site", "soe"}
+    assert result["site"]["timestamp"][0] == 0.0
+    assert len(result["site"]["value"]) == 3
+    assert result["soe"] == {"timestamp": [2.0, 3.0, 5.0], "value": [50.0, 51.0, 52.0]}
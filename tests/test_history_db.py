@@ -0,0 +1,163 @@
+"""Tests for the persistent SQLite history archive."""
+import time
+
+import pytest
+
+from app.core.history import history_store
+from app.core.history_db import HistoryArchive, HistoryDatabase
+from app.models.gateway import PowerwallData
+
+
+def record(gateway_id, timestamps, soe=50.0):
+    for timestamp in timestamps:
+        history_store.record(
+            gateway_id,
+            PowerwallData(
+                soe=soe,
+                aggregates={"site": {"instant_power": 100.0}},
+                grid_status="UP",
+                timestamp=timestamp,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batches_once(tmp_path):
+    """Test a flush writes new rows and the next flush only the changes."""
+    archive = HistoryArchive()
+    await archive.open(str(tmp_path / "history.db"), ["gw"])
+    try:
+        now = time.time()
+        now -= now % 60 - 30  # Keep all samples within one minute
+        record("gw", [now - 20, now - 15, now - 10])
+        first = await archive.flush()
+        assert first == 3 + 3  # Three samples and one bucket per rollup tier
+        assert await archive.flush() == 0
+
+        record("gw", [now - 5])
+        assert await archive.flush() == 1 + 3  # New sample, filling buckets upserted
+
+        rows = archive.db.samples("gw")
+        assert [row[0] for row in rows] == [now - 20, now - 15, now - 10, now - 5]
+        assert rows[0][1] == 100.0
+        assert rows[0][2] is None  # Missing battery power stored as NULL
+    finally:
+        await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_history_restored_after_restart(tmp_path):
+    """Test rows written before a restart are loaded back into memory."""
+    path = str(tmp_path / "history.db")
+    now = time.time()
+    archive = HistoryArchive()
+    await archive.open(path, ["gw"])
+    record("gw", [now - 20, now - 10], soe=42.0)
+    await archive.close()
+
+    history_store.clear()
+    archive = HistoryArchive()
+    await archive.open(path, ["gw"])
+    try:
+        restored = history_store.read("gw")
+        assert restored["timestamp"] == [now - 20, now - 10]
+        assert restored["soe"] == [42.0, 42.0]
+        assert restored["battery"] == [None, None]
+        assert restored["grid_status"] == ["UP", "UP"]
+        bucket = history_store.read_tier("gw", "1h", None, None)
+        assert bucket["soe_mean"] == [42.0]
+    finally:
+        await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_query_reads_older_range_from_database(tmp_path, monkeypatch):
+    """Test ranges older than memory are read from the database and merged."""
+    from app.config import settings
+
+    archive = HistoryArchive()
+    await archive.open(str(tmp_path / "history.db"), ["gw"])
+    try:
+        now = time.time()
+        old = [now - 3000 + n for n in range(3)]
+        archive.db.write("gw", [(t, 1.0, None, None, None, 10.0, None, None, 1) for t in old], {})
+        record("gw", [now - 10])
+
+        result = await archive.query("gw", now - 3600, now, resolution=0)
+        assert result["resolution"] == "raw"
+        assert result["data"]["timestamp"] == [*old, now - 10]
+        assert result["data"]["soe"] == [10.0, 10.0, 10.0, 50.0]
+
+        # Raw samples older than memory's window resolve against database retention
+        monkeypatch.setattr(settings, "history_window", 3600)
+        name, _ = history_store.select_tier(now - 3 * 86400, 5, now, archive.retention())
+        assert name == "raw"
+    finally:
+        await archive.close()
+
+
+def test_compaction_applies_retention(tmp_path):
+    """Test rows older than each tier's cutoff are deleted."""
+    db = HistoryDatabase(str(tmp_path / "history.db"))
+    try:
+        db.write(
+            "gw",
+            [(t, *([0.0] * 7), 1) for t in (100.0, 200.0, 300.0)],
+            {"1h": [(t, *([0.0, 0.0, 0.0, 1, 0.0] * 5)) for t in (0.0, 3600.0)]},
+        )
+        assert db.compact({"raw": 250.0, "1h": 3600.0}) == 3
+        assert [row[0] for row in db.samples("gw")] == [300.0]
+        assert [row[0] for row in db.buckets("gw", "1h")] == [3600.0]
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        db.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_tier_chunks(tmp_path):
+    """Test chunked reads cover the range once, across database and memory."""
+    archive = HistoryArchive()
+    await archive.open(str(tmp_path / "history.db"), ["gw"])
+    try:
+        now = time.time()
+        record("gw", [now - 100 + n for n in range(50)])
+        await archive.flush()
+        history_store.clear()  # Older half only in the database
+        record("gw", [now - 50 + n for n in range(50)])
+
+        chunks = [
+            chunk
+            async for chunk in archive.iter_tier("gw", "raw", 5, now - 100, now, chunk=3)
+        ]
+        timestamps = [ts for chunk in chunks for ts in chunk["timestamp"]]
+        assert timestamps == [now - 100 + n for n in range(100)]
+        assert max(len(chunk["timestamp"]) for chunk in chunks) <= 16
+    finally:
+        await archive.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_tier_jumps_over_gaps(tmp_path, monkeypatch):
+    """Test empty windows are skipped using the next stored timestamp."""
+    archive = HistoryArchive()
+    await archive.open(str(tmp_path / "history.db"), ["gw"])
+    try:
+        now = time.time()
+        record("gw", [now - 86400, now - 86399, now - 5, now - 4])
+        await archive.flush()
+
+        reads = []
+        read_tier = archive.read_tier
+
+        async def counting(*args):
+            reads.append(args)
+            return await read_tier(*args)
+
+        monkeypatch.setattr(archive, "read_tier", counting)
+        chunks = [chunk async for chunk in archive.iter_tier("gw", "raw", 5, 0, now, chunk=10)]
+        assert [ts for chunk in chunks for ts in chunk["timestamp"]] == [
+            now - 86400, now - 86399, now - 5, now - 4,
+        ]
+        assert len(reads) == 2
+    finally:
+        await archive.close()
@@ -0,0 +1,23 @@
+"""Tests for JSON-Patch diff utilities."""
+import copy
+
+from app.utils.json_diff import apply_patch, diff
+
+
+def test_diff_roundtrip():
+    """Test diff() output applied to the old document yields the new one."""
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True, "a/b": 1}
+    new = {"a": 1.0, "b": {"c": [1, 2, 3], "e": None}, "a/b": 2}
+
+    ops = diff(old, new)
+    assert {"op": "remove", "path": "/gone"} in ops
+    assert {"op": "replace", "path": "/a", "value": 1.0} in ops
+    assert {"op": "replace", "path": "/a~1b", "value": 2} in ops
+    assert apply_patch(copy.deepcopy(old), ops) == new
+
+
+def test_diff_identical_is_empty():
+    """Test identical documents produce no operations."""
+    doc = {"x": {"y": [1, {"z": 2}]}}
+    assert diff(doc, copy.deepcopy(doc)) == []
+    assert diff(None, {"a": 1}) == [{"op": "replace", "path": "", "value": {"a": 1}}]
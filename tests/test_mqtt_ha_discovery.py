@@ -70,8 +70,8 @@ class TestBuildDiscoveryPayloads:
 
     def test_returns_expected_count(self):
         results = self._payloads()
-        # 9 sensors + 1 binary sensor = 10
-        assert len(results) == 10
+        # 9 sensors + 6 energy sensors + 1 binary sensor = 16
+        assert len(results) == 16
 
     def test_all_topics_start_with_ha_prefix(self):
         results = self._payloads(ha_prefix="homeassistant")
@@ -105,6 +105,25 @@ class TestBuildDiscoveryPayloads:
             assert "pypowerwall_cabin" in device["identifiers"][0]
             assert device["name"] == "Cabin Powerwall"
 
+    def test_energy_sensor_fields(self):
+        results = dict(self._payloads())
+        topic = "homeassistant/sensor/pypowerwall_home_energy_grid_imported/config"
+        assert topic in results
+        p = results[topic]
+        assert p["unit_of_measurement"] == "kWh"
+        assert p["device_class"] == "energy"
+        assert p["state_class"] == "total_increasing"
+        assert p["state_topic"] == "pypowerwall/home/energy/grid_imported"
+
+    def test_energy_sensors_omitted_when_energy_disabled(self, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "energy", False)
+        results = self._payloads()
+        # 9 sensors + 1 binary sensor
+        assert len(results) == 10
+        assert not any("_energy_" in topic for topic, _ in results)
+
     def test_battery_sensor_fields(self):
         results = dict(self._payloads())
         battery_topic = "homeassistant/sensor/pypowerwall_home_battery/config"
@@ -188,7 +207,7 @@ class TestBuildDiscoveryPayloads:
             ha_prefix="homeassistant",
             version=None,
         )
-        assert len(results) == 10
+        assert len(results) == 16
         for _, payload_str in results:
             p = json.loads(payload_str)
             assert p["device"]["sw_version"] == "unknown"
@@ -222,7 +241,7 @@ class TestPublisherHaDiscovery:
 
         topics = [c.args[0] for c in mock_client.publish.call_args_list]
         disc_topics = [t for t in topics if "homeassistant" in t]
-        assert len(disc_topics) == 10  # one per sensor/binary_sensor
+        assert len(disc_topics) == 16  # one per sensor/binary_sensor
 
     @pytest.mark.asyncio
     async def test_discovery_sent_only_once_per_connection(self, monkeypatch):
@@ -269,7 +288,7 @@ class TestPublisherHaDiscovery:
             for c in mock_client.publish.call_args_list
             if "homeassistant" in c.args[0]
         ]
-        assert len(disc_topics) == 10
+        assert len(disc_topics) == 16
 
     @pytest.mark.asyncio
     async def test_discovery_skipped_when_ha_discovery_false(self, monkeypatch):
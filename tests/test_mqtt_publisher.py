@@ -14,6 +14,7 @@ These tests use a mock MQTT client (no real broker required) and validate:
 """
 import asyncio
 import json
+import time
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -250,6 +251,62 @@ class TestMqttPublisherEnabled:
         assert summary["mode"] == "backup"
         assert summary["online"] is True
 
+    @pytest.mark.asyncio
+    async def test_energy_topics_published(self, monkeypatch):
+        """Energy counters are published per gateway and summed over gateways."""
+        from app.core.energy import energy_meter
+
+        pub = self._make_publisher(monkeypatch)
+        mock_client = AsyncMock()
+        pub._client = mock_client
+        pub._connected = True
+
+        status = make_status(home=3600.0)
+        now = time.time()
+        for offset in (-60.0, 0.0):
+            data = status.data.model_copy(update={"timestamp": now + offset})
+            energy_meter.record("test-gw", data, status.gateway.timezone)
+        await pub.publish_gateway("test-gw", status)
+
+        published = {c.args[0]: c.args[1] for c in mock_client.publish.call_args_list}
+        assert published["pypowerwall/test-gw/energy/home_consumed"] == "0.060"
+        counters = json.loads(published["pypowerwall/test-gw/energy"])
+        assert counters["total"]["home_consumed"] == pytest.approx(0.06)
+        aggregate = json.loads(published["pypowerwall/aggregate/energy"])
+        assert aggregate["gateways"] == ["test-gw"]
+
+    @pytest.mark.asyncio
+    async def test_aggregate_energy_published_once_per_cycle(self, monkeypatch):
+        """{prefix}/aggregate/energy goes out once per cycle, not once per gateway."""
+        from app.core.energy import energy_meter
+
+        pub = self._make_publisher(monkeypatch)
+        mock_client = AsyncMock()
+        pub._client = mock_client
+        pub._connected = True
+
+        status = make_status(home=3600.0)
+        now = time.time()
+        gateway_ids = ("gw-a", "gw-b", "gw-c")
+        for gateway_id in gateway_ids:
+            energy_meter.record(gateway_id, status.data.model_copy(update={"timestamp": now}), "UTC")
+
+        def aggregate_count():
+            return sum(
+                1 for c in mock_client.publish.call_args_list
+                if c.args[0] == "pypowerwall/aggregate/energy"
+            )
+
+        for _ in range(2):
+            for gateway_id in gateway_ids:
+                await pub.publish_gateway(gateway_id, status)
+        assert aggregate_count() == 2
+
+        # A gateway coming round again ends the cycle even if another is missing
+        await pub.publish_gateway("gw-a", status)
+        await pub.publish_gateway("gw-a", status)
+        assert aggregate_count() == 3
+
     @pytest.mark.asyncio
     async def test_publish_failure_marks_disconnected(self, monkeypatch):
         """A publish error must set _connected=False (triggers reconnect loop)."""